@@ -7,6 +7,8 @@ from datetime import timedelta
 import hashlib
 import logging
 from random import SystemRandom
+from time import monotonic
+from typing import Dict, Optional, Tuple
 
 from aiohttp import web
 import async_timeout
@@ -14,15 +16,16 @@ import attr
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
-from homeassistant.components.http import KEY_AUTHENTICATED, HomeAssistantView
+from homeassistant.components.http import KEY_AUTHENTICATED, KEY_HASS, HomeAssistantView
 from homeassistant.components.media_player.const import (
     ATTR_MEDIA_CONTENT_ID,
     ATTR_MEDIA_CONTENT_TYPE,
     DOMAIN as DOMAIN_MP,
     SERVICE_PLAY_MEDIA,
 )
-from homeassistant.components.stream import request_stream
+from homeassistant.components.stream import async_get_keyframe_image, request_stream
 from homeassistant.components.stream.const import (
+    ATTR_STREAMS,
     CONF_DURATION,
     CONF_LOOKBACK,
     CONF_STREAM_SOURCE,
@@ -49,8 +52,9 @@ from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.network import get_url
 from homeassistant.loader import bind_hass
 from homeassistant.setup import async_when_setup
+from homeassistant.util.latency import LatencyHistogram
 
-from .const import DATA_CAMERA_PREFS, DOMAIN
+from .const import DATA_CAMERA_PREFS, DATA_STILL_STREAMS, DOMAIN
 from .prefs import CameraPreferences
 
 # mypy: allow-untyped-calls, allow-untyped-defs
@@ -84,6 +88,15 @@ TOKEN_CHANGE_INTERVAL = timedelta(minutes=5)
 _RND = SystemRandom()
 
 MIN_STREAM_INTERVAL = 0.5  # seconds
+# Frames buffered per MJPEG viewer before the oldest one is dropped
+STILL_STREAM_BUFFER_SIZE = 2
+
+# Images fetched less than this ago are served again instead of refetched,
+# by default only requests made while a fetch is in progress share it
+DEFAULT_IMAGE_CACHE_TTL = 0  # seconds
+IMAGE_FETCH_TIMEOUT = 10  # seconds
+# Time to wait for the next keyframe of an active stream before asking the camera
+STREAM_IMAGE_TIMEOUT = 5  # seconds
 
 CAMERA_SERVICE_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids})
 
@@ -111,6 +124,8 @@ SCHEMA_WS_CAMERA_THUMBNAIL = websocket_api.BASE_COMMAND_MESSAGE_SCHEMA.extend(
     {
         vol.Required("type"): WS_TYPE_CAMERA_THUMBNAIL,
         vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("width"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("height"): vol.All(vol.Coerce(int), vol.Range(min=1)),
     }
 )
 
@@ -147,13 +162,13 @@ async def async_request_stream(hass, entity_id, fmt):
 
 
 @bind_hass
-async def async_get_image(hass, entity_id, timeout=10):
-    """Fetch an image from a camera entity."""
+async def async_get_image(hass, entity_id, timeout=10, width=None, height=None):
+    """Fetch an image from a camera entity, scaled down to fit width and height."""
     camera = _get_camera_from_entity_id(hass, entity_id)
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.async_camera_image_resized(width, height)
 
             if image:
                 return Image(camera.content_type, image)
@@ -177,47 +192,163 @@ async def async_get_mjpeg_stream(hass, request, entity_id):
     return await camera.handle_async_mjpeg_stream(request)
 
 
+def _frame_mjpeg_image(img_bytes, content_type):
+    """Return an image framed as a part of a multipart MJPEG stream."""
+    return (
+        bytes(
+            "--frameboundary\r\n"
+            "Content-Type: {}\r\n"
+            "Content-Length: {}\r\n\r\n".format(content_type, len(img_bytes)),
+            "utf-8",
+        )
+        + img_bytes
+        + b"\r\n"
+    )
+
+
+class StillStreamProducer:
+    """Fetch camera images once and broadcast the frames to all viewers.
+
+    Every viewer gets a bounded buffer. When a viewer reads slower than
+    frames are produced its oldest frame is dropped, so a slow connection
+    never holds back the producer or the other viewers.
+    """
+
+    def __init__(self, hass, key, image_cb, content_type, interval):
+        """Initialize the producer."""
+        self.hass = hass
+        self.key = key
+        self.frame = None
+        self.frames_dropped = 0
+        self._image_cb = image_cb
+        self._content_type = content_type
+        self._interval = interval
+        self._queues = set()
+        self._task = None
+
+    @callback
+    def async_subscribe(self):
+        """Add a viewer and return the buffer it receives frames in."""
+        queue = asyncio.Queue(maxsize=STILL_STREAM_BUFFER_SIZE)
+        self._queues.add(queue)
+        if self._task is None:
+            self._task = self.hass.loop.create_task(self._async_produce())
+        return queue
+
+    @callback
+    def async_unsubscribe(self, queue):
+        """Remove a viewer and stop producing when it was the last one."""
+        self._queues.discard(queue)
+        if self._queues:
+            return
+        self._async_remove()
+        if self._task is not None:
+            self._task.cancel()
+
+    @callback
+    def _async_remove(self):
+        """Stop handing this producer to new viewers."""
+        producers = self.hass.data[DATA_STILL_STREAMS]
+        if producers.get(self.key) is self:
+            del producers[self.key]
+
+    @callback
+    def _async_broadcast(self, frame):
+        """Put a frame in the buffer of every viewer."""
+        for queue in self._queues:
+            if queue.full():
+                queue.get_nowait()
+                if frame is not None:
+                    self.frames_dropped += 1
+            queue.put_nowait(frame)
+
+    async def _async_produce(self):
+        """Fetch and frame images until the camera stops returning them."""
+        last_image = None
+        try:
+            while True:
+                img_bytes = await self._image_cb()
+                if not img_bytes:
+                    break
+
+                if img_bytes != last_image:
+                    self.frame = _frame_mjpeg_image(img_bytes, self._content_type)
+                    self._async_broadcast(self.frame)
+                    last_image = img_bytes
+
+                await asyncio.sleep(self._interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error fetching image for MJPEG stream")
+
+        self._async_remove()
+        # Tell viewers the stream has ended
+        self._async_broadcast(None)
+
+
 async def async_get_still_stream(request, image_cb, content_type, interval):
     """Generate an HTTP MJPEG stream from camera images.
 
+    Viewers of the same image callback and interval share a single producer.
+
     This method must be run in the event loop.
     """
+    hass = request.app[KEY_HASS]
+    producers = hass.data.setdefault(DATA_STILL_STREAMS, {})
+    key = (image_cb, content_type, interval)
+    producer = producers.get(key)
+    if producer is None:
+        producer = producers[key] = StillStreamProducer(
+            hass, key, image_cb, content_type, interval
+        )
+
     response = web.StreamResponse()
     response.content_type = "multipart/x-mixed-replace; boundary=--frameboundary"
-    await response.prepare(request)
-
-    async def write_to_mjpeg_stream(img_bytes):
-        """Write image to stream."""
-        await response.write(
-            bytes(
-                "--frameboundary\r\n"
-                "Content-Type: {}\r\n"
-                "Content-Length: {}\r\n\r\n".format(content_type, len(img_bytes)),
-                "utf-8",
-            )
-            + img_bytes
-            + b"\r\n"
-        )
 
-    last_image = None
+    queue = producer.async_subscribe()
+    try:
+        await response.prepare(request)
+
+        frame = producer.frame
+        if frame is None:
+            frame = await queue.get()
+        if frame is None:
+            return response
+
+        # Chrome seems to always ignore first picture,
+        # print it twice.
+        await response.write(frame)
+        await response.write(frame)
+
+        while True:
+            frame = await queue.get()
+            if frame is None:
+                break
+            await response.write(frame)
+    finally:
+        producer.async_unsubscribe(queue)
 
-    while True:
-        img_bytes = await image_cb()
-        if not img_bytes:
-            break
+    return response
 
-        if img_bytes != last_image:
-            await write_to_mjpeg_stream(img_bytes)
 
-            # Chrome seems to always ignore first picture,
-            # print it twice.
-            if last_image is None:
-                await write_to_mjpeg_stream(img_bytes)
-            last_image = img_bytes
+def _resize_image(image, width, height):
+    """Scale an image down, returning it unchanged when it can't be resized."""
+    # Pillow is only loaded once a scaled down image is requested
+    # pylint: disable=import-outside-toplevel
+    try:
+        from PIL import Image
 
-        await asyncio.sleep(interval)
+        from homeassistant.util.pil import resize_image
+    except ImportError as err:
+        _LOGGER.debug("Unable to resize camera image: %s", err)
+        return image
 
-    return response
+    try:
+        return resize_image(image, width, height)
+    except (OSError, Image.DecompressionBombError) as err:
+        _LOGGER.debug("Unable to resize camera image: %s", err)
+        return image
 
 
 def _get_camera_from_entity_id(hass, entity_id):
@@ -256,6 +387,7 @@ async def async_setup(hass, config):
     hass.components.websocket_api.async_register_command(ws_camera_stream)
     hass.components.websocket_api.async_register_command(websocket_get_prefs)
     hass.components.websocket_api.async_register_command(websocket_update_prefs)
+    hass.components.websocket_api.async_register_command(websocket_image_stats)
 
     await component.async_setup(config)
 
@@ -331,6 +463,13 @@ class Camera(Entity):
         self.content_type = DEFAULT_CONTENT_TYPE
         self.access_tokens: collections.deque = collections.deque([], 2)
         self.async_update_token()
+        self.image_requests = 0
+        self.image_cache_hits = 0
+        self.image_fetch_latency = LatencyHistogram()
+        self._image_fetch: Optional[asyncio.Task] = None
+        self._image_cache: Optional[Tuple[float, bytes]] = None
+        self._renditions: Dict[Tuple, asyncio.Future] = {}
+        self._rendition_source: Optional[bytes] = None
 
     @property
     def should_poll(self):
@@ -372,6 +511,11 @@ class Camera(Entity):
         """Return the interval between frames of the mjpeg stream."""
         return 0.5
 
+    @property
+    def image_cache_ttl(self):
+        """Return how long a fetched image is served to later requests."""
+        return DEFAULT_IMAGE_CACHE_TTL
+
     async def stream_source(self):
         """Return the source of the stream."""
         return None
@@ -384,6 +528,90 @@ class Camera(Entity):
         """Return bytes of camera image."""
         return await self.hass.async_add_executor_job(self.camera_image)
 
+    async def async_camera_image_shared(self):
+        """Return bytes of camera image, sharing fetches between requests.
+
+        Concurrent requests wait for the same fetch from the device and the
+        image is served to later requests for image_cache_ttl seconds.
+        """
+        self.image_requests += 1
+
+        if (
+            self._image_cache is not None
+            and monotonic() - self._image_cache[0] < self.image_cache_ttl
+        ):
+            self.image_cache_hits += 1
+            return self._image_cache[1]
+
+        if self._image_fetch is None:
+            self._image_fetch = self.hass.async_create_task(self._async_fetch_image())
+        else:
+            self.image_cache_hits += 1
+
+        # A request timing out must not cancel the fetch of other requests
+        return await asyncio.shield(self._image_fetch)
+
+    async def async_camera_image_resized(self, width=None, height=None):
+        """Return bytes of camera image scaled down to fit width and height.
+
+        Renditions are cached per size until the camera returns a new image.
+        """
+        image = await self.async_camera_image_shared()
+
+        if not image or (width is None and height is None):
+            return image
+
+        if image != self._rendition_source:
+            self._rendition_source = image
+            self._renditions = {}
+
+        size = (width, height)
+        rendition = self._renditions.get(size)
+
+        if rendition is None:
+            rendition = self._renditions[size] = self.hass.async_add_executor_job(
+                _resize_image, image, width, height
+            )
+
+        return await asyncio.shield(rendition)
+
+    async def _async_fetch_image(self):
+        """Fetch an image from the camera and cache it."""
+        start = monotonic()
+
+        try:
+            async with async_timeout.timeout(IMAGE_FETCH_TIMEOUT):
+                image = await self._async_stream_image()
+                if not image:
+                    image = await self.async_camera_image()
+        finally:
+            self._image_fetch = None
+            self.image_fetch_latency.record(monotonic() - start)
+
+        if image:
+            self._image_cache = (start, image)
+
+        return image
+
+    async def _async_stream_image(self):
+        """Return the latest keyframe of an active stream of the camera."""
+        if (
+            not self.supported_features & SUPPORT_STREAM
+            or self.content_type != DEFAULT_CONTENT_TYPE
+            or not self.hass.data.get(DOMAIN_STREAM, {}).get(ATTR_STREAMS)
+        ):
+            return None
+
+        source = await self.stream_source()
+        if not source:
+            return None
+
+        with suppress(asyncio.TimeoutError):
+            async with async_timeout.timeout(STREAM_IMAGE_TIMEOUT):
+                return await async_get_keyframe_image(self.hass, source)
+
+        return None
+
     async def handle_async_still_stream(self, request, interval):
         """Generate an HTTP MJPEG stream from camera images."""
         return await async_get_still_stream(
@@ -510,10 +738,16 @@ class CameraImageView(CameraView):
     name = "api:camera:image"
 
     async def handle(self, request: web.Request, camera: Camera) -> web.Response:
-        """Serve camera image."""
+        """Serve camera image, possibly scaled down."""
+        try:
+            width = _get_image_dimension(request, "width")
+            height = _get_image_dimension(request, "height")
+        except ValueError:
+            raise web.HTTPBadRequest()
+
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(10):
-                image = await camera.async_camera_image()
+                image = await camera.async_camera_image_resized(width, height)
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
@@ -521,6 +755,18 @@ class CameraImageView(CameraView):
         raise web.HTTPInternalServerError()
 
 
+def _get_image_dimension(request, key):
+    """Return an image dimension from the query of a request."""
+    value = request.query.get(key)
+    if value is None:
+        return None
+
+    value = int(value)
+    if value < 1:
+        raise ValueError(f"Image {key} must be positive")
+    return value
+
+
 class CameraMjpegStream(CameraView):
     """Camera View to serve an MJPEG stream."""
 
@@ -551,7 +797,9 @@ async def websocket_camera_thumbnail(hass, connection, msg):
     """
     _LOGGER.warning("The websocket command 'camera_thumbnail' has been deprecated.")
     try:
-        image = await async_get_image(hass, msg["entity_id"])
+        image = await async_get_image(
+            hass, msg["entity_id"], width=msg.get("width"), height=msg.get("height")
+        )
         await connection.send_big_result(
             msg["id"],
             {
@@ -567,6 +815,27 @@ async def websocket_camera_thumbnail(hass, connection, msg):
         )
 
 
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "camera/image_stats"})
+def websocket_image_stats(hass, connection, msg):
+    """Handle request for the image fetch statistics of the cameras."""
+    stats = {}
+
+    for camera in hass.data[DOMAIN].entities:
+        stats[camera.entity_id] = {
+            "requests": camera.image_requests,
+            "hit_rate": (
+                camera.image_cache_hits / camera.image_requests
+                if camera.image_requests
+                else None
+            ),
+            "fetch_latency": camera.image_fetch_latency.as_dict(),
+        }
+
+    connection.send_result(msg["id"], stats)
+
+
 @websocket_api.async_response
 @websocket_api.websocket_command(
     {
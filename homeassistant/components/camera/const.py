@@ -2,5 +2,6 @@
 DOMAIN = "camera"
 
 DATA_CAMERA_PREFS = "camera_prefs"
+DATA_STILL_STREAMS = "camera_still_streams"
 
 PREF_PRELOAD_STREAM = "preload_stream"
@@ -1,16 +1,15 @@
 """Allows the creation of a sensor that filters state property."""
+import asyncio
 from collections import Counter, deque
 from copy import copy
 from datetime import timedelta
-from functools import partial
 import logging
 from numbers import Number
-import statistics
 from typing import Optional
 
 import voluptuous as vol
 
-from homeassistant.components import history
+from homeassistant.components.recorder.prefill import async_get_recent_states
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -27,6 +26,7 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_state_change
 from homeassistant.util.decorator import Registry
 import homeassistant.util.dt as dt_util
+from homeassistant.util.rolling import RollingWindow
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -177,42 +177,9 @@ class SensorFilter(Entity):
         """Register callbacks."""
 
         @callback
-        def filter_sensor_state_listener(entity, old_state, new_state, update_ha=True):
+        def filter_sensor_state_listener(entity, old_state, new_state):
             """Handle device state changes."""
-            if new_state.state in [STATE_UNKNOWN, STATE_UNAVAILABLE]:
-                return
-
-            temp_state = new_state
-
-            try:
-                for filt in self._filters:
-                    filtered_state = filt.filter_state(copy(temp_state))
-                    _LOGGER.debug(
-                        "%s(%s=%s) -> %s",
-                        filt.name,
-                        self._entity,
-                        temp_state.state,
-                        "skip" if filt.skip_processing else filtered_state.state,
-                    )
-                    if filt.skip_processing:
-                        return
-                    temp_state = filtered_state
-            except ValueError:
-                _LOGGER.error("Could not convert state: %s to number", self._state)
-                return
-
-            self._state = temp_state.state
-
-            if self._icon is None:
-                self._icon = new_state.attributes.get(ATTR_ICON, ICON)
-
-            if self._unit_of_measurement is None:
-                self._unit_of_measurement = new_state.attributes.get(
-                    ATTR_UNIT_OF_MEASUREMENT
-                )
-
-            if update_ha:
-                self.async_write_ha_state()
+            self._async_filter_states([new_state])
 
         if "recorder" in self.hass.config.components:
             history_list = []
@@ -232,36 +199,34 @@ class SensorFilter(Entity):
                 ):
                     largest_window_time = filt.window_size
 
-            # Retrieve the largest window_size of each type
+            # Retrieve the largest window_size of each type, the recorder
+            # loads them together with those of other sensors
+            requests = []
             if largest_window_items > 0:
-                filter_history = await self.hass.async_add_job(
-                    partial(
-                        history.get_last_state_changes,
+                requests.append(
+                    async_get_recent_states(
                         self.hass,
-                        largest_window_items,
-                        entity_id=self._entity,
+                        self._entity,
+                        number_of_states=largest_window_items,
+                        state_changes_only=True,
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(filter_history[self._entity])
             if largest_window_time > timedelta(seconds=0):
-                start = dt_util.utcnow() - largest_window_time
-                filter_history = await self.hass.async_add_job(
-                    partial(
-                        history.state_changes_during_period,
+                requests.append(
+                    async_get_recent_states(
                         self.hass,
-                        start,
-                        entity_id=self._entity,
+                        self._entity,
+                        start_time=dt_util.utcnow() - largest_window_time,
+                        state_changes_only=True,
+                        include_start_state=True,
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(
-                        [
-                            state
-                            for state in filter_history[self._entity]
-                            if state not in history_list
-                        ]
-                    )
+            for filter_history in await asyncio.gather(*requests):
+                if history_list:
+                    filter_history = [
+                        state for state in filter_history if state not in history_list
+                    ]
+                history_list.extend(filter_history)
 
             # Sort the window states
             history_list = sorted(history_list, key=lambda s: s.last_updated)
@@ -271,13 +236,54 @@ class SensorFilter(Entity):
             )
 
             # Replay history through the filter chain
-            prev_state = None
-            for state in history_list:
-                filter_sensor_state_listener(self._entity, prev_state, state, False)
-                prev_state = state
+            self._async_filter_states(history_list, update_ha=False)
 
         async_track_state_change(self.hass, self._entity, filter_sensor_state_listener)
 
+    @callback
+    def _async_filter_states(self, new_states, update_ha=True):
+        """Run states through the filter chain and keep the last result.
+
+        Each filter processes the whole batch before the states that were not
+        skipped are passed on to the next filter.
+        """
+        origins = [
+            (FilterState(state), state)
+            for state in new_states
+            if state.state not in [STATE_UNKNOWN, STATE_UNAVAILABLE]
+        ]
+        filtered_states = [fstate for fstate, _ in origins]
+
+        for filt in self._filters:
+            filtered_states = filt.filter_states(filtered_states)
+            _LOGGER.debug(
+                "%s(%s): %s states passed",
+                filt.name,
+                self._entity,
+                len(filtered_states),
+            )
+            if not filtered_states:
+                return
+
+        self._state = filtered_states[-1].state
+
+        if self._icon is None or self._unit_of_measurement is None:
+            # Filters change the states in place
+            first_state = next(
+                state for fstate, state in origins if fstate is filtered_states[0]
+            )
+
+            if self._icon is None:
+                self._icon = first_state.attributes.get(ATTR_ICON, ICON)
+
+            if self._unit_of_measurement is None:
+                self._unit_of_measurement = first_state.attributes.get(
+                    ATTR_UNIT_OF_MEASUREMENT
+                )
+
+        if update_ha:
+            self.async_write_ha_state()
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -321,6 +327,13 @@ class FilterState:
         except ValueError:
             self.state = state.state
 
+    def __copy__(self):
+        """Return a copy without going through the generic copy protocol."""
+        fstate = FilterState.__new__(FilterState)
+        fstate.timestamp = self.timestamp
+        fstate.state = self.state
+        return fstate
+
     def set_precision(self, precision):
         """Set precision of Number based states."""
         if isinstance(self.state, Number):
@@ -385,21 +398,40 @@ class Filter:
         """Implement filter."""
         raise NotImplementedError()
 
-    def filter_state(self, new_state):
-        """Implement a common interface for filters."""
-        fstate = FilterState(new_state)
+    def _process(self, fstate):
+        """Filter a state and store it in the window."""
         if self._only_numbers and not isinstance(fstate.state, Number):
             raise ValueError
 
+        raw = copy(fstate) if self._store_raw else None
         filtered = self._filter_state(fstate)
         filtered.set_precision(self.precision)
-        if self._store_raw:
-            self.states.append(copy(FilterState(new_state)))
-        else:
-            self.states.append(copy(filtered))
+        self.states.append(raw if self._store_raw else copy(filtered))
+        return filtered
+
+    def filter_state(self, new_state):
+        """Implement a common interface for filters."""
+        filtered = self._process(FilterState(new_state))
         new_state.state = filtered.state
         return new_state
 
+    def filter_states(self, fstates):
+        """Filter a batch of states in order, return those that were not skipped.
+
+        The states are changed in place. States that can't be filtered are
+        dropped, like single states that raise ValueError in filter_state.
+        """
+        filtered_states = []
+        for fstate in fstates:
+            try:
+                filtered = self._process(fstate)
+            except ValueError:
+                _LOGGER.error("Could not convert state: %s to number", fstate.state)
+                continue
+            if not self._skip_processing:
+                filtered_states.append(filtered)
+        return filtered_states
+
 
 @FILTERS.register(FILTER_NAME_RANGE)
 class RangeFilter(Filter):
@@ -472,14 +504,17 @@ class OutlierFilter(Filter):
         self._radius = radius
         self._stats_internal = Counter()
         self._store_raw = True
+        self._window = RollingWindow(window_size)
 
     def _filter_state(self, new_state):
         """Implement the outlier filter."""
+        value = new_state.state
+        median = self._window.median if self._window else 0
+        self._window.append(value, new_state.timestamp)
 
-        median = statistics.median([s.state for s in self.states]) if self.states else 0
         if (
             len(self.states) == self.states.maxlen
-            and abs(new_state.state - median) > self._radius
+            and abs(value - median) > self._radius
         ):
 
             self._stats_internal["erasures"] += 1
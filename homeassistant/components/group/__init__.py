@@ -1,7 +1,7 @@
 """Provide the functionality to group entities."""
 import asyncio
 import logging
-from typing import Any, Iterable, List, Optional, cast
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, cast
 
 import voluptuous as vol
 
@@ -52,6 +52,8 @@ ATTR_OBJECT_ID = "object_id"
 ATTR_ORDER = "order"
 ATTR_ALL = "all"
 
+DATA_EXPAND_CACHE = "group_expand_cache"
+
 SERVICE_SET = "set"
 SERVICE_REMOVE = "remove"
 
@@ -122,6 +124,7 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
     Async friendly.
     """
     found_ids: List[str] = []
+    seen: Set[str] = set()
     for entity_id in entity_ids:
         if not isinstance(entity_id, str) or entity_id in (
             ENTITY_MATCH_NONE,
@@ -131,30 +134,111 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
 
         entity_id = entity_id.lower()
 
-        try:
-            # If entity_id points at a group, expand it
-            domain, _ = ha.split_entity_id(entity_id)
+        # If entity_id points at a group, expand it
+        domain, _ = ha.split_entity_id(entity_id)
 
-            if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id
-                    for ent_id in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids
-                )
+        if domain == DOMAIN:
+            members: Iterable[str] = _async_get_flattened_members(hass, entity_id)
+        else:
+            members = (entity_id,)
 
-            else:
-                if entity_id not in found_ids:
+        for ent_id in members:
+            if ent_id not in seen:
+                seen.add(ent_id)
+                found_ids.append(ent_id)
+
+    return found_ids
+
+
+def _get_member_ids(hass: HomeAssistantType, group_id: str) -> Any:
+    """Return the raw entity_id attribute of a group state."""
+    group = hass.states.get(group_id)
+
+    if group is None:
+        return None
+
+    return group.attributes.get(ATTR_ENTITY_ID)
+
+
+def _async_get_flattened_members(
+    hass: HomeAssistantType, group_id: str
+) -> Tuple[str, ...]:
+    """Return the memoised, flattened members of a group.
+
+    A cached expansion remembers the entity_id attribute of every group it
+    visited and stays valid for as long as none of those member lists are
+    replaced, so repeated expansions only cost a lookup per nested group.
+
+    Async friendly.
+    """
+    cache: Dict[str, Tuple[Tuple[str, ...], Dict[str, Any]]] = hass.data.setdefault(
+        DATA_EXPAND_CACHE, {}
+    )
+    entry = cache.get(group_id)
+
+    if entry is not None:
+        members, visited = entry
+        if all(
+            _get_member_ids(hass, visited_id) is member_ids
+            for visited_id, member_ids in visited.items()
+        ):
+            return members
+
+    members, visited = _flatten_group(hass, group_id)
+
+    if visited[group_id] is None:
+        cache.pop(group_id, None)
+    else:
+        cache[group_id] = (members, visited)
+
+    return members
+
+
+def _flatten_group(
+    hass: HomeAssistantType, group_id: str
+) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    """Expand a group into its non-group members, following nested groups."""
+    found_ids: List[str] = []
+    seen: Set[str] = set()
+    visited: Dict[str, Any] = {}
+    path: List[str] = []
+
+    def visit(current_id: str) -> None:
+        member_ids = visited[current_id] = _get_member_ids(hass, current_id)
+
+        if not member_ids:
+            return
+
+        path.append(current_id)
+
+        for entity_id in member_ids:
+            if not isinstance(entity_id, str):
+                continue
+
+            entity_id = entity_id.lower()
+            domain, _ = ha.split_entity_id(entity_id)
+
+            if domain != DOMAIN:
+                if entity_id not in seen:
+                    seen.add(entity_id)
                     found_ids.append(entity_id)
 
-        except AttributeError:
-            # Raised by split_entity_id if entity_id is not a string
-            pass
+            elif entity_id in path:
+                if entity_id != current_id:
+                    _LOGGER.warning(
+                        "Group %s is part of a membership cycle: %s",
+                        entity_id,
+                        " -> ".join(path + [entity_id]),
+                    )
 
-    return found_ids
+            elif entity_id not in visited:
+                visit(entity_id)
+
+        path.pop()
+
+    visit(group_id)
+
+    return tuple(found_ids), visited
 
 
 @bind_hass
@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -118,6 +119,10 @@ class HistoryStatsSensor(Entity):
         self.value = None
         self.count = None
 
+        # Changes of the state since the history was loaded
+        self._window = None
+        self._pending = deque()
+
         @callback
         def start_refresh(*args):
             """Register state tracking."""
@@ -127,8 +132,23 @@ class HistoryStatsSensor(Entity):
                 """Force the component to refresh."""
                 self.async_schedule_update_ha_state(True)
 
+            @callback
+            def state_changed(entity_id, old_state, new_state):
+                """Queue a change of the state and refresh."""
+                if (
+                    new_state is not None
+                    and new_state.last_changed == new_state.last_updated
+                ):
+                    self._pending.append(
+                        (
+                            new_state.last_changed.timestamp(),
+                            new_state.state == self._entity_state,
+                        )
+                    )
+                force_refresh()
+
             force_refresh()
-            async_track_state_change(self.hass, self._entity_id, force_refresh)
+            async_track_state_change(self.hass, self._entity_id, state_changed)
 
         # Delay first refresh to keep startup fast
         hass.bus.listen_once(EVENT_HOMEASSISTANT_START, start_refresh)
@@ -178,7 +198,11 @@ class HistoryStatsSensor(Entity):
         return ICON
 
     def update(self):
-        """Get the latest data and updates the states."""
+        """Get the latest data and updates the states.
+
+        The history is only loaded from the database once, after that the
+        changes of the state are applied as they happen.
+        """
         # Get previous values of start and end
         p_start, p_end = self._period
 
@@ -200,53 +224,64 @@ class HistoryStatsSensor(Entity):
         p_end_timestamp = math.floor(dt_util.as_timestamp(p_end))
         now_timestamp = math.floor(dt_util.as_timestamp(now))
 
+        changed = self._window is not None and self._apply_pending()
+
         # If period has not changed and current time after the period end...
         if (
-            start_timestamp == p_start_timestamp
+            not changed
+            and start_timestamp == p_start_timestamp
             and end_timestamp == p_end_timestamp
             and end_timestamp <= now_timestamp
         ):
             # Don't compute anything as the value cannot have changed
             return
 
-        # Get history between start and end
+        if self._window is None or start_timestamp < self._window.start:
+            # The changes since the start of the period are not known
+            if not self._load_history(start, start_timestamp):
+                return
+        else:
+            self._window.advance(start_timestamp)
+
+        elapsed, count = self._window.measure(min(end_timestamp, now_timestamp))
+
+        # Save value in hours
+        self.value = elapsed / 3600
+
+        # Save counter
+        self.count = count
+
+    def _load_history(self, start, start_timestamp):
+        """Load the changes of the state from the start of the period until now."""
         history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
+            self.hass, start, None, str(self._entity_id)
         )
 
         if self._entity_id not in history_list.keys():
-            return
+            return False
 
         # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state == self._entity_state
-        last_time = start_timestamp
-        elapsed = 0
-        count = 0
+        first_state = history.get_state(self.hass, start, self._entity_id)
+        self._window = HistoryStatsWindow(
+            start_timestamp,
+            first_state is not None and first_state.state == self._entity_state,
+        )
 
-        # Make calculations
         for item in history_list.get(self._entity_id):
-            current_state = item.state == self._entity_state
-            current_time = item.last_changed.timestamp()
-
-            if last_state:
-                elapsed += current_time - last_time
-            if current_state and not last_state:
-                count += 1
-
-            last_state = current_state
-            last_time = current_time
-
-        # Count time elapsed between last history state and end of measure
-        if last_state:
-            measure_end = min(end_timestamp, now_timestamp)
-            elapsed += measure_end - last_time
+            self._window.add(
+                item.last_changed.timestamp(), item.state == self._entity_state
+            )
 
-        # Save value in hours
-        self.value = elapsed / 3600
+        # Changes that were recorded before they were queued are skipped
+        self._apply_pending()
+        return True
 
-        # Save counter
-        self.count = count
+    def _apply_pending(self):
+        """Apply the changes of the state queued since the last update."""
+        changed = bool(self._pending)
+        while self._pending:
+            self._window.add(*self._pending.popleft())
+        return changed
 
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
@@ -307,6 +342,88 @@ class HistoryStatsSensor(Entity):
         self._period = start, end
 
 
+class HistoryStatsWindow:
+    """Time spent in a state and number of times it was entered since start.
+
+    Being in the state at the start counts as having entered it once. Both
+    are updated as changes are added and as the start moves forward, so
+    the history doesn't have to be computed again.
+    """
+
+    def __init__(self, start, matches):
+        """Initialize the window with the start and whether it matched then."""
+        self.start = start
+        self.matches = matches
+        self._changes = deque()
+        # Time spent in the state between the start and the last change
+        self._elapsed = 0
+        self._count = 1 if matches else 0
+
+    @property
+    def last_change(self):
+        """Return the time of the last change and whether it matched."""
+        if self._changes:
+            return self._changes[-1]
+        return self.start, self.matches
+
+    def add(self, timestamp, matches):
+        """Add a change, ignoring changes that are not newer than the last."""
+        last_time, last_matches = self.last_change
+        if timestamp <= last_time:
+            return
+
+        if last_matches:
+            self._elapsed += timestamp - last_time
+        if matches and not last_matches:
+            self._count += 1
+        self._changes.append((timestamp, matches))
+
+    def advance(self, start):
+        """Move the start forward, dropping the changes before it."""
+        if start <= self.start:
+            return
+
+        while self._changes and self._changes[0][0] <= start:
+            timestamp, matches = self._changes.popleft()
+            if self.matches:
+                self._elapsed -= timestamp - self.start
+            if self.matches and not matches:
+                self._count -= 1
+            self.start, self.matches = timestamp, matches
+
+        if self.matches and self._changes:
+            self._elapsed -= start - self.start
+        if not self._changes:
+            self._elapsed = 0
+        self.start = start
+
+    def measure(self, end):
+        """Return the seconds spent in the state and times it was entered."""
+        last_time, last_matches = self.last_change
+        if last_time <= end:
+            return (
+                self._elapsed + (end - last_time if last_matches else 0),
+                self._count,
+            )
+
+        # Changes after the end of the period are excluded
+        elapsed = 0
+        count = 1 if self.matches else 0
+        last_time, last_matches = self.start, self.matches
+        for timestamp, matches in self._changes:
+            if timestamp > end:
+                break
+            if last_matches:
+                elapsed += timestamp - last_time
+            if matches and not last_matches:
+                count += 1
+            last_time, last_matches = timestamp, matches
+
+        if last_matches:
+            elapsed += end - last_time
+        return elapsed, count
+
+
 class HistoryStatsHelper:
     """Static methods to make the HistoryStatsSensor code lighter."""
 
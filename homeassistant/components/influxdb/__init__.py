@@ -1,12 +1,16 @@
 """Support for sending data to an Influx database."""
+from collections import deque
+import gzip
 import logging
 import math
+import os
 import queue
 import re
 import threading
 import time
 
 from influxdb import InfluxDBClient, exceptions
+from influxdb.line_protocol import make_lines
 import requests.exceptions
 import voluptuous as vol
 
@@ -27,6 +31,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
+from homeassistant.core import callback
 from homeassistant.helpers import event as event_helper, state as state_helper
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
@@ -42,6 +47,7 @@ CONF_COMPONENT_CONFIG = "component_config"
 CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_RETRY_COUNT = "max_retries"
+CONF_GZIP = "gzip"
 
 DEFAULT_DATABASE = "home_assistant"
 DEFAULT_VERIFY_SSL = True
@@ -55,6 +61,13 @@ RETRY_INTERVAL = 60  # seconds
 BATCH_TIMEOUT = 1
 BATCH_BUFFER_SIZE = 100
 
+# Points that failed to write are kept in memory up to this limit, later ones
+# are spilled to disk until the file reaches its limit and then dropped
+BACKLOG_MAX_POINTS = 10000
+SPILL_FILE = ".influxdb_spill"
+SPILL_MAX_BYTES = 50 * 1024 * 1024
+SPILL_WRITE_LINES = 5000
+
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string}
 )
@@ -88,6 +101,7 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_PORT): cv.port,
                     vol.Optional(CONF_SSL): cv.boolean,
                     vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
+                    vol.Optional(CONF_GZIP, default=False): cv.boolean,
                     vol.Optional(CONF_DEFAULT_MEASUREMENT): cv.string,
                     vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string,
                     vol.Optional(CONF_TAGS, default={}): vol.Schema(
@@ -180,9 +194,8 @@ def setup(hass, config):
         event_helper.call_later(hass, RETRY_INTERVAL, lambda _: setup(hass, config))
         return True
 
-    def event_to_json(event):
-        """Add an event to the outgoing Influx list."""
-        state = event.data.get("new_state")
+    def state_to_json(state, time_fired):
+        """Convert a new state to a point for the outgoing Influx list."""
         if (
             state is None
             or state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE)
@@ -230,7 +243,7 @@ def setup(hass, config):
         json = {
             "measurement": measurement,
             "tags": {"domain": state.domain, "entity_id": state.object_id},
-            "time": event.time_fired,
+            "time": time_fired,
             "fields": {},
         }
         if _include_state:
@@ -270,7 +283,9 @@ def setup(hass, config):
 
         return json
 
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass, influx, state_to_json, max_tries, conf[CONF_DB_NAME], conf[CONF_GZIP]
+    )
     instance.start()
 
     def shutdown(event):
@@ -280,28 +295,58 @@ def setup(hass, config):
         influx.close()
 
     hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
+    hass.add_job(
+        hass.components.system_health.async_register_info, DOMAIN, system_health_info
+    )
 
     return True
 
 
+async def system_health_info(hass):
+    """Get info for the info page."""
+    instance = hass.data[DOMAIN]
+    return {
+        "written": instance.written,
+        "dropped": instance.dropped,
+        "buffered": instance.backlog_points,
+        "spilled": instance.spilled_points,
+        "lag": round(instance.lag, 3),
+    }
+
+
 class InfluxThread(threading.Thread):
-    """A threaded event handler class."""
+    """A threaded event handler class.
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
+    The event loop only queues the new states, converting and encoding them
+    happens in batches in the thread. Batches that can't be written are kept
+    and written once the database is reachable again.
+    """
+
+    def __init__(self, hass, influx, state_to_json, max_tries, database, compress):
         """Initialize the listener."""
         threading.Thread.__init__(self, name="InfluxDB")
         self.queue = queue.Queue()
         self.influx = influx
-        self.event_to_json = event_to_json
+        self.state_to_json = state_to_json
         self.max_tries = max_tries
-        self.write_errors = 0
+        self.database = database
+        self.compress = compress
+        self.spill_path = hass.config.path(SPILL_FILE)
+        self.backlog = deque()
+        self.backlog_points = 0
+        self.spilled_points = 0
+        self.written = 0
+        self.dropped = 0
+        self.lag = 0.0
         self.shutdown = False
         hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
 
+    @callback
     def _event_listener(self, event):
-        """Listen for new messages on the bus and queue them for Influx."""
-        item = (time.monotonic(), event)
-        self.queue.put(item)
+        """Queue the new state of an event for Influx."""
+        state = event.data.get("new_state")
+        if state is not None:
+            self.queue.put((time.monotonic(), event.time_fired, state))
 
     @staticmethod
     def batch_timeout():
@@ -309,30 +354,41 @@ class InfluxThread(threading.Thread):
         return BATCH_TIMEOUT
 
     def get_events_json(self):
-        """Return a batch of events formatted for writing."""
+        """Return a batch of events formatted for writing.
+
+        A batch is complete when it is full or when the batch timeout passed
+        since its first event.
+        """
         queue_seconds = QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
 
         count = 0
         json = []
+        deadline = None
 
         dropped = 0
 
         try:
             while len(json) < BATCH_BUFFER_SIZE and not self.shutdown:
-                timeout = None if count == 0 else self.batch_timeout()
+                if count == 0:
+                    timeout = None
+                else:
+                    timeout = max(deadline - time.monotonic(), 0)
                 item = self.queue.get(timeout=timeout)
+                if count == 0:
+                    deadline = time.monotonic() + self.batch_timeout()
                 count += 1
 
                 if item is None:
                     self.shutdown = True
                 else:
-                    timestamp, event = item
+                    timestamp, time_fired, state = item
                     age = time.monotonic() - timestamp
 
                     if age < queue_seconds:
-                        event_json = self.event_to_json(event)
+                        event_json = self.state_to_json(state, time_fired)
                         if event_json:
                             json.append(event_json)
+                        self.lag = age
                     else:
                         dropped += 1
 
@@ -340,21 +396,41 @@ class InfluxThread(threading.Thread):
             pass
 
         if dropped:
+            self.dropped += dropped
             _LOGGER.warning("Catching up, dropped %d old events", dropped)
 
         return count, json
 
+    def _write(self, json=None, lines=None):
+        """Write points or line protocol data, compressed if configured."""
+        if not self.compress:
+            if lines is None:
+                self.influx.write_points(json)
+            else:
+                self.influx.write_points(lines.splitlines(), protocol="line")
+            return
+
+        if lines is None:
+            lines = make_lines({"points": json})
+        self.influx.request(
+            url="write",
+            method="POST",
+            params={"db": self.database},
+            data=gzip.compress(lines.encode("utf-8")),
+            expected_response_code=204,
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Content-Encoding": "gzip",
+            },
+        )
+
     def write_to_influxdb(self, json):
         """Write preprocessed events to influxdb, with retry."""
 
         for retry in range(self.max_tries + 1):
             try:
-                self.influx.write_points(json)
-
-                if self.write_errors:
-                    _LOGGER.error("Resumed, lost %d events", self.write_errors)
-                    self.write_errors = 0
-
+                self._write(json)
+                self.written += len(json)
                 _LOGGER.debug("Wrote %d events", len(json))
                 break
             except (
@@ -365,12 +441,103 @@ class InfluxThread(threading.Thread):
                 if retry < self.max_tries:
                     time.sleep(RETRY_DELAY)
                 else:
-                    if not self.write_errors:
+                    if not self.backlog_points and not self.spilled_points:
                         _LOGGER.error("Write error: %s", err)
-                    self.write_errors += len(json)
+                    self.buffer(make_lines({"points": json}), len(json))
+                    return
+
+        if self.backlog_points or self.spilled_points:
+            self.write_backlog()
+
+    def buffer(self, lines, points):
+        """Keep line protocol data of a failed write, spill to disk if needed."""
+        if self.backlog_points + points <= BACKLOG_MAX_POINTS:
+            self.backlog.append((lines, points))
+            self.backlog_points += points
+            return
+
+        self.spill(lines, points)
+
+    def spill(self, lines, points):
+        """Append line protocol data to the spill file."""
+        try:
+            size = os.path.getsize(self.spill_path)
+        except OSError:
+            size = 0
+
+        if size + len(lines) > SPILL_MAX_BYTES:
+            self.dropped += points
+            _LOGGER.warning("Buffer full, dropped %d events", points)
+            return
+
+        try:
+            with open(self.spill_path, "a") as spill_file:
+                spill_file.write(lines)
+        except OSError as err:
+            self.dropped += points
+            _LOGGER.warning("Unable to buffer %d events: %s", points, err)
+            return
+
+        self.spilled_points += points
+
+    def write_backlog(self):
+        """Write the data of failed writes, oldest first."""
+        _LOGGER.info(
+            "Resumed, writing %d buffered events",
+            self.backlog_points + self.spilled_points,
+        )
+        error = (
+            exceptions.InfluxDBClientError,
+            exceptions.InfluxDBServerError,
+            OSError,
+        )
+        while self.backlog:
+            lines, points = self.backlog[0]
+            try:
+                self._write(lines=lines)
+            except error:
+                return
+            self.backlog.popleft()
+            self.backlog_points -= points
+            self.written += points
+
+        if not os.path.exists(self.spill_path):
+            return
+
+        try:
+            with open(self.spill_path) as spill_file:
+                spilled = spill_file.read().splitlines()
+        except OSError as err:
+            _LOGGER.warning("Unable to read buffered events: %s", err)
+            return
+
+        for start in range(0, len(spilled), SPILL_WRITE_LINES):
+            chunk = spilled[start : start + SPILL_WRITE_LINES]
+            try:
+                self._write(lines="\n".join(chunk) + "\n")
+            except error:
+                remaining = spilled[start:]
+                self.spilled_points = len(remaining)
+                try:
+                    with open(self.spill_path, "w") as spill_file:
+                        spill_file.write("\n".join(remaining) + "\n")
+                except OSError as err:
+                    _LOGGER.warning("Unable to update buffered events: %s", err)
+                return
+            self.written += len(chunk)
+
+        os.remove(self.spill_path)
+        self.spilled_points = 0
 
     def run(self):
         """Process incoming events."""
+        try:
+            # Events buffered before the last shutdown
+            with open(self.spill_path) as spill_file:
+                self.spilled_points = sum(1 for _ in spill_file)
+        except OSError:
+            pass
+
         while not self.shutdown:
             count, json = self.get_events_json()
             if json:
@@ -378,6 +545,9 @@ class InfluxThread(threading.Thread):
             for _ in range(count):
                 self.queue.task_done()
 
+        while self.backlog:
+            self.spill(*self.backlog.popleft())
+
     def block_till_done(self):
         """Block till all events processed."""
         self.queue.join()
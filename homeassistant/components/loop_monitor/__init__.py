@@ -0,0 +1,291 @@
+"""Detect callbacks that block the event loop."""
+import asyncio
+from asyncio import events
+from collections import deque
+import functools
+import logging
+import sys
+import threading
+from time import monotonic
+import traceback
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType, HomeAssistantType
+import homeassistant.util.dt as dt_util
+from homeassistant.util.latency import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+DOMAIN = "loop_monitor"
+
+CONF_INTERVAL = "interval"
+CONF_MAX_STALLS = "max_stalls"
+CONF_THRESHOLD = "threshold"
+
+DEFAULT_INTERVAL = 0.1
+DEFAULT_MAX_STALLS = 50
+DEFAULT_THRESHOLD = 0.5
+
+# Number of innermost frames kept of a sampled stack
+STACK_LIMIT = 25
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_THRESHOLD, default=DEFAULT_THRESHOLD): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.01)
+                ),
+                vol.Optional(CONF_INTERVAL, default=DEFAULT_INTERVAL): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.01)
+                ),
+                vol.Optional(
+                    CONF_MAX_STALLS, default=DEFAULT_MAX_STALLS
+                ): cv.positive_int,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+_HANDLE_RUN_CODE = events.Handle._run.__code__  # pylint: disable=protected-access
+_INTEGRATION_PREFIXES = ("homeassistant.components.", "custom_components.")
+
+
+async def async_setup(hass: HomeAssistantType, config: ConfigType) -> bool:
+    """Set up the event loop monitor."""
+    conf = config[DOMAIN]
+
+    monitor = hass.data[DOMAIN] = LoopMonitor(
+        hass, conf[CONF_THRESHOLD], conf[CONF_INTERVAL], conf[CONF_MAX_STALLS]
+    )
+    monitor.async_start()
+
+    @callback
+    def async_stop_monitor(event: Event) -> None:
+        """Stop the monitor when Home Assistant stops."""
+        monitor.async_stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_monitor)
+
+    hass.components.websocket_api.async_register_command(websocket_report)
+    hass.components.system_health.async_register_info(DOMAIN, system_health_info)
+
+    return True
+
+
+class LoopMonitor:
+    """Measure event loop lag and sample the callbacks that stall it.
+
+    A callback on the loop records a heartbeat every interval. A watchdog
+    thread samples the stack of the loop thread when the heartbeat is more
+    than the threshold late, and the sample is stored with the measured lag
+    once the loop runs again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistantType,
+        threshold: float,
+        interval: float,
+        max_stalls: int,
+    ) -> None:
+        """Initialize the monitor."""
+        self.hass = hass
+        self.threshold = threshold
+        self.interval = interval
+        self.lag = LatencyHistogram()
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=max_stalls)
+        self._heartbeat = monotonic()
+        self._expected = self._heartbeat
+        self._sampled_stall: Optional[Dict[str, Any]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stop_event = threading.Event()
+
+    @callback
+    def async_start(self) -> None:
+        """Start measuring the loop and the watchdog thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._async_schedule_heartbeat(monotonic())
+        threading.Thread(
+            target=self._watchdog, name="LoopMonitorWatchdog", daemon=True
+        ).start()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the monitor."""
+        self._stop_event.set()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    @callback
+    def async_report(self) -> Dict[str, Any]:
+        """Return the diagnostic report."""
+        return {
+            "threshold": self.threshold,
+            "lag": self.lag.as_dict(),
+            "stalls": list(self.stalls),
+        }
+
+    @callback
+    def _async_schedule_heartbeat(self, now: float) -> None:
+        """Schedule the next heartbeat."""
+        self._heartbeat = now
+        self._expected = now + self.interval
+        self._timer = self.hass.loop.call_later(self.interval, self._async_heartbeat)
+
+    @callback
+    def _async_heartbeat(self) -> None:
+        """Measure how late the loop ran this callback."""
+        now = monotonic()
+        lag = max(now - self._expected, 0.0)
+        self.lag.record(lag)
+
+        stall, self._sampled_stall = self._sampled_stall, None
+
+        # The watchdog may have sampled the loop just as it became responsive
+        if stall is not None and lag >= self.threshold:
+            stall["duration"] = round(lag, 3)
+            self.stalls.append(stall)
+            _LOGGER.warning(
+                "Event loop was blocked for %.3f seconds by %s (integration: %s)",
+                lag,
+                stall["callback"],
+                stall["integration"],
+            )
+
+        self._async_schedule_heartbeat(now)
+
+    def _watchdog(self) -> None:
+        """Sample the loop thread when the heartbeat is late."""
+        while not self._stop_event.wait(self.interval):
+            if self._sampled_stall is not None:
+                continue
+
+            if monotonic() - self._heartbeat < self.interval + self.threshold:
+                continue
+
+            # pylint: disable=protected-access
+            frame = sys._current_frames().get(self._loop_thread_id)  # type: ignore
+
+            if frame is not None:
+                self._sampled_stall = _describe_stall(frame)
+
+
+def _describe_stall(frame: Any) -> Dict[str, Any]:
+    """Describe what the loop thread is running."""
+    stack = traceback.extract_stack(frame, limit=STACK_LIMIT)
+    name, module, event_type = None, None, None
+
+    current = frame
+    while current is not None:
+        if current.f_code is _HANDLE_RUN_CODE:
+            handle = current.f_locals.get("self")
+            if handle is not None:
+                # pylint: disable=protected-access
+                name, module, event_type = _describe_callback(
+                    handle._callback, handle._args
+                )
+            break
+        current = current.f_back
+
+    return {
+        "time": dt_util.utcnow().isoformat(),
+        "callback": name,
+        "integration": _find_integration(frame, module),
+        "event_type": event_type,
+        "stack": traceback.format_list(stack),
+    }
+
+
+def _find_integration(frame: Any, callback_module: Optional[str]) -> Optional[str]:
+    """Return the integration of the innermost integration frame."""
+    current = frame
+    for _ in range(STACK_LIMIT):
+        if current is None:
+            break
+        integration = _integration_from_module(current.f_globals.get("__name__"))
+        if integration is not None:
+            return integration
+        current = current.f_back
+
+    return _integration_from_module(callback_module)
+
+
+def _describe_callback(
+    target: Any, args: Tuple
+) -> Tuple[str, Optional[str], Optional[str]]:
+    """Return name, module and dispatched event type of a loop callback."""
+    task = getattr(target, "__self__", None)
+
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        name = getattr(coro, "__qualname__", repr(coro))
+        coro_frame = getattr(coro, "cr_frame", None)
+        if coro_frame is None:
+            return name, None, None
+        return (
+            name,
+            coro_frame.f_globals.get("__name__"),
+            _find_event_type(coro_frame.f_locals.values()),
+        )
+
+    while isinstance(target, functools.partial):
+        args = target.args + args
+        target = target.func
+
+    return (
+        getattr(target, "__qualname__", repr(target)),
+        getattr(target, "__module__", None),
+        _find_event_type(args),
+    )
+
+
+def _find_event_type(values: Iterable[Any]) -> Optional[str]:
+    """Return the type of the first event in values."""
+    for value in values:
+        if isinstance(value, Event):
+            return value.event_type
+    return None
+
+
+def _integration_from_module(module: Optional[str]) -> Optional[str]:
+    """Return the integration a module belongs to."""
+    if module is None:
+        return None
+
+    for prefix in _INTEGRATION_PREFIXES:
+        if module.startswith(prefix):
+            return module[len(prefix) :].split(".", 1)[0]
+
+    return None
+
+
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "loop_monitor/report"})
+def websocket_report(
+    hass: HomeAssistantType, connection: websocket_api.ActiveConnection, msg: Dict
+) -> None:
+    """Return the event loop monitor report."""
+    connection.send_message(
+        websocket_api.result_message(msg["id"], hass.data[DOMAIN].async_report())
+    )
+
+
+async def system_health_info(hass: HomeAssistantType) -> Dict[str, Any]:
+    """Get info for the info page."""
+    monitor = hass.data[DOMAIN]
+    return {
+        "loop_lag_p99": monitor.lag.percentile(99),
+        "loop_lag_max": monitor.lag.maximum,
+        "stalls": len(monitor.stalls),
+    }
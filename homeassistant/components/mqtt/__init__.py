@@ -1,5 +1,6 @@
 """Support for MQTT message handling."""
 import asyncio
+from collections import deque
 from functools import partial, wraps
 import inspect
 from itertools import groupby
@@ -9,7 +10,9 @@ from operator import attrgetter
 import os
 import ssl
 import sys
-from typing import Any, Callable, List, Optional, Union
+import threading
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 import attr
 import requests.certs
@@ -38,6 +41,7 @@ from homeassistant.helpers.typing import ConfigType, HomeAssistantType, ServiceD
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.latency import LatencyHistogram
 from homeassistant.util.logging import catch_log_exception
 
 # Loading the config flow file will register the flow
@@ -57,6 +61,7 @@ from .debug_info import log_messages
 from .discovery import MQTT_DISCOVERY_UPDATED, clear_discovery_hash, set_discovery_hash
 from .models import Message, MessageCallbackType, PublishPayloadType
 from .subscription import async_subscribe_topics, async_unsubscribe_topics
+from .topic_trie import TopicTrie
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -119,6 +124,12 @@ ATTR_RETAIN = CONF_RETAIN
 
 MAX_RECONNECT_WAIT = 300  # seconds
 
+# Messages handled per event loop iteration when draining the receive buffer
+MAX_MESSAGES_PER_ITERATION = 100
+
+# Maximum size of the topic filters sent in a single SUBSCRIBE packet
+MAX_SUBSCRIBE_PAYLOAD_SIZE = 4096  # bytes
+
 CONNECTION_SUCCESS = "connection_success"
 CONNECTION_FAILED = "connection_failed"
 CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
@@ -653,6 +664,8 @@ async def async_setup_entry(hass, entry):
 
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_mqtt)
 
+    hass.components.system_health.async_register_info(DOMAIN, system_health_info)
+
     async def async_publish_service(call: ServiceCall):
         """Handle MQTT publish service calls."""
         msg_topic: str = call.data[ATTR_TOPIC]
@@ -763,10 +776,24 @@ class MQTT:
         self.port = port
         self.keepalive = keepalive
         self.subscriptions: List[Subscription] = []
+        self._subscription_index: TopicTrie[Subscription] = TopicTrie()
         self.birth_message = birth_message
         self.connected = False
         self._mqttc: mqtt.Client = None
         self._paho_lock = asyncio.Lock()
+        # Messages received by the paho thread and not yet handled
+        self._pending_messages: Deque[Any] = deque()
+        self._pending_lock = threading.Lock()
+        self._drain_scheduled = False
+        # Outgoing messages waiting for the publish task
+        self._pending_publishes: List[Tuple[Any, ...]] = []
+        self._publishing = 0
+        self._publish_task: Optional[asyncio.Task] = None
+        # Send time of SUBSCRIBE packets by message id until acknowledged
+        self._pending_subacks: Dict[int, float] = {}
+        self._early_subacks: Dict[int, float] = {}
+        self._subscribe_lock = threading.Lock()
+        self.subscribe_rtt = LatencyHistogram()
 
         if protocol == PROTOCOL_31:
             proto: int = mqtt.MQTTv31
@@ -795,6 +822,7 @@ class MQTT:
         self._mqttc.on_connect = self._mqtt_on_connect
         self._mqttc.on_disconnect = self._mqtt_on_disconnect
         self._mqttc.on_message = self._mqtt_on_message
+        self._mqttc.on_subscribe = self._mqtt_on_subscribe
 
         if will_message is not None:
             self._mqttc.will_set(  # pylint: disable=no-value-for-parameter
@@ -804,16 +832,79 @@ class MQTT:
                 )
             )
 
+    @property
+    def pending_publishes(self) -> int:
+        """Return the number of messages waiting to be handed to paho."""
+        return len(self._pending_publishes) + self._publishing
+
     async def async_publish(
         self, topic: str, payload: PublishPayloadType, qos: int, retain: bool
     ) -> None:
-        """Publish a MQTT message."""
-        async with self._paho_lock:
-            _LOGGER.debug("Transmitting message on %s: %s", topic, payload)
-            await self.hass.async_add_executor_job(
-                self._mqttc.publish, topic, payload, qos, retain
+        """Publish a MQTT message.
+
+        Messages are queued and handed to paho in batches by a single
+        publish task, so a burst of publishes takes one executor job.
+        """
+        future = self.hass.loop.create_future()
+        self._pending_publishes.append((topic, payload, qos, retain, future))
+
+        if self._publish_task is None:
+            self._publish_task = self.hass.async_create_task(
+                self._async_publish_pending()
             )
 
+        await future
+
+    async def _async_publish_pending(self) -> None:
+        """Publish queued messages until the queue is empty."""
+        batch: List[Tuple[Any, ...]] = []
+        try:
+            while self._pending_publishes:
+                batch, self._pending_publishes = self._pending_publishes, []
+                self._publishing = len(batch)
+
+                async with self._paho_lock:
+                    errors = await self.hass.async_add_executor_job(
+                        self._publish_batch, batch
+                    )
+
+                for (*_, future), error in zip(batch, errors):
+                    if future.done():
+                        continue
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+        except BaseException as err:
+            # Don't leave publishers waiting for a task that is gone
+            unresolved, self._pending_publishes = batch + self._pending_publishes, []
+            for *_, future in unresolved:
+                if future.done():
+                    continue
+                if isinstance(err, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(err)
+            raise
+        finally:
+            self._publishing = 0
+            self._publish_task = None
+
+    def _publish_batch(self, batch: List[Tuple[Any, ...]]) -> List[Any]:
+        """Publish a batch of messages, return the error of each message."""
+        errors: List[Any] = []
+
+        for topic, payload, qos, retain, _ in batch:
+            _LOGGER.debug("Transmitting message on %s: %s", topic, payload)
+            try:
+                self._mqttc.publish(topic, payload, qos, retain)
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(err)
+            else:
+                errors.append(None)
+
+        return errors
+
     async def async_connect(self) -> str:
         """Connect to the host. Does process messages yet."""
         # pylint: disable=import-outside-toplevel
@@ -860,6 +951,7 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        self._subscription_index.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -871,6 +963,7 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
+            self._subscription_index.remove(topic, subscription)
 
             if any(other.topic == topic for other in self.subscriptions):
                 # Other subscriptions on topic remaining - don't unsubscribe.
@@ -900,11 +993,42 @@ class MQTT:
         _LOGGER.debug("Subscribing to %s", topic)
 
         async with self._paho_lock:
-            result: int = None
-            result, _ = await self.hass.async_add_executor_job(
-                self._mqttc.subscribe, topic, qos
-            )
-            _raise_on_error(result)
+            await self.hass.async_add_executor_job(self._subscribe, topic, qos)
+
+    async def _async_perform_subscriptions(
+        self, subscriptions: List[Tuple[str, int]]
+    ) -> None:
+        """Perform paho-mqtt subscriptions with several topics per packet."""
+        for chunk in _chunk_subscriptions(subscriptions):
+            _LOGGER.debug("Subscribing to %s", ", ".join(topic for topic, _ in chunk))
+
+            async with self._paho_lock:
+                await self.hass.async_add_executor_job(self._subscribe, chunk)
+
+    def _subscribe(self, *args: Any) -> None:
+        """Send a SUBSCRIBE packet and track its round-trip time."""
+        sent = monotonic()
+        result, mid = self._mqttc.subscribe(*args)
+        _raise_on_error(result)
+
+        # The SUBACK may have been handled by the paho thread already
+        with self._subscribe_lock:
+            acked = self._early_subacks.pop(mid, None)
+            if acked is None:
+                self._pending_subacks[mid] = sent
+            else:
+                self.subscribe_rtt.record(acked - sent)
+
+    def _mqtt_on_subscribe(self, _mqttc, _userdata, mid: int, _granted_qos) -> None:
+        """Subscribe acknowledged callback."""
+        acked = monotonic()
+
+        with self._subscribe_lock:
+            sent = self._pending_subacks.pop(mid, None)
+            if sent is None:
+                self._early_subacks[mid] = acked
+            else:
+                self.subscribe_rtt.record(acked - sent)
 
     def _mqtt_on_connect(self, _mqttc, _userdata, _flags, result_code: int) -> None:
         """On connect callback.
@@ -927,10 +1051,13 @@ class MQTT:
 
         # Group subscriptions to only re-subscribe once for each topic.
         keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
+        subscriptions = [
             # Re-subscribe with the highest requested qos
-            max_qos = max(subscription.qos for subscription in subs)
-            self.hass.add_job(self._async_perform_subscription, topic, max_qos)
+            (topic, max(subscription.qos for subscription in subs))
+            for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc)
+        ]
+        if subscriptions:
+            self.hass.add_job(self._async_perform_subscriptions, subscriptions)
 
         if self.birth_message:
             self.hass.add_job(
@@ -944,8 +1071,40 @@ class MQTT:
             )
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Messages are buffered and the event loop is only woken up when the
+        buffer was empty, a burst of messages is handled by a single drain.
+        """
+        with self._pending_lock:
+            self._pending_messages.append(msg)
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+
+        self.hass.loop.call_soon_threadsafe(self._async_drain_messages)
+
+    @callback
+    def _async_drain_messages(self) -> None:
+        """Handle buffered messages, yielding to the loop between batches."""
+        pending = self._pending_messages
+
+        for _ in range(MAX_MESSAGES_PER_ITERATION):
+            try:
+                msg = pending.popleft()
+            except IndexError:
+                with self._pending_lock:
+                    if not pending:
+                        self._drain_scheduled = False
+                        return
+                msg = pending.popleft()
+
+            try:
+                self._mqtt_handle_message(msg)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling message on %s", msg.topic)
+
+        self.hass.loop.call_soon(self._async_drain_messages)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -956,24 +1115,30 @@ class MQTT:
             msg.payload,
         )
         timestamp = dt_util.utcnow()
+        # Decode the payload once for each encoding subscribers asked for
+        payloads: Dict[Optional[str], Optional[SubscribePayloadType]] = {
+            None: msg.payload
+        }
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
-
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
+        for subscription in self._subscription_index.match(msg.topic):
+            try:
+                payload = payloads[subscription.encoding]
+            except KeyError:
                 try:
                     payload = msg.payload.decode(subscription.encoding)
                 except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s (for %s)",
-                        msg.payload,
-                        msg.topic,
-                        subscription.encoding,
-                        subscription.callback,
-                    )
-                    continue
+                    payload = None
+                payloads[subscription.encoding] = payload
+
+            if payload is None:
+                _LOGGER.warning(
+                    "Can't decode payload %s on %s with encoding %s (for %s)",
+                    msg.payload,
+                    msg.topic,
+                    subscription.encoding,
+                    subscription.callback,
+                )
+                continue
 
             self.hass.async_run_job(
                 subscription.callback,
@@ -992,6 +1157,34 @@ class MQTT:
         self.connected = False
         _LOGGER.warning("Disconnected from MQTT server (%s)", result_code)
 
+        # Unacknowledged subscriptions are sent again on reconnect
+        with self._subscribe_lock:
+            self._pending_subacks.clear()
+            self._early_subacks.clear()
+
+
+def _chunk_subscriptions(
+    subscriptions: List[Tuple[str, int]]
+) -> List[List[Tuple[str, int]]]:
+    """Split subscriptions to limit the size of each SUBSCRIBE packet."""
+    chunks: List[List[Tuple[str, int]]] = []
+    chunk: List[Tuple[str, int]] = []
+    size = 0
+
+    for topic, qos in subscriptions:
+        # Length prefixed topic filter followed by the requested qos
+        topic_size = len(topic.encode("utf-8")) + 3
+        if chunk and size + topic_size > MAX_SUBSCRIBE_PAYLOAD_SIZE:
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append((topic, qos))
+        size += topic_size
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
 
 def _raise_on_error(result_code: int) -> None:
     """Raise error if error result."""
@@ -1004,20 +1197,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -1374,3 +1553,15 @@ async def websocket_subscribe(hass, connection, msg):
     )
 
     connection.send_message(websocket_api.result_message(msg["id"]))
+
+
+async def system_health_info(hass: HomeAssistantType) -> Dict[str, Any]:
+    """Get info for the info page."""
+    mqtt_data = hass.data[DATA_MQTT]
+    return {
+        "connected": mqtt_data.connected,
+        "subscriptions": len(mqtt_data.subscriptions),
+        "pending_publishes": mqtt_data.pending_publishes,
+        "subscribe_rtt_p99": mqtt_data.subscribe_rtt.percentile(99),
+        "subscribe_rtt_max": mqtt_data.subscribe_rtt.maximum,
+    }
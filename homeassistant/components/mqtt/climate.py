@@ -50,7 +50,6 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.typing import ConfigType, HomeAssistantType
 
 from . import (
-    ATTR_DISCOVERY_HASH,
     CONF_QOS,
     CONF_RETAIN,
     CONF_UNIQUE_ID,
@@ -62,7 +61,7 @@ from . import (
     subscription,
 )
 from .debug_info import log_messages
-from .discovery import MQTT_DISCOVERY_NEW, clear_discovery_hash
+from .discovery import MQTT_DISCOVERY_NEW, async_discovery_batch_handler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -244,20 +243,17 @@ async def async_setup_platform(
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up MQTT climate device dynamically through MQTT discovery."""
 
-    async def async_discover(discovery_payload):
+    async def async_discover(discovery_payload, add_entities):
         """Discover and add a MQTT climate device."""
-        discovery_data = discovery_payload.discovery_data
-        try:
-            config = PLATFORM_SCHEMA(discovery_payload)
-            await _async_setup_entity(
-                hass, config, async_add_entities, config_entry, discovery_data
-            )
-        except Exception:
-            clear_discovery_hash(hass, discovery_data[ATTR_DISCOVERY_HASH])
-            raise
+        config = PLATFORM_SCHEMA(discovery_payload)
+        await _async_setup_entity(
+            hass, config, add_entities, config_entry, discovery_payload.discovery_data
+        )
 
     async_dispatcher_connect(
-        hass, MQTT_DISCOVERY_NEW.format(climate.DOMAIN, "mqtt"), async_discover
+        hass,
+        MQTT_DISCOVERY_NEW.format(climate.DOMAIN, "mqtt"),
+        async_discovery_batch_handler(hass, async_discover, async_add_entities),
     )
 
 
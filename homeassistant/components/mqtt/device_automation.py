@@ -7,8 +7,8 @@ from homeassistant.components import mqtt
 from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from . import ATTR_DISCOVERY_HASH, device_trigger
-from .discovery import MQTT_DISCOVERY_NEW, clear_discovery_hash
+from . import device_trigger
+from .discovery import MQTT_DISCOVERY_NEW, async_discovery_batch_handler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,20 +32,17 @@ async def async_setup_entry(hass, config_entry):
             return
         await device_trigger.async_device_removed(hass, event.data["device_id"])
 
-    async def async_discover(discovery_payload):
+    async def async_discover(discovery_payload, add_entities):
         """Discover and add an MQTT device automation."""
-        discovery_data = discovery_payload.discovery_data
-        try:
-            config = PLATFORM_SCHEMA(discovery_payload)
-            if config[CONF_AUTOMATION_TYPE] == AUTOMATION_TYPE_TRIGGER:
-                await device_trigger.async_setup_trigger(
-                    hass, config, config_entry, discovery_data
-                )
-        except Exception:
-            clear_discovery_hash(hass, discovery_data[ATTR_DISCOVERY_HASH])
-            raise
+        config = PLATFORM_SCHEMA(discovery_payload)
+        if config[CONF_AUTOMATION_TYPE] == AUTOMATION_TYPE_TRIGGER:
+            await device_trigger.async_setup_trigger(
+                hass, config, config_entry, discovery_payload.discovery_data
+            )
 
     async_dispatcher_connect(
-        hass, MQTT_DISCOVERY_NEW.format("device_automation", "mqtt"), async_discover
+        hass,
+        MQTT_DISCOVERY_NEW.format("device_automation", "mqtt"),
+        async_discovery_batch_handler(hass, async_discover),
     )
     hass.bus.async_listen(EVENT_DEVICE_REGISTRY_UPDATED, async_device_removed)
@@ -6,6 +6,7 @@ import re
 
 from homeassistant.components import mqtt
 from homeassistant.const import CONF_DEVICE, CONF_PLATFORM
+from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import HomeAssistantType
 
@@ -49,20 +50,91 @@ def clear_discovery_hash(hass, discovery_hash):
 
 
 def set_discovery_hash(hass, discovery_hash):
-    """Clear entry in ALREADY_DISCOVERED list."""
-    hass.data[ALREADY_DISCOVERED][discovery_hash] = {}
+    """Set entry in ALREADY_DISCOVERED list, keeping the applied payload hash."""
+    hass.data[ALREADY_DISCOVERED].setdefault(discovery_hash, None)
 
 
 class MQTTConfig(dict):
     """Dummy class to allow adding attributes."""
 
 
+def async_discovery_batch_handler(hass, async_discover, async_add_entities=None):
+    """Return a MQTT_DISCOVERY_NEW handler setting up a batch of payloads.
+
+    async_discover is called for each payload with a function to add the
+    entities it creates, all entities of the batch are then added to the
+    platform in a single call.
+    """
+
+    async def async_discover_batch(discovery_payloads):
+        """Set up all discovered payloads of a batch."""
+        entities = []
+
+        for discovery_payload in discovery_payloads:
+            discovery_hash = discovery_payload.discovery_data[ATTR_DISCOVERY_HASH]
+            try:
+                await async_discover(discovery_payload, entities.extend)
+            except Exception:  # pylint: disable=broad-except
+                clear_discovery_hash(hass, discovery_hash)
+                _LOGGER.exception(
+                    "Error setting up discovered component: %s %s", *discovery_hash
+                )
+
+        if entities:
+            async_add_entities(entities)
+
+    return async_discover_batch
+
+
+def _parse_discovery_payload(payload, topic, discovery_hash):
+    """Parse a discovery payload and expand abbreviations."""
+    payload = MQTTConfig(json.loads(payload) if payload else {})
+
+    for key in list(payload.keys()):
+        abbreviated_key = key
+        key = ABBREVIATIONS.get(key, key)
+        payload[key] = payload.pop(abbreviated_key)
+
+    if CONF_DEVICE in payload:
+        device = payload[CONF_DEVICE]
+        for key in list(device.keys()):
+            abbreviated_key = key
+            key = DEVICE_ABBREVIATIONS.get(key, key)
+            device[key] = device.pop(abbreviated_key)
+
+    if TOPIC_BASE in payload:
+        base = payload.pop(TOPIC_BASE)
+        for key, value in payload.items():
+            if isinstance(value, str) and value:
+                if value[0] == TOPIC_BASE and key.endswith("_topic"):
+                    payload[key] = f"{base}{value[1:]}"
+                if value[-1] == TOPIC_BASE and key.endswith("_topic"):
+                    payload[key] = f"{value[:-1]}{base}"
+
+    if payload:
+        # Attach MQTT topic to the payload, used for debug prints
+        setattr(payload, "__configuration_source__", f"MQTT (topic: '{topic}')")
+        discovery_data = {
+            ATTR_DISCOVERY_HASH: discovery_hash,
+            ATTR_DISCOVERY_PAYLOAD: payload,
+            ATTR_DISCOVERY_TOPIC: topic,
+        }
+        setattr(payload, "discovery_data", discovery_data)
+
+        payload[CONF_PLATFORM] = "mqtt"
+
+    return payload
+
+
 async def async_start(
     hass: HomeAssistantType, discovery_topic, hass_config, config_entry=None
 ) -> bool:
     """Initialize of MQTT Discovery."""
+    # New components by discovery hash, set up together by the next batch
+    pending = {}
 
-    async def async_device_message_received(msg):
+    @callback
+    def async_device_message_received(msg):
         """Process the received message."""
         payload = msg.payload
         topic = msg.topic
@@ -78,69 +150,74 @@ async def async_start(
             _LOGGER.warning("Integration %s is not supported", component)
             return
 
-        if payload:
-            try:
-                payload = json.loads(payload)
-            except ValueError:
-                _LOGGER.warning("Unable to parse JSON %s: '%s'", object_id, payload)
-                return
-
-        payload = MQTTConfig(payload)
-
-        for key in list(payload.keys()):
-            abbreviated_key = key
-            key = ABBREVIATIONS.get(key, key)
-            payload[key] = payload.pop(abbreviated_key)
-
-        if CONF_DEVICE in payload:
-            device = payload[CONF_DEVICE]
-            for key in list(device.keys()):
-                abbreviated_key = key
-                key = DEVICE_ABBREVIATIONS.get(key, key)
-                device[key] = device.pop(abbreviated_key)
-
-        if TOPIC_BASE in payload:
-            base = payload.pop(TOPIC_BASE)
-            for key, value in payload.items():
-                if isinstance(value, str) and value:
-                    if value[0] == TOPIC_BASE and key.endswith("_topic"):
-                        payload[key] = f"{base}{value[1:]}"
-                    if value[-1] == TOPIC_BASE and key.endswith("_topic"):
-                        payload[key] = f"{value[:-1]}{base}"
-
         # If present, the node_id will be included in the discovered object id
         discovery_id = " ".join((node_id, object_id)) if node_id else object_id
         discovery_hash = (component, discovery_id)
+        already_discovered = hass.data[ALREADY_DISCOVERED]
+        raw_payload = payload
+
+        if (
+            payload
+            and discovery_hash in already_discovered
+            and already_discovered[discovery_hash] == raw_payload
+        ):
+            # Retained configs are replayed on every reconnect
+            _LOGGER.debug(
+                "Component has already been discovered: %s %s, config unchanged",
+                component,
+                discovery_id,
+            )
+            return
 
-        if payload:
-            # Attach MQTT topic to the payload, used for debug prints
-            setattr(payload, "__configuration_source__", f"MQTT (topic: '{topic}')")
-            discovery_data = {
-                ATTR_DISCOVERY_HASH: discovery_hash,
-                ATTR_DISCOVERY_PAYLOAD: payload,
-                ATTR_DISCOVERY_TOPIC: topic,
-            }
-            setattr(payload, "discovery_data", discovery_data)
-
-            payload[CONF_PLATFORM] = "mqtt"
-
-        if ALREADY_DISCOVERED not in hass.data:
-            hass.data[ALREADY_DISCOVERED] = {}
-        if discovery_hash in hass.data[ALREADY_DISCOVERED]:
+        try:
+            payload = _parse_discovery_payload(payload, topic, discovery_hash)
+        except ValueError:
+            _LOGGER.warning("Unable to parse JSON %s: '%s'", object_id, payload)
+            return
+
+        if discovery_hash in pending:
+            if payload:
+                _LOGGER.info(
+                    "Component has already been discovered: %s %s, updating",
+                    component,
+                    discovery_id,
+                )
+                pending[discovery_hash] = payload
+                already_discovered[discovery_hash] = raw_payload
+            else:
+                _LOGGER.info(
+                    "Component removed before set up: %s %s", component, discovery_id
+                )
+                del pending[discovery_hash]
+                del already_discovered[discovery_hash]
+        elif discovery_hash in already_discovered:
             # Dispatch update
             _LOGGER.info(
                 "Component has already been discovered: %s %s, sending update",
                 component,
                 discovery_id,
             )
+            if payload:
+                already_discovered[discovery_hash] = raw_payload
             async_dispatcher_send(
                 hass, MQTT_DISCOVERY_UPDATED.format(discovery_hash), payload
             )
         elif payload:
             # Add component
             _LOGGER.info("Found new component: %s %s", component, discovery_id)
-            hass.data[ALREADY_DISCOVERED][discovery_hash] = None
-
+            already_discovered[discovery_hash] = raw_payload
+            if not pending:
+                hass.async_create_task(async_discover_pending())
+            pending[discovery_hash] = payload
+
+    async def async_discover_pending():
+        """Set up the components discovered since the last batch."""
+        discovered = {}
+        for (component, _), payload in pending.items():
+            discovered.setdefault(component, []).append(payload)
+        pending.clear()
+
+        for component, payloads in discovered.items():
             config_entries_key = f"{component}.mqtt"
             async with hass.data[DATA_CONFIG_ENTRY_LOCK]:
                 if config_entries_key not in hass.data[CONFIG_ENTRY_IS_SETUP]:
@@ -157,9 +234,10 @@ async def async_start(
                     hass.data[CONFIG_ENTRY_IS_SETUP].add(config_entries_key)
 
             async_dispatcher_send(
-                hass, MQTT_DISCOVERY_NEW.format(component, "mqtt"), payload
+                hass, MQTT_DISCOVERY_NEW.format(component, "mqtt"), payloads
             )
 
+    hass.data.setdefault(ALREADY_DISCOVERED, {})
     hass.data[DATA_CONFIG_ENTRY_LOCK] = asyncio.Lock()
     hass.data[CONFIG_ENTRY_IS_SETUP] = set()
 
@@ -0,0 +1,93 @@
+"""Index MQTT topic filters for fast message routing."""
+from typing import Dict, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class _Node(Generic[T]):
+    """Level of a topic filter."""
+
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, "_Node[T]"] = {}
+        self.values: List[T] = []
+
+
+class TopicTrie(Generic[T]):
+    """Prefix tree of topic filters supporting the + and # wildcards.
+
+    Matching a topic visits at most one exact and one wildcard branch per
+    topic level, so routing a message costs O(topic depth + matches)
+    instead of testing every subscribed filter.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root: _Node[T] = _Node()
+
+    def add(self, topic_filter: str, value: T) -> None:
+        """Associate a value with a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _Node()
+            node = child
+        node.values.append(value)
+
+    def remove(self, topic_filter: str, value: T) -> None:
+        """Remove a value from a topic filter and prune empty levels."""
+        path = []
+        node = self._root
+        for level in topic_filter.split("/"):
+            path.append((node, level))
+            node = node.children[level]
+
+        node.values.remove(value)
+
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.values or child.children:
+                break
+            del parent.children[level]
+
+    def match(self, topic: str) -> List[T]:
+        """Return the values of all filters matching a topic."""
+        levels = topic.split("/")
+        # Wildcards at the first level don't match topics starting with $
+        wildcards = not topic.startswith("$")
+        matches: List[T] = []
+        self._match(self._root, levels, 0, wildcards, matches)
+        return matches
+
+    def _match(
+        self,
+        node: _Node[T],
+        levels: List[str],
+        index: int,
+        wildcards: bool,
+        matches: List[T],
+    ) -> None:
+        """Collect matching values below a node."""
+        children = node.children
+
+        if wildcards or index > 0:
+            # A trailing # also matches the parent level
+            multi = children.get("#")
+            if multi is not None:
+                matches.extend(multi.values)
+
+        if index == len(levels):
+            matches.extend(node.values)
+            return
+
+        child = children.get(levels[index])
+        if child is not None:
+            self._match(child, levels, index + 1, wildcards, matches)
+
+        if wildcards or index > 0:
+            single = children.get("+")
+            if single is not None:
+                self._match(single, levels, index + 1, wildcards, matches)
@@ -1,9 +1,13 @@
 """Support for Prometheus metrics export."""
+from itertools import chain
 import logging
 import string
+from urllib.parse import parse_qs
 
 from aiohttp import web
 import prometheus_client
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
 import voluptuous as vol
 
 from homeassistant import core as hacore
@@ -14,6 +18,7 @@ from homeassistant.const import (
     ATTR_TEMPERATURE,
     ATTR_UNIT_OF_MEASUREMENT,
     CONTENT_TYPE_TEXT_PLAIN,
+    EVENT_HOMEASSISTANT_STOP,
     EVENT_STATE_CHANGED,
     STATE_ON,
     TEMP_CELSIUS,
@@ -67,8 +72,6 @@ CONFIG_SCHEMA = vol.Schema(
 
 def setup(hass, config):
     """Activate Prometheus component."""
-    hass.http.register_view(PrometheusView(prometheus_client))
-
     conf = config[DOMAIN]
     entity_filter = conf[CONF_FILTER]
     namespace = conf.get(CONF_PROM_NAMESPACE)
@@ -91,12 +94,79 @@ def setup(hass, config):
         default_metric,
     )
 
+    hass.http.register_view(PrometheusView(prometheus_client, metrics))
     hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+
+    service_collector = ServiceCallCollector(hass, metrics.metrics_prefix)
+    prometheus_client.REGISTRY.register(service_collector)
+
+    def unregister_service_collector(event):
+        """Stop exporting service call statistics."""
+        prometheus_client.REGISTRY.unregister(service_collector)
+
+    hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, unregister_service_collector)
     return True
 
 
+def _histogram_buckets(histogram):
+    """Return the buckets of a latency histogram in Prometheus format."""
+    return [
+        [floatToGoString(bound), count]
+        for bound, count in histogram.cumulative_buckets()
+    ]
+
+
+class ServiceCallCollector:
+    """Collect the service registry call statistics on each scrape."""
+
+    def __init__(self, hass, metrics_prefix):
+        """Initialize the service call collector."""
+        self.hass = hass
+        self.metrics_prefix = metrics_prefix
+
+    def collect(self):
+        """Yield the service call metric families."""
+        labels = ["domain", "service"]
+        duration = HistogramMetricFamily(
+            f"{self.metrics_prefix}service_call_duration_seconds",
+            "Time spent executing service calls",
+            labels=labels,
+        )
+        parallel_wait = HistogramMetricFamily(
+            f"{self.metrics_prefix}service_call_parallel_wait_seconds",
+            "Time service calls waited for parallel updates of entities",
+            labels=labels,
+        )
+        errors = CounterMetricFamily(
+            f"{self.metrics_prefix}service_call_errors",
+            "The number of service calls that raised an error",
+            labels=labels,
+        )
+
+        for (domain, service), stats in self.hass.services.async_call_stats().items():
+            duration.add_metric(
+                [domain, service],
+                _histogram_buckets(stats.duration),
+                stats.duration.total,
+            )
+            parallel_wait.add_metric(
+                [domain, service],
+                _histogram_buckets(stats.parallel_wait),
+                stats.parallel_wait.total,
+            )
+            errors.add_metric([domain, service], stats.errors)
+
+        yield duration
+        yield parallel_wait
+        yield errors
+
+
 class PrometheusMetrics:
-    """Model all of the metrics which should be exposed to Prometheus."""
+    """Model all of the metrics which should be exposed to Prometheus.
+
+    The metrics of entities are kept out of the default registry. The text of
+    each metric family is cached and only rendered again after it changed.
+    """
 
     def __init__(
         self,
@@ -127,8 +197,12 @@ class PrometheusMetrics:
         else:
             self.metrics_prefix = ""
         self._metrics = {}
+        self._rendered = {}
+        self._sample_names = {}
+        self._changed = set()
         self._climate_units = climate_units
 
+    @hacore.callback
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
         state = event.data.get("new_state")
@@ -156,15 +230,43 @@ class PrometheusMetrics:
         if labels is None:
             labels = ["entity", "friendly_name", "domain"]
 
+        self._changed.add(metric)
         try:
             return self._metrics[metric]
         except KeyError:
             full_metric_name = self._sanitize_metric_name(
                 f"{self.metrics_prefix}{metric}"
             )
-            self._metrics[metric] = factory(full_metric_name, documentation, labels)
+            self._metrics[metric] = factory(
+                full_metric_name, documentation, labels, registry=None
+            )
             return self._metrics[metric]
 
+    @hacore.callback
+    def render(self, names=None):
+        """Return the exposition text of all metrics or those in names.
+
+        Like the restricted registry of the client, a metric is included if
+        the name of its family or one of its samples is in names.
+        """
+        for metric in self._changed:
+            metric_obj = self._metrics[metric]
+            self._rendered[metric] = self.prometheus_cli.generate_latest(metric_obj)
+            self._sample_names[metric] = {
+                name
+                for family in metric_obj.collect()
+                for name in chain(
+                    [family.name], (sample.name for sample in family.samples)
+                )
+            }
+        self._changed.clear()
+
+        return b"".join(
+            text
+            for metric, text in sorted(self._rendered.items())
+            if names is None or not names.isdisjoint(self._sample_names[metric])
+        )
+
     @staticmethod
     def _sanitize_metric_name(metric: str) -> str:
         return "".join(
@@ -387,15 +489,28 @@ class PrometheusView(HomeAssistantView):
     url = API_ENDPOINT
     name = "api:prometheus"
 
-    def __init__(self, prometheus_cli):
+    def __init__(self, prometheus_cli, metrics):
         """Initialize Prometheus view."""
         self.prometheus_cli = prometheus_cli
+        self.metrics = metrics
 
     async def get(self, request):
-        """Handle request for Prometheus metrics."""
+        """Handle request for Prometheus metrics.
+
+        The name[] query parameter restricts the response to metric families
+        with these names, like the exporters of the Prometheus client.
+        """
         _LOGGER.debug("Received Prometheus metrics request")
 
-        return web.Response(
-            body=self.prometheus_cli.generate_latest(),
+        names = set(parse_qs(request.query_string).get("name[]", [])) or None
+        registry = self.prometheus_cli.REGISTRY
+        if names is not None:
+            registry = registry.restricted_registry(names)
+
+        response = web.Response(
+            body=self.prometheus_cli.generate_latest(registry)
+            + self.metrics.render(names),
             content_type=CONTENT_TYPE_TEXT_PLAIN,
         )
+        response.enable_compression()
+        return response
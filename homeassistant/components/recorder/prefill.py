@@ -0,0 +1,294 @@
+"""Load the recent states of many entities with few queries."""
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, or_, select, union_all
+
+from homeassistant.core import State, callback
+from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.loader import bind_hass
+
+from . import run_information_from_instance, run_information_with_session
+from .models import States
+from .util import execute, session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PREFILL = "recorder_prefill"
+
+# Requests made within this many seconds are loaded together
+BATCH_DELAY = 0.1
+# Entities limited to a number of states per query
+MAX_ENTITIES_PER_QUERY = 100
+
+
+class _Request(NamedTuple):
+    """Request for the recent states of an entity."""
+
+    entity_id: str
+    start_time: Optional[datetime]
+    number_of_states: Optional[int]
+    state_changes_only: bool
+    include_start_state: bool
+    future: asyncio.Future
+
+
+@bind_hass
+async def async_get_recent_states(
+    hass: HomeAssistantType,
+    entity_id: str,
+    start_time: Optional[datetime] = None,
+    number_of_states: Optional[int] = None,
+    state_changes_only: bool = False,
+    include_start_state: bool = False,
+) -> List[State]:
+    """Return the recorded states of an entity in chronological order.
+
+    The states since start_time are returned, limited to the last
+    number_of_states. With include_start_state, the state at start_time is
+    returned first, like the history does.
+
+    Requests of all entities made at about the same time, like those of
+    sensors that set up at startup, are loaded from the database together.
+    The returned states are shared and must not be changed.
+    """
+    prefill = hass.data.get(DATA_PREFILL)
+    if prefill is None:
+        prefill = hass.data[DATA_PREFILL] = HistoryPrefill(hass)
+
+    future = hass.loop.create_future()
+    prefill.async_add_request(
+        _Request(
+            entity_id.lower(),
+            start_time,
+            number_of_states,
+            state_changes_only,
+            include_start_state,
+            future,
+        )
+    )
+    return await future
+
+
+class HistoryPrefill:
+    """Batch requests for recent states into one query per kind of window."""
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the prefill."""
+        self.hass = hass
+        self._requests: List[_Request] = []
+
+    @callback
+    def async_add_request(self, request: _Request) -> None:
+        """Queue a request, loading the batch shortly after the first."""
+        if not self._requests:
+            self.hass.loop.call_later(BATCH_DELAY, self._async_load)
+        self._requests.append(request)
+
+    @callback
+    def _async_load(self) -> None:
+        """Load the states of the queued requests."""
+        requests, self._requests = self._requests, []
+        self.hass.async_create_task(self._async_load_requests(requests))
+
+    async def _async_load_requests(self, requests: List[_Request]) -> None:
+        """Load the states of requests and hand them out."""
+        _LOGGER.debug("Loading recent states for %d requests", len(requests))
+        try:
+            results = await self.hass.async_add_executor_job(
+                _load_requests, self.hass, requests
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(err)
+            return
+
+        for request, states in zip(requests, results):
+            if not request.future.done():
+                request.future.set_result(states)
+
+
+def _load_requests(
+    hass: HomeAssistantType, requests: List[_Request]
+) -> List[List[State]]:
+    """Load the states of requests from the database."""
+    with session_scope(hass=hass) as session:
+        # Rows by state changes only and entity id
+        rows: Dict[Tuple[bool, str], Dict[int, States]] = defaultdict(dict)
+
+        for state_changes_only in (False, True):
+            kind = [
+                request
+                for request in requests
+                if request.state_changes_only == state_changes_only
+            ]
+            if not kind:
+                continue
+
+            query = session.query(States)
+            if state_changes_only:
+                query = query.filter(States.last_changed == States.last_updated)
+
+            for row in _query_windows(query, kind):
+                rows[state_changes_only, row.entity_id][row.state_id] = row
+
+        start_states = _query_start_states(
+            hass,
+            session,
+            [request for request in requests if request.include_start_state],
+        )
+
+        native: Dict[Tuple[bool, str], List[State]] = {}
+        for key, entity_rows in rows.items():
+            native[key] = [
+                state
+                for state in (
+                    row.to_native()
+                    for row in sorted(
+                        entity_rows.values(),
+                        key=lambda row: (row.last_updated, row.state_id),
+                    )
+                )
+                if state is not None
+            ]
+
+    results = []
+    for request in requests:
+        states = native.get((request.state_changes_only, request.entity_id), [])
+        if request.start_time is not None:
+            states = [
+                state for state in states if state.last_updated >= request.start_time
+            ]
+        if request.number_of_states is not None:
+            states = states[-request.number_of_states :]
+        start_state = start_states.get((request.entity_id, request.start_time))
+        if start_state is not None:
+            states = [start_state] + states
+        results.append(states)
+    return results
+
+
+def _query_windows(query, requests: List[_Request]) -> List[States]:
+    """Query the rows of the windows of requests.
+
+    Windows since a start time are loaded with a single query. Windows
+    limited to a number of states are loaded with a query per chunk of
+    entities, so the limit is applied by the database.
+    """
+    since: Dict[datetime, set] = defaultdict(set)
+    last: Dict[Tuple[str, Optional[datetime]], int] = {}
+
+    for request in requests:
+        if request.number_of_states is not None:
+            key = (request.entity_id, request.start_time)
+            last[key] = max(last.get(key, 0), request.number_of_states)
+        elif request.start_time is not None:
+            since[request.start_time].add(request.entity_id)
+
+    rows = []
+    if since:
+        rows.extend(
+            execute(
+                query.filter(
+                    or_(
+                        *(
+                            and_(
+                                States.entity_id.in_(entity_ids),
+                                States.last_updated >= start_time,
+                            )
+                            for start_time, entity_ids in since.items()
+                        )
+                    )
+                ),
+                to_native=False,
+            )
+        )
+
+    limits = [
+        (entity_id, start_time, number_of_states)
+        for (entity_id, start_time), number_of_states in last.items()
+    ]
+    for index in range(0, len(limits), MAX_ENTITIES_PER_QUERY):
+        rows.extend(
+            execute(
+                query.filter(
+                    States.state_id.in_(
+                        _union_of_last(
+                            query, limits[index : index + MAX_ENTITIES_PER_QUERY]
+                        )
+                    )
+                ),
+                to_native=False,
+            )
+        )
+
+    return rows
+
+
+def _union_of_last(query, limits: List[Tuple[str, Optional[datetime], int]]):
+    """Return a select of the ids of the last rows of entities.
+
+    Each limit is an entity id, the start time of its window, if any, and
+    the number of rows.
+    """
+    selects = []
+    for entity_id, start_time, number_of_states in limits:
+        entity_query = query.filter(States.entity_id == entity_id)
+        if start_time is not None:
+            entity_query = entity_query.filter(States.last_updated >= start_time)
+        selects.append(
+            select(
+                [
+                    entity_query.order_by(States.last_updated.desc())
+                    .limit(number_of_states)
+                    .with_entities(States.state_id)
+                    .subquery()
+                ]
+            )
+        )
+    return union_all(*selects)
+
+
+def _query_start_states(
+    hass: HomeAssistantType, session, requests: List[_Request]
+) -> Dict[Tuple[str, datetime], State]:
+    """Query the states of entities at the start time of requests.
+
+    Only states of the recorder run of the start time are used.
+    """
+    entity_ids_by_start: Dict[datetime, set] = defaultdict(set)
+    for request in requests:
+        if request.start_time is not None:
+            entity_ids_by_start[request.start_time].add(request.entity_id)
+
+    start_states = {}
+    for start_time, entity_ids in entity_ids_by_start.items():
+        run = run_information_from_instance(
+            hass, start_time
+        ) or run_information_with_session(session, start_time)
+        if run is None:
+            continue
+
+        query = session.query(States).filter(
+            States.last_updated >= run.start, States.last_updated < start_time
+        )
+        limits = [(entity_id, None, 1) for entity_id in sorted(entity_ids)]
+        for index in range(0, len(limits), MAX_ENTITIES_PER_QUERY):
+            for state in execute(
+                query.filter(
+                    States.state_id.in_(
+                        _union_of_last(
+                            query, limits[index : index + MAX_ENTITIES_PER_QUERY]
+                        )
+                    )
+                )
+            ):
+                state.last_changed = start_time
+                state.last_updated = start_time
+                start_states[state.entity_id, start_time] = state
+
+    return start_states
@@ -1,10 +1,14 @@
 """Provide functionality to stream video source."""
+import asyncio
 import logging
 import secrets
 import threading
+from time import monotonic
 
 import voluptuous as vol
+from yarl import URL
 
+from homeassistant.components import websocket_api
 from homeassistant.const import CONF_FILENAME, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
@@ -18,10 +22,12 @@ from .const import (
     CONF_LOOKBACK,
     CONF_STREAM_SOURCE,
     DOMAIN,
+    MIN_KEYFRAME_IMAGE_INTERVAL,
     SERVICE_RECORD,
 )
-from .core import PROVIDERS
+from .core import PROVIDERS, StreamMetrics
 from .hls import async_setup_hls
+from .ll_hls import async_setup_ll_hls
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -78,6 +84,22 @@ def request_stream(hass, stream_source, *, fmt="hls", keepalive=False, options=N
         raise HomeAssistantError("Unable to get stream")
 
 
+@bind_hass
+async def async_get_keyframe_image(hass, stream_source):
+    """Return a JPEG of the latest keyframe of a running stream.
+
+    Returns None when no worker is running for the stream source.
+    """
+    if DOMAIN not in hass.config.components:
+        return None
+
+    stream = hass.data[DOMAIN][ATTR_STREAMS].get(stream_source)
+    if stream is None or not stream.is_running:
+        return None
+
+    return await stream.async_get_image()
+
+
 async def async_setup(hass, config):
     """Set up stream."""
     # Keep import here so that we can import stream integration without installing reqs
@@ -91,6 +113,7 @@ async def async_setup(hass, config):
     # Setup HLS
     hls_endpoint = async_setup_hls(hass)
     hass.data[DOMAIN][ATTR_ENDPOINTS]["hls"] = hls_endpoint
+    hass.data[DOMAIN][ATTR_ENDPOINTS]["ll_hls"] = async_setup_ll_hls(hass)
 
     # Setup Recorder
     async_setup_recorder(hass)
@@ -113,9 +136,37 @@ async def async_setup(hass, config):
         DOMAIN, SERVICE_RECORD, async_record, schema=SERVICE_RECORD_SCHEMA
     )
 
+    hass.components.websocket_api.async_register_command(websocket_metrics)
+
     return True
 
 
+def _redact_source(source):
+    """Return a stream source without credentials."""
+    if not isinstance(source, str):
+        return str(source)
+    url = URL(source)
+    if not url.is_absolute():
+        return source
+    return str(url.with_user(None))
+
+
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "stream/metrics"})
+def websocket_metrics(hass, connection, msg):
+    """Handle request for the throughput metrics of the streams."""
+    connection.send_message(
+        websocket_api.result_message(
+            msg["id"],
+            [
+                {"source": _redact_source(source), **stream.metrics.as_dict()}
+                for source, stream in hass.data[DOMAIN][ATTR_STREAMS].items()
+            ],
+        )
+    )
+
+
 class Stream:
     """Represents a single stream."""
 
@@ -129,6 +180,11 @@ class Stream:
         self._thread = None
         self._thread_quit = None
         self._outputs = {}
+        self.metrics = StreamMetrics()
+        # Set when the worker should decode the next keyframe
+        self.image_requested = threading.Event()
+        self._image = None
+        self._image_future = None
 
         if self.options is None:
             self.options = {}
@@ -138,6 +194,40 @@ class Stream:
         """Return stream outputs."""
         return self._outputs
 
+    @property
+    def is_running(self):
+        """Return True if the worker thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    async def async_get_image(self):
+        """Return a JPEG of the latest keyframe decoded by the worker.
+
+        Keyframes are decoded at most once per MIN_KEYFRAME_IMAGE_INTERVAL,
+        requests in between are served the last image.
+        """
+        if (
+            self._image is not None
+            and monotonic() - self._image[0] < MIN_KEYFRAME_IMAGE_INTERVAL
+        ):
+            return self._image[1]
+
+        if self._image_future is None:
+            self._image_future = self.hass.loop.create_future()
+            self.image_requested.set()
+
+        # A request timing out must not cancel the image of other requests
+        return await asyncio.shield(self._image_future)
+
+    @callback
+    def async_set_image(self, image):
+        """Pass a keyframe image from the worker to the waiting requests."""
+        if image:
+            self._image = (monotonic(), image)
+
+        future, self._image_future = self._image_future, None
+        if future is not None and not future.done():
+            future.set_result(image)
+
     def add_provider(self, fmt):
         """Add provider output stream."""
         if not self._outputs.get(fmt):
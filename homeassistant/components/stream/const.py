@@ -11,8 +11,17 @@ ATTR_KEEPALIVE = "keepalive"
 
 SERVICE_RECORD = "record"
 
-OUTPUT_FORMATS = ["hls"]
+OUTPUT_FORMATS = ["hls", "ll_hls"]
 
-FORMAT_CONTENT_TYPE = {"hls": "application/vnd.apple.mpegurl"}
+FORMAT_CONTENT_TYPE = {
+    "hls": "application/vnd.apple.mpegurl",
+    "ll_hls": "application/vnd.apple.mpegurl",
+}
+
+# Maximum duration of a partial segment of low-latency HLS
+PART_TARGET_DURATION = 1.0  # seconds
 
 AUDIO_SAMPLE_RATE = 44100
+
+# Keyframe images decoded less than this ago are served again
+MIN_KEYFRAME_IMAGE_INTERVAL = 5  # seconds
@@ -2,7 +2,8 @@
 import asyncio
 from collections import deque
 import io
-from typing import Any, List
+from time import monotonic
+from typing import Any, Dict, List, Optional
 
 from aiohttp import web
 import attr
@@ -11,6 +12,7 @@ from homeassistant.components.http import HomeAssistantView
 from homeassistant.core import callback
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util.decorator import Registry
+from homeassistant.util.latency import LatencyHistogram
 
 from .const import ATTR_STREAMS, DOMAIN
 
@@ -25,6 +27,23 @@ class StreamBuffer:
     output = attr.ib()  # type=av.OutputContainer
     vstream = attr.ib()  # type=av.VideoStream
     astream = attr.ib(default=None)  # type=av.AudioStream
+    # Partial segments, only kept for outputs that serve them
+    parts = attr.ib(default=None)  # type=List[Part]
+    # Offset in the segment where the next part starts
+    part_offset = attr.ib(type=int, default=0)
+    # Presentation time in seconds where the next part starts
+    part_time = attr.ib(default=None)  # type=Fraction
+    # Size of the initialization section at the start of the segment
+    init_size = attr.ib(type=int, default=0)
+
+
+@attr.s
+class Part:
+    """Represent a partial segment."""
+
+    duration = attr.ib(type=float)
+    independent = attr.ib(type=bool)
+    data = attr.ib(type=bytes)
 
 
 @attr.s
@@ -32,8 +51,43 @@ class Segment:
     """Represent a segment."""
 
     sequence = attr.ib(type=int)
-    segment = attr.ib(type=io.BytesIO)
+    segment = attr.ib(type=bytes)
     duration = attr.ib(type=float)
+    parts = attr.ib(factory=list)  # type=List[Part]
+
+
+class StreamMetrics:
+    """Throughput statistics of a stream worker.
+
+    Counters are only updated by the worker thread, except for the bytes
+    served which are updated in the event loop.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.packets = 0
+        self.segments = 0
+        self.bytes_served = 0
+        self.segment_build_time = LatencyHistogram()
+        self.started: Optional[float] = None
+
+    @property
+    def packets_per_second(self) -> Optional[float]:
+        """Return the average number of packets demuxed per second."""
+        if self.started is None:
+            return None
+        elapsed = monotonic() - self.started
+        return round(self.packets / elapsed, 1) if elapsed else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the metrics."""
+        return {
+            "packets": self.packets,
+            "packets_per_second": self.packets_per_second,
+            "segments": self.segments,
+            "segment_build_time": self.segment_build_time.as_dict(),
+            "bytes_served": self.bytes_served,
+        }
 
 
 class StreamOutput:
@@ -71,6 +125,16 @@ class StreamOutput:
         """Return desired video codec."""
         return None
 
+    @property
+    def container_options(self) -> Optional[Dict[str, str]]:
+        """Return options for the output container."""
+        return None
+
+    @property
+    def part_target_duration(self) -> Optional[float]:
+        """Return maximum duration of partial segments, None if not served."""
+        return None
+
     @property
     def segments(self) -> List[int]:
         """Return current sequence from segments."""
@@ -151,6 +215,24 @@ class StreamOutput:
         self._stream.remove_provider(self)
 
 
+def find_mp4_box(data: bytes, box_type: bytes) -> Optional[int]:
+    """Return the offset of the first top level MP4 box of a type."""
+    offset = 0
+    while offset + 8 <= len(data):
+        if data[offset + 4 : offset + 8] == box_type:
+            return offset
+
+        size = int.from_bytes(data[offset : offset + 4], "big")
+        if size == 1:
+            size = int.from_bytes(data[offset + 8 : offset + 16], "big")
+        if size < 8:
+            # Box extends to the end of the data or is invalid
+            return None
+        offset += size
+
+    return None
+
+
 class StreamView(HomeAssistantView):
     """
     Base StreamView.
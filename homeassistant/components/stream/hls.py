@@ -51,7 +51,9 @@ class HlsSegmentView(StreamView):
         if not segment:
             return web.HTTPNotFound()
         headers = {"Content-Type": "video/mp2t"}
-        return web.Response(body=segment.segment.getvalue(), headers=headers)
+        stream.metrics.bytes_served += len(segment.segment)
+        # Segments are immutable bytes, every client is served the same object
+        return web.Response(body=segment.segment, headers=headers)
 
 
 class M3U8Renderer:
@@ -0,0 +1,344 @@
+"""Provide functionality to stream low-latency HLS."""
+import asyncio
+import math
+
+from aiohttp import web
+import async_timeout
+
+from homeassistant.core import callback
+
+from .const import FORMAT_CONTENT_TYPE, PART_TARGET_DURATION
+from .core import PROVIDERS, StreamOutput, StreamView
+
+# Blocking requests are answered after at most this many target durations
+BLOCKING_REQUEST_TARGET_DURATIONS = 3
+
+
+@callback
+def async_setup_ll_hls(hass):
+    """Set up api endpoints."""
+    hass.http.register_view(LlHlsPlaylistView())
+    hass.http.register_view(LlHlsInitView())
+    hass.http.register_view(LlHlsSegmentView())
+    hass.http.register_view(LlHlsPartView())
+    return "/api/hls/{}/ll/playlist.m3u8"
+
+
+def _get_query_int(request, key):
+    """Return a non-negative integer from the query of a request."""
+    value = request.query.get(key)
+    if value is None:
+        return None
+
+    value = int(value)
+    if value < 0:
+        raise ValueError(f"{key} must not be negative")
+    return value
+
+
+async def _async_wait_for(track, msn=None, part=None):
+    """Wait until a track has media, raise 503 if it doesn't arrive in time."""
+    timeout = BLOCKING_REQUEST_TARGET_DURATIONS * (
+        track.target_duration or track.part_target_duration
+    )
+    try:
+        async with async_timeout.timeout(timeout):
+            available = await track.async_wait_for(msn, part)
+    except asyncio.TimeoutError:
+        available = False
+
+    if not available:
+        raise web.HTTPServiceUnavailable()
+
+
+class LlHlsPlaylistView(StreamView):
+    """Stream view to serve a low-latency M3U8 stream."""
+
+    url = r"/api/hls/{token:[a-f0-9]+}/ll/playlist.m3u8"
+    name = "api:stream:ll_hls:playlist"
+    cors_allowed = True
+
+    async def handle(self, request, stream, sequence):
+        """Return m3u8 playlist, blocking until it holds the requested part."""
+        try:
+            msn = _get_query_int(request, "_HLS_msn")
+            part = _get_query_int(request, "_HLS_part")
+        except ValueError:
+            raise web.HTTPBadRequest()
+
+        if part is not None and msn is None:
+            raise web.HTTPBadRequest()
+
+        track = stream.add_provider("ll_hls")
+        stream.start()
+        track.get_segment()
+
+        if msn is None:
+            # Wait for a part to be ready
+            if not await track.async_wait_for():
+                return web.HTTPNotFound()
+        elif msn > track.sequence + 2:
+            raise web.HTTPBadRequest()
+        else:
+            await _async_wait_for(track, msn, part)
+
+        headers = {"Content-Type": FORMAT_CONTENT_TYPE["ll_hls"]}
+        return web.Response(
+            body=LlM3U8Renderer.render(track).encode("utf-8"), headers=headers
+        )
+
+
+class LlHlsInitView(StreamView):
+    """Stream view to serve the initialization section of the segments."""
+
+    url = r"/api/hls/{token:[a-f0-9]+}/ll/init.mp4"
+    name = "api:stream:ll_hls:init"
+    cors_allowed = True
+
+    async def handle(self, request, stream, sequence):
+        """Return initialization section."""
+        track = stream.add_provider("ll_hls")
+        if not track.init:
+            return web.HTTPNotFound()
+        return web.Response(body=track.init, headers={"Content-Type": "video/mp4"})
+
+
+class LlHlsSegmentView(StreamView):
+    """Stream view to serve a fragmented MP4 segment."""
+
+    url = r"/api/hls/{token:[a-f0-9]+}/ll/segment/{sequence:\d+}.m4s"
+    name = "api:stream:ll_hls:segment"
+    cors_allowed = True
+
+    async def handle(self, request, stream, sequence):
+        """Return fragmented MP4 segment."""
+        track = stream.add_provider("ll_hls")
+        segment = track.get_segment(int(sequence))
+        if not segment:
+            return web.HTTPNotFound()
+        stream.metrics.bytes_served += len(segment.segment)
+        return web.Response(
+            body=segment.segment, headers={"Content-Type": "video/iso.segment"}
+        )
+
+
+class LlHlsPartView(StreamView):
+    """Stream view to serve a partial segment."""
+
+    url = r"/api/hls/{token:[a-f0-9]+}/ll/segment/{sequence:\d+\.\d+}.m4s"
+    name = "api:stream:ll_hls:part"
+    cors_allowed = True
+
+    async def handle(self, request, stream, sequence):
+        """Return partial segment, blocking on the hinted next part."""
+        track = stream.add_provider("ll_hls")
+        msn, index = (int(value) for value in sequence.split("."))
+
+        if msn == track.sequence and index == len(track.parts):
+            await _async_wait_for(track, msn, index)
+
+        part = track.get_part(msn, index)
+        if not part:
+            return web.HTTPNotFound()
+        stream.metrics.bytes_served += len(part.data)
+        return web.Response(body=part.data, headers={"Content-Type": "video/mp4"})
+
+
+class LlM3U8Renderer:
+    """Low-latency M3U8 Render Helper."""
+
+    @staticmethod
+    def render_preamble(track):
+        """Render preamble."""
+        part_target = track.part_target_duration
+        return [
+            "#EXT-X-VERSION:6",
+            f"#EXT-X-TARGETDURATION:{track.target_duration}",
+            "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,"
+            f"PART-HOLD-BACK={3 * part_target:.3f}",
+            f"#EXT-X-PART-INF:PART-TARGET={part_target:.3f}",
+            '#EXT-X-MAP:URI="./init.mp4"',
+        ]
+
+    @staticmethod
+    def render_parts(sequence, parts):
+        """Render the partial segments of a segment."""
+        return [
+            '#EXT-X-PART:DURATION={:.3f},URI="./segment/{}.{}.m4s"{}'.format(
+                part.duration,
+                sequence,
+                index,
+                ",INDEPENDENT=YES" if part.independent else "",
+            )
+            for index, part in enumerate(parts)
+        ]
+
+    @classmethod
+    def render_playlist(cls, track):
+        """Render playlist."""
+        segments = track.get_segment()
+        playlist = [f"#EXT-X-MEDIA-SEQUENCE:{track.first_sequence}"]
+
+        for segment in segments:
+            playlist.extend(cls.render_parts(segment.sequence, segment.parts))
+            playlist.extend(
+                [
+                    "#EXTINF:{:.04f},".format(float(segment.duration)),
+                    f"./segment/{segment.sequence}.m4s",
+                ]
+            )
+
+        playlist.extend(cls.render_parts(track.sequence, track.parts))
+        playlist.append(
+            "#EXT-X-PRELOAD-HINT:TYPE=PART,"
+            f'URI="./segment/{track.sequence}.{len(track.parts)}.m4s"'
+        )
+
+        return playlist
+
+    @classmethod
+    def render(cls, track):
+        """Render M3U8 file."""
+        lines = ["#EXTM3U"] + cls.render_preamble(track) + cls.render_playlist(track)
+        return "\n".join(lines) + "\n"
+
+
+@PROVIDERS.register("ll_hls")
+class LlHlsStreamOutput(StreamOutput):
+    """Represents low-latency HLS Output formats.
+
+    Besides the last complete segments only the parts of the segment in
+    progress are kept, so memory use is bounded per stream.
+    """
+
+    def __init__(self, stream, timeout: int = 300) -> None:
+        """Initialize low-latency HLS output."""
+        super().__init__(stream, timeout)
+        self.init = None
+        self._sequence = None
+        self._parts = []
+        self._closed = False
+
+    @property
+    def name(self) -> str:
+        """Return provider name."""
+        return "ll_hls"
+
+    @property
+    def format(self) -> str:
+        """Return container format."""
+        return "mp4"
+
+    @property
+    def audio_codec(self) -> str:
+        """Return desired audio codec."""
+        return "aac"
+
+    @property
+    def video_codec(self) -> str:
+        """Return desired video codec."""
+        return "h264"
+
+    @property
+    def container_options(self):
+        """Write a fragment per part, starting with an empty moov box."""
+        return {
+            "movflags": "empty_moov+default_base_moof+skip_trailer",
+            "frag_duration": str(int(self.part_target_duration * 1000000)),
+            "flush_packets": "1",
+        }
+
+    @property
+    def part_target_duration(self) -> float:
+        """Return maximum duration of partial segments."""
+        return PART_TARGET_DURATION
+
+    @property
+    def target_duration(self) -> int:
+        """Return the longest duration of the segments in whole seconds."""
+        if not self._segments:
+            return 0
+        return math.ceil(max(s.duration for s in self._segments)) or 1
+
+    @property
+    def sequence(self) -> int:
+        """Return sequence of the segment in progress."""
+        if self._sequence is not None:
+            return self._sequence
+        if self._segments:
+            return self._segments[-1].sequence + 1
+        return 1
+
+    @property
+    def first_sequence(self) -> int:
+        """Return sequence of the first segment in the playlist."""
+        if self._segments:
+            return self._segments[0].sequence
+        return self.sequence
+
+    @property
+    def parts(self):
+        """Return parts of the segment in progress."""
+        return self._parts
+
+    def get_part(self, sequence: int, index: int):
+        """Retrieve a part of a segment."""
+        if sequence == self._sequence:
+            parts = self._parts
+        else:
+            segment = self.get_segment(sequence)
+            if not segment:
+                return None
+            parts = segment.parts
+
+        return parts[index] if index < len(parts) else None
+
+    def has_media(self, msn: int = None, part: int = None) -> bool:
+        """Return True if the playlist holds a segment or part."""
+        if msn is None:
+            return bool(self._segments or self._parts)
+
+        if self._segments and msn <= self._segments[-1].sequence:
+            return True
+
+        return msn == self._sequence and part is not None and part < len(self._parts)
+
+    async def async_wait_for(self, msn: int = None, part: int = None) -> bool:
+        """Wait until the playlist holds a segment or part."""
+        while not self.has_media(msn, part):
+            if self._closed:
+                return False
+            await self._event.wait()
+        return True
+
+    @callback
+    def set_init(self, init: bytes) -> None:
+        """Store initialization section."""
+        if init:
+            self.init = init
+
+    @callback
+    def put_part(self, sequence: int, part) -> None:
+        """Store part of the segment in progress."""
+        if sequence != self._sequence:
+            self._sequence = sequence
+            self._parts = []
+
+        self._parts.append(part)
+        self._event.set()
+        self._event.clear()
+
+    @callback
+    def put(self, segment) -> None:
+        """Store output, replacing the parts of the segment in progress."""
+        if segment is not None and segment.sequence == self._sequence:
+            self._sequence = None
+            self._parts = []
+        super().put(segment)
+
+    def cleanup(self):
+        """Handle cleanup."""
+        self._closed = True
+        self._sequence = None
+        self._parts = []
+        super().cleanup()
@@ -1,5 +1,6 @@
 """Provide functionality to record stream."""
 
+import io
 import threading
 from typing import List
 
@@ -22,9 +23,8 @@ def recorder_save_worker(file_out: str, segments: List[Segment]):
     output_v = None
 
     for segment in segments:
-        # Seek to beginning and open segment
-        segment.segment.seek(0)
-        source = av.open(segment.segment, "r", format="mpegts")
+        # Open segment, BytesIO shares the buffer of the bytes until written
+        source = av.open(io.BytesIO(segment.segment), "r", format="mpegts")
         source_v = source.streams.video[0]
 
         # Add output streams
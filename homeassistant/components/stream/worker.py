@@ -2,11 +2,12 @@
 from fractions import Fraction
 import io
 import logging
+from time import monotonic
 
 import av
 
 from .const import AUDIO_SAMPLE_RATE
-from .core import Segment, StreamBuffer
+from .core import Part, Segment, StreamBuffer, find_mp4_box
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,12 +25,42 @@ def generate_audio_frame():
     return audio_frame
 
 
+def decode_keyframe_image(codec_context, packet):
+    """Decode a keyframe packet into a JPEG image."""
+    try:
+        # A separate decoder leaves the state of the demuxed stream untouched
+        decoder = av.CodecContext.create(codec_context.name, "r")
+        decoder.extradata = codec_context.extradata
+        frames = decoder.decode(packet) + decoder.decode(None)
+        if not frames:
+            return None
+
+        frame = frames[0].reformat(format="yuvj420p")
+        encoder = av.CodecContext.create("mjpeg", "w")
+        encoder.width = frame.width
+        encoder.height = frame.height
+        encoder.pix_fmt = "yuvj420p"
+        encoder.time_base = Fraction(1, 1)
+        frame.pts = 0
+        packets = encoder.encode(frame) + encoder.encode(None)
+    except av.AVError as err:
+        _LOGGER.debug("Unable to decode keyframe image: %s", err)
+        return None
+
+    return b"".join(bytes(image_packet) for image_packet in packets)
+
+
 def create_stream_buffer(stream_output, video_stream, audio_frame):
     """Create a new StreamBuffer."""
 
     a_packet = None
     segment = io.BytesIO()
-    output = av.open(segment, mode="w", format=stream_output.format)
+    output = av.open(
+        segment,
+        mode="w",
+        format=stream_output.format,
+        container_options=stream_output.container_options,
+    )
     vstream = output.add_stream(template=video_stream)
     # Check if audio is requested
     astream = None
@@ -40,7 +71,42 @@ def create_stream_buffer(stream_output, video_stream, audio_frame):
             a_packets = astream.encode(audio_frame)
             if a_packets:
                 a_packet = a_packets[0]
-    return (a_packet, StreamBuffer(segment, output, vstream, astream))
+    buffer = StreamBuffer(segment, output, vstream, astream)
+    if stream_output.part_target_duration:
+        buffer.parts = []
+    return (a_packet, buffer)
+
+
+def flush_part(hass, stream, fmt, buffer, sequence, end_time):
+    """Pass the fragments written since the last part to the output."""
+    position = buffer.segment.tell()
+    if position <= buffer.part_offset:
+        return
+
+    with buffer.segment.getbuffer() as view:
+        data = bytes(view[buffer.part_offset : position])
+
+    output = stream.outputs.get(fmt)
+
+    if buffer.part_offset == 0:
+        # The muxer writes the initialization section before the fragments
+        init_size = find_mp4_box(data, b"moof")
+        if init_size is None:
+            init_size = len(data)
+        buffer.init_size = init_size
+        if output:
+            hass.loop.call_soon_threadsafe(output.set_init, data[:init_size])
+        data = data[init_size:]
+
+    buffer.part_offset = position
+    if not data:
+        return
+
+    part = Part(float(end_time - buffer.part_time), not buffer.parts, data)
+    buffer.parts.append(part)
+    buffer.part_time = end_time
+    if output:
+        hass.loop.call_soon_threadsafe(output.put_part, sequence, part)
 
 
 def stream_worker(hass, stream, quit_event):
@@ -53,6 +119,12 @@ def stream_worker(hass, stream, quit_event):
         _LOGGER.error("Stream has no video")
         return
 
+    metrics = stream.metrics
+    if metrics.started is None:
+        metrics.started = monotonic()
+    # A single demuxer for the lifetime of the container
+    packets = container.demux(video_stream)
+
     audio_frame = generate_audio_frame()
 
     first_packet = True
@@ -66,10 +138,12 @@ def stream_worker(hass, stream, quit_event):
     first_pts = 0
     # The decoder timestamp of the latest packet we processed
     last_dts = None
+    # Seconds spent muxing the packets of the current segments
+    mux_time = 0.0
 
     while not quit_event.is_set():
         try:
-            packet = next(container.demux(video_stream))
+            packet = next(packets)
             if packet.dts is None:
                 if first_packet:
                     continue
@@ -79,6 +153,9 @@ def stream_worker(hass, stream, quit_event):
             # End of stream, clear listeners and stop thread
             for fmt, _ in outputs.items():
                 hass.loop.call_soon_threadsafe(stream.outputs[fmt].put, None)
+            if stream.image_requested.is_set():
+                stream.image_requested.clear()
+                hass.loop.call_soon_threadsafe(stream.async_set_image, None)
             _LOGGER.error("Error demuxing stream: %s", str(ex))
             break
 
@@ -86,6 +163,14 @@ def stream_worker(hass, stream, quit_event):
         if not first_packet and last_dts >= packet.dts:
             continue
         last_dts = packet.dts
+        metrics.packets += 1
+
+        if packet.is_keyframe and stream.image_requested.is_set():
+            stream.image_requested.clear()
+            hass.loop.call_soon_threadsafe(
+                stream.async_set_image,
+                decode_keyframe_image(video_stream.codec_context, packet),
+            )
 
         # Reset timestamps from a 0 time base for this stream
         packet.dts -= first_pts
@@ -99,14 +184,35 @@ def stream_worker(hass, stream, quit_event):
             # each segment is, assuming the stream starts from 0.
             segment_duration = (packet.pts * packet.time_base) / sequence
             # Save segment to outputs
+            start = monotonic()
             for fmt, buffer in outputs.items():
                 buffer.output.close()
                 del audio_packets[buffer.astream]
+                if buffer.parts is not None:
+                    # Closing the output wrote the last fragment
+                    flush_part(
+                        hass,
+                        stream,
+                        fmt,
+                        buffer,
+                        sequence,
+                        packet.pts * packet.time_base,
+                    )
                 if stream.outputs.get(fmt):
+                    # Copied out once, all clients are served the same bytes
                     hass.loop.call_soon_threadsafe(
                         stream.outputs[fmt].put,
-                        Segment(sequence, buffer.segment, segment_duration),
+                        Segment(
+                            sequence,
+                            buffer.segment.getvalue()[buffer.init_size :],
+                            segment_duration,
+                            buffer.parts or [],
+                        ),
                     )
+            if outputs:
+                metrics.segments += 1
+                metrics.segment_build_time.record(mux_time + monotonic() - start)
+            mux_time = 0.0
 
             # Clear outputs and increment sequence
             outputs = {}
@@ -137,7 +243,9 @@ def stream_worker(hass, stream, quit_event):
             first_packet = False
 
         # Store packets on each output
-        for buffer in outputs.values():
+        start = monotonic()
+        packet_time = packet.pts * packet.time_base
+        for fmt, buffer in outputs.items():
             # Check if the format requires audio
             if audio_packets.get(buffer.astream):
                 a_packet = audio_packets[buffer.astream]
@@ -165,6 +273,13 @@ def stream_worker(hass, stream, quit_event):
             packet.stream = buffer.vstream
             buffer.output.mux(packet)
 
+            if buffer.parts is not None:
+                if buffer.part_time is None:
+                    buffer.part_time = packet_time
+                # The muxer writes a fragment once it holds a part of packets
+                flush_part(hass, stream, fmt, buffer, sequence, packet_time)
+        mux_time += monotonic() - start
+
     # Close stream
     buffer.output.close()
     container.close()
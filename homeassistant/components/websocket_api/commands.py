@@ -25,6 +25,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
+    async_reg(hass, handle_get_service_stats)
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
@@ -182,6 +183,20 @@ async def handle_get_services(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"], descriptions))
 
 
+@callback
+@decorators.require_admin
+@decorators.websocket_command({vol.Required("type"): "get_service_stats"})
+def handle_get_service_stats(hass, connection, msg):
+    """Handle get service stats command."""
+    stats = [
+        {"domain": domain, "service": service, **service_stats.as_dict()}
+        for (domain, service), service_stats in sorted(
+            hass.services.async_call_stats().items()
+        )
+    ]
+    connection.send_message(messages.result_message(msg["id"], stats))
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "get_config"})
 def handle_get_config(hass, connection, msg):
@@ -20,6 +20,7 @@ from .core.const import (
     CONF_BAUDRATE,
     CONF_DATABASE,
     CONF_DEVICE_CONFIG,
+    CONF_DEVICE_REFRESH_CONCURRENCY,
     CONF_ENABLE_QUIRKS,
     CONF_RADIO_TYPE,
     CONF_USB_PATH,
@@ -42,6 +43,9 @@ ZHA_CONFIG_SCHEMA = {
     vol.Optional(CONF_DEVICE_CONFIG, default={}): vol.Schema(
         {cv.string: DEVICE_CONFIG_SCHEMA_ENTRY}
     ),
+    vol.Optional(CONF_DEVICE_REFRESH_CONCURRENCY): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
     vol.Optional(CONF_ENABLE_QUIRKS, default=True): cv.boolean,
     vol.Optional(CONF_ZIGPY): dict,
     vol.Optional(CONF_RADIO_TYPE): cv.enum(RadioType),
@@ -4,7 +4,7 @@ import asyncio
 from enum import Enum
 from functools import wraps
 import logging
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 import zigpy.exceptions
 
@@ -75,6 +75,9 @@ class ZigbeeChannel(LogMixin):
     """Base channel for a Zigbee cluster."""
 
     REPORT_CONFIG = ()
+    # Attribute reports arriving within this many seconds result in a single
+    # state write per entity, None writes the state on every report
+    REPORT_COALESCE_WINDOW: Optional[float] = None
 
     def __init__(
         self, cluster: zha_typing.ZigpyClusterType, ch_pool: zha_typing.ChannelPoolType
@@ -96,6 +99,9 @@ class ZigbeeChannel(LogMixin):
                 self.value_attribute = attr
         self._status = ChannelStatus.CREATED
         self._cluster.add_listener(self)
+        self.coalesce_window = self.REPORT_COALESCE_WINDOW
+        self.reports_received = 0
+        self.state_writes = 0
 
     @property
     def id(self) -> str:
@@ -168,6 +168,7 @@ class LevelControlChannel(ZigbeeChannel):
 
     CURRENT_LEVEL = 0
     REPORT_CONFIG = ({"attr": "current_level", "config": REPORT_CONFIG_ASAP},)
+    REPORT_COALESCE_WINDOW = 0.5
 
     @callback
     def cluster_command(self, tsn, command_id, args):
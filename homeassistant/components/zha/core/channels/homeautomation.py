@@ -50,6 +50,7 @@ class ElectricalMeasurementChannel(ZigbeeChannel):
     CHANNEL_NAME = CHANNEL_ELECTRICAL_MEASUREMENT
 
     REPORT_CONFIG = ({"attr": "active_power", "config": REPORT_CONFIG_DEFAULT},)
+    REPORT_COALESCE_WINDOW = 1.0
 
     def __init__(
         self, cluster: zha_typing.ZigpyClusterType, ch_pool: zha_typing.ChannelPoolType
@@ -58,6 +58,7 @@ class Metering(ZigbeeChannel):
     """Metering channel."""
 
     REPORT_CONFIG = [{"attr": "instantaneous_demand", "config": REPORT_CONFIG_DEFAULT}]
+    REPORT_COALESCE_WINDOW = 1.0
 
     unit_of_measure_map = {
         0x00: "kW",
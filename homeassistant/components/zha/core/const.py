@@ -49,6 +49,7 @@ ATTR_NODE_DESCRIPTOR = "node_descriptor"
 ATTR_NWK = "nwk"
 ATTR_OUT_CLUSTERS = "out_clusters"
 ATTR_POWER_SOURCE = "power_source"
+ATTR_PROGRESS = "progress"
 ATTR_PROFILE_ID = "profile_id"
 ATTR_QUIRK_APPLIED = "quirk_applied"
 ATTR_QUIRK_CLASS = "quirk_class"
@@ -114,6 +115,7 @@ COMPONENTS = (
 CONF_BAUDRATE = "baudrate"
 CONF_DATABASE = "database_path"
 CONF_DEVICE_CONFIG = "device_config"
+CONF_DEVICE_REFRESH_CONCURRENCY = "device_refresh_concurrency"
 CONF_ENABLE_QUIRKS = "enable_quirks"
 CONF_FLOWCONTROL = "flow_control"
 CONF_RADIO_TYPE = "radio_type"
@@ -152,6 +154,7 @@ DEBUG_RELAY_LOGGERS = [DEBUG_COMP_ZHA, DEBUG_COMP_ZIGPY]
 DEFAULT_RADIO_TYPE = "ezsp"
 DEFAULT_BAUDRATE = 57600
 DEFAULT_DATABASE_NAME = "zigbee.db"
+DEFAULT_DEVICE_REFRESH_CONCURRENCY = 2
 DISCOVERY_KEY = "zha_discovery_info"
 
 DOMAIN = "zha"
@@ -216,6 +219,16 @@ class RadioType(enum.Enum):
         return self._desc
 
 
+# Devices refreshed from the network at once, by how many requests the radio
+# can have in flight
+DEVICE_REFRESH_CONCURRENCY = {
+    RadioType.ezsp.name: 4,
+    RadioType.deconz.name: 4,
+    RadioType.ti_cc.name: 2,
+    RadioType.zigate.name: 1,
+    RadioType.xbee.name: 2,
+}
+
 REPORT_CONFIG_MAX_INT = 900
 REPORT_CONFIG_MAX_INT_BATTERY_SAVE = 10800
 REPORT_CONFIG_MIN_INT = 30
@@ -308,6 +321,7 @@ ZHA_GW_MSG = "zha_gateway_message"
 ZHA_GW_MSG_DEVICE_FULL_INIT = "device_fully_initialized"
 ZHA_GW_MSG_DEVICE_INFO = "device_info"
 ZHA_GW_MSG_DEVICE_JOINED = "device_joined"
+ZHA_GW_MSG_DEVICE_REFRESH_PROGRESS = "device_refresh_progress"
 ZHA_GW_MSG_DEVICE_REMOVED = "device_removed"
 ZHA_GW_MSG_GROUP_ADDED = "group_added"
 ZHA_GW_MSG_GROUP_INFO = "group_info"
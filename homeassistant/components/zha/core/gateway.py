@@ -32,9 +32,11 @@ from .const import (
     ATTR_MANUFACTURER,
     ATTR_MODEL,
     ATTR_NWK,
+    ATTR_PROGRESS,
     ATTR_SIGNATURE,
     ATTR_TYPE,
     CONF_DATABASE,
+    CONF_DEVICE_REFRESH_CONCURRENCY,
     CONF_RADIO_TYPE,
     CONF_ZIGPY,
     DATA_ZHA,
@@ -52,6 +54,8 @@ from .const import (
     DEBUG_LEVELS,
     DEBUG_RELAY_LOGGERS,
     DEFAULT_DATABASE_NAME,
+    DEFAULT_DEVICE_REFRESH_CONCURRENCY,
+    DEVICE_REFRESH_CONCURRENCY,
     DOMAIN,
     SIGNAL_ADD_ENTITIES,
     SIGNAL_GROUP_MEMBERSHIP_CHANGE,
@@ -63,6 +67,7 @@ from .const import (
     ZHA_GW_MSG_DEVICE_FULL_INIT,
     ZHA_GW_MSG_DEVICE_INFO,
     ZHA_GW_MSG_DEVICE_JOINED,
+    ZHA_GW_MSG_DEVICE_REFRESH_PROGRESS,
     ZHA_GW_MSG_DEVICE_REMOVED,
     ZHA_GW_MSG_GROUP_ADDED,
     ZHA_GW_MSG_GROUP_INFO,
@@ -88,6 +93,9 @@ EntityReference = collections.namedtuple(
     "reference_id zha_device cluster_channels device_info remove_future",
 )
 
+# Refresh the coordinator first, then routers as they relay for other devices
+DEVICE_REFRESH_TYPE_PRIORITY = {"Coordinator": 0, "Router": 1}
+
 
 class ZHAGateway:
     """Gateway that handles events that happen on the ZHA Zigbee network."""
@@ -112,6 +120,9 @@ class ZHAGateway:
         self.debug_enabled = False
         self._log_relay_handler = LogRelayHandler(hass, self)
         self._config_entry = config_entry
+        self._refresh_task = None
+        self.devices_refreshed = 0
+        self.devices_to_refresh = 0
 
     async def async_initialize(self):
         """Initialize controller and connect radio."""
@@ -177,29 +188,63 @@ class ZHAGateway:
             discovery.GROUP_PROBE.discover_group_entities(zha_group)
 
     async def async_initialize_devices_and_entities(self) -> None:
-        """Initialize devices and load entities."""
-        semaphore = asyncio.Semaphore(2)
-
-        async def _throttle(zha_device: zha_typing.ZhaDeviceType, cached: bool):
-            async with semaphore:
-                await zha_device.async_initialize(from_cache=cached)
+        """Initialize devices from cache and load entities.
 
-        _LOGGER.debug("Loading battery powered devices")
+        Mains powered devices are refreshed from the network afterwards, in
+        the background, so entities don't wait for the radio.
+        """
+        _LOGGER.debug("Loading devices from cache")
         await asyncio.gather(
-            *[
-                _throttle(dev, cached=True)
-                for dev in self.devices.values()
-                if not dev.is_mains_powered
-            ]
+            *[dev.async_initialize(from_cache=True) for dev in self.devices.values()]
         )
 
-        _LOGGER.debug("Loading mains powered devices")
-        await asyncio.gather(
-            *[
-                _throttle(dev, cached=False)
-                for dev in self.devices.values()
-                if dev.is_mains_powered
-            ]
+        self._refresh_task = self._hass.async_create_task(self.async_refresh_devices())
+
+    @property
+    def device_refresh_concurrency(self) -> int:
+        """Return how many devices are refreshed from the network at once."""
+        if CONF_DEVICE_REFRESH_CONCURRENCY in self._config:
+            return self._config[CONF_DEVICE_REFRESH_CONCURRENCY]
+        return DEVICE_REFRESH_CONCURRENCY.get(
+            self._config_entry.data[CONF_RADIO_TYPE],
+            DEFAULT_DEVICE_REFRESH_CONCURRENCY,
+        )
+
+    async def async_refresh_devices(self) -> None:
+        """Refresh mains powered devices from the network by priority."""
+        devices = sorted(
+            (dev for dev in self.devices.values() if dev.is_mains_powered),
+            key=_device_refresh_priority,
+        )
+        self.devices_refreshed = 0
+        self.devices_to_refresh = len(devices)
+        semaphore = asyncio.Semaphore(self.device_refresh_concurrency)
+
+        async def _refresh(zha_device: zha_typing.ZhaDeviceType):
+            async with semaphore:
+                await zha_device.async_initialize(from_cache=False)
+            self.devices_refreshed += 1
+            async_dispatcher_send(
+                self._hass,
+                ZHA_GW_MSG,
+                {
+                    ATTR_TYPE: ZHA_GW_MSG_DEVICE_REFRESH_PROGRESS,
+                    ATTR_IEEE: str(zha_device.ieee),
+                    ATTR_PROGRESS: {
+                        "refreshed": self.devices_refreshed,
+                        "total": self.devices_to_refresh,
+                    },
+                },
+            )
+
+        _LOGGER.debug("Refreshing %s mains powered devices", len(devices))
+        start = time.monotonic()
+        # Devices are started in priority order, the semaphore queues the rest
+        await asyncio.gather(*[_refresh(dev) for dev in devices])
+        _LOGGER.debug(
+            "Refreshed %s devices in %.3f seconds",
+            len(devices),
+            time.monotonic() - start,
         )
 
     def device_joined(self, device):
@@ -606,9 +651,19 @@ class ZHAGateway:
     async def shutdown(self):
         """Stop ZHA Controller Application."""
         _LOGGER.debug("Shutting down ZHA ControllerApplication")
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
         await self.application_controller.shutdown()
 
 
+def _device_refresh_priority(zha_device: zha_typing.ZhaDeviceType):
+    """Return sort key to refresh a device, most recently seen first."""
+    return (
+        DEVICE_REFRESH_TYPE_PRIORITY.get(zha_device.device_type, 2),
+        -(zha_device.last_seen or 0),
+    )
+
+
 @callback
 def async_capture_log_levels():
     """Capture current logger levels for ZHA."""
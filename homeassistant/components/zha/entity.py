@@ -5,7 +5,7 @@ import logging
 import time
 from typing import Any, Awaitable, Dict, List, Optional
 
-from homeassistant.core import CALLBACK_TYPE, State, callback
+from homeassistant.core import CALLBACK_TYPE, State, callback, is_callback
 from homeassistant.helpers import entity
 from homeassistant.helpers.device_registry import CONNECTION_ZIGBEE
 from homeassistant.helpers.dispatcher import (
@@ -22,10 +22,12 @@ from .core.const import (
     DATA_ZHA,
     DATA_ZHA_BRIDGE_ID,
     DOMAIN,
+    SIGNAL_ATTR_UPDATED,
     SIGNAL_GROUP_ENTITY_REMOVED,
     SIGNAL_GROUP_MEMBERSHIP_CHANGE,
     SIGNAL_REMOVE,
     SIGNAL_REMOVE_GROUP,
+    SIGNAL_SET_LEVEL,
 )
 from .core.helpers import LogMixin
 from .core.typing import CALLABLE_T, ChannelType, ZhaDeviceType
@@ -34,6 +36,9 @@ _LOGGER = logging.getLogger(__name__)
 
 ENTITY_SUFFIX = "entity_suffix"
 RESTART_GRACE_PERIOD = 7200  # 2 hours
+# Channel signals reporting attribute values, state writes they cause are
+# coalesced according to the window of the channel
+REPORT_SIGNALS = (SIGNAL_ATTR_UPDATED, SIGNAL_SET_LEVEL)
 
 
 class BaseZhaEntity(LogMixin, entity.Entity):
@@ -50,6 +55,9 @@ class BaseZhaEntity(LogMixin, entity.Entity):
         self._zha_device: ZhaDeviceType = zha_device
         self._available: bool = False
         self._unsubs: List[CALLABLE_T] = []
+        self._report_channel: Optional[ChannelType] = None
+        self._coalesced_write: Optional[asyncio.TimerHandle] = None
+        self._last_report_write: float = 0
         self.remove_future: Awaitable[None] = None
 
     @property
@@ -117,11 +125,53 @@ class BaseZhaEntity(LogMixin, entity.Entity):
     def async_set_state(self, attr_id: int, attr_name: str, value: Any) -> None:
         """Set the entity state."""
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, coalescing writes caused by attribute reports.
+
+        The first report is written right away, further reports within the
+        window of the channel are written once at the end of the window.
+        """
+        channel = self._report_channel
+        if channel is not None and channel.coalesce_window:
+            if self._coalesced_write is not None:
+                return
+            delay = self._last_report_write + channel.coalesce_window - time.monotonic()
+            if delay > 0:
+                self._coalesced_write = self.hass.loop.call_later(
+                    delay, self._async_write_coalesced, channel
+                )
+                return
+
+        if self._coalesced_write is not None:
+            self._coalesced_write.cancel()
+            self._coalesced_write = None
+        if channel is not None:
+            self._async_write_report(channel)
+        else:
+            super().async_write_ha_state()
+
+    @callback
+    def _async_write_coalesced(self, channel: ChannelType) -> None:
+        """Write the state after the reports of a window were received."""
+        self._coalesced_write = None
+        self._async_write_report(channel)
+
+    @callback
+    def _async_write_report(self, channel: ChannelType) -> None:
+        """Write the state caused by attribute reports of a channel."""
+        self._last_report_write = time.monotonic()
+        channel.state_writes += 1
+        super().async_write_ha_state()
+
     async def async_will_remove_from_hass(self) -> None:
         """Disconnect entity object when removed."""
         for unsub in self._unsubs[:]:
             unsub()
             self._unsubs.remove(unsub)
+        if self._coalesced_write is not None:
+            self._coalesced_write.cancel()
+            self._coalesced_write = None
 
     async def async_accept_signal(
         self, channel: ChannelType, signal: str, func: CALLABLE_T, signal_override=False
@@ -131,11 +181,28 @@ class BaseZhaEntity(LogMixin, entity.Entity):
         if signal_override:
             unsub = async_dispatcher_connect(self.hass, signal, func)
         else:
+            if signal in REPORT_SIGNALS and is_callback(func):
+                func = self._report_handler(channel, func)
             unsub = async_dispatcher_connect(
                 self.hass, f"{channel.unique_id}_{signal}", func
             )
         self._unsubs.append(unsub)
 
+    def _report_handler(self, channel: ChannelType, func: CALLABLE_T) -> CALLABLE_T:
+        """Wrap a report handler to count reports and coalesce state writes."""
+
+        @callback
+        def handle_report(*args: Any) -> None:
+            """Handle an attribute report of the channel."""
+            channel.reports_received += 1
+            self._report_channel = channel
+            try:
+                func(*args)
+            finally:
+                self._report_channel = None
+
+        return handle_report
+
     def log(self, level: int, msg: str, *args):
         """Log a message."""
         msg = f"%s: {msg}"
@@ -6,6 +6,7 @@ of entities and react to changes.
 """
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 import datetime
 import enum
 import functools
@@ -28,6 +29,7 @@ from typing import (
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -74,6 +76,7 @@ from homeassistant.exceptions import (
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
+from homeassistant.util.latency import LatencyHistogram
 from homeassistant.util.thread import fix_threading_exception_logging
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
 
@@ -1028,6 +1031,36 @@ class Service:
         self.is_coroutinefunction = asyncio.iscoroutinefunction(func)
 
 
+class ServiceCallStats:
+    """Call counters and latency histograms of a single service."""
+
+    __slots__ = ["calls", "errors", "duration", "parallel_wait"]
+
+    def __init__(self) -> None:
+        """Initialize the service call statistics."""
+        self.calls = 0
+        self.errors = 0
+        # Time spent executing the service handler
+        self.duration = LatencyHistogram()
+        # Time entities waited for their platform's parallel updates semaphore
+        self.parallel_wait = LatencyHistogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the statistics."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "duration": self.duration.as_dict(),
+            "parallel_wait": self.parallel_wait.as_dict(),
+        }
+
+
+# Statistics of the service call that is being executed in the current task
+_current_service_call_stats: ContextVar[Optional[ServiceCallStats]] = ContextVar(
+    "current_service_call_stats", default=None
+)
+
+
 class ServiceCall:
     """Representation of a call to a service."""
 
@@ -1063,6 +1096,7 @@ class ServiceRegistry:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a service registry."""
         self._services: Dict[str, Dict[str, Service]] = {}
+        self._stats: Dict[Tuple[str, str], ServiceCallStats] = {}
         self._hass = hass
 
     @property
@@ -1280,16 +1314,52 @@ class ServiceRegistry:
 
         self._hass.async_create_task(catch_exceptions())
 
+    @callback
+    def async_call_stats(self) -> Dict[Tuple[str, str], ServiceCallStats]:
+        """Return the call statistics per (domain, service).
+
+        This method must be run in the event loop.
+        """
+        return self._stats.copy()
+
+    @callback
+    def async_record_parallel_wait(self, duration: float) -> None:
+        """Record time the running service call waited for parallel updates.
+
+        This method must be run in the event loop.
+        """
+        stats = _current_service_call_stats.get()
+        if stats is not None:
+            stats.parallel_wait.record(duration)
+
     async def _execute_service(
         self, handler: Service, service_call: ServiceCall
     ) -> None:
         """Execute a service."""
-        if handler.is_coroutinefunction:
-            await handler.func(service_call)
-        elif handler.is_callback:
-            handler.func(service_call)
-        else:
-            await self._hass.async_add_executor_job(handler.func, service_call)
+        key = (service_call.domain, service_call.service)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = ServiceCallStats()
+
+        stats.calls += 1
+        token = _current_service_call_stats.set(stats)
+        start = monotonic()
+
+        try:
+            if handler.is_coroutinefunction:
+                await handler.func(service_call)
+            elif handler.is_callback:
+                handler.func(service_call)
+            else:
+                await self._hass.async_add_executor_job(handler.func, service_call)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.duration.record(monotonic() - start)
+            _current_service_call_stats.reset(token)
 
 
 class Config:
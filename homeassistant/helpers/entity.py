@@ -591,7 +591,10 @@ class Entity(ABC):
     async def async_request_call(self, coro):
         """Process request batched."""
         if self.parallel_updates:
+            start = timer()
             await self.parallel_updates.acquire()
+            assert self.hass is not None
+            self.hass.services.async_record_parallel_wait(timer() - start)
 
         try:
             await coro
@@ -1,7 +1,7 @@
 """Class to manage the entities for a single platform."""
 import asyncio
 from contextvars import ContextVar
-from datetime import datetime, timedelta
+from datetime import timedelta
 from logging import Logger
 from types import ModuleType
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, cast
@@ -12,9 +12,11 @@ from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.helpers import config_validation as cv, service
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.latency import LatencyHistogram
 
 from .entity_registry import DISABLED_INTEGRATION
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
+from .polling import async_get_poll_scheduler
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -52,11 +54,8 @@ class EntityPlatform:
         self.config_entry = None
         self.entities: Dict[str, Entity] = {}  # pylint: disable=used-before-assignment
         self._tasks: List[asyncio.Future] = []
-        # Method to cancel the state change listener
-        self._async_unsub_polling: Optional[CALLBACK_TYPE] = None
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
-        self._process_updates: Optional[asyncio.Lock] = None
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -64,6 +63,13 @@ class EntityPlatform:
         # which powers entity_component.add_entities
         self.parallel_updates_created = platform is None
 
+        self.parallel_service_calls: Optional[asyncio.Semaphore] = None
+        self.parallel_service_calls_created = platform is None
+        # Duration of dispatching an entity service call to this platform
+        self.service_call_latency = LatencyHistogram()
+        # Duration of polling an entity of this platform
+        self.poll_latency = LatencyHistogram()
+
         hass.data.setdefault(DATA_ENTITY_PLATFORM, {}).setdefault(
             self.platform_name, []
         ).append(self)
@@ -98,6 +104,28 @@ class EntityPlatform:
 
         return self.parallel_updates
 
+    @callback
+    def async_get_parallel_service_calls_semaphore(
+        self,
+    ) -> Optional[asyncio.Semaphore]:
+        """Get or create a semaphore limiting concurrent entity service calls.
+
+        Platforms can set PARALLEL_SERVICE_CALLS to cap how many entities are
+        called at the same time when a service targets many of them. Not set
+        or 0 means no limit.
+        """
+        if self.parallel_service_calls_created:
+            return self.parallel_service_calls
+
+        self.parallel_service_calls_created = True
+
+        parallel_service_calls = getattr(self.platform, "PARALLEL_SERVICE_CALLS", None)
+
+        if parallel_service_calls:
+            self.parallel_service_calls = asyncio.Semaphore(parallel_service_calls)
+
+        return self.parallel_service_calls
+
     async def async_setup(self, platform_config, discovery_info=None):
         """Set up the platform from a config file."""
         platform = self.platform
@@ -294,15 +322,6 @@ class EntityPlatform:
 
         await asyncio.gather(*tasks)
 
-        if self._async_unsub_polling is not None or not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            return
-
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass, self._update_entity_states, self.scan_interval,
-        )
-
     async def _async_add_entity(
         self, entity, update_before_add, entity_registry, device_registry
     ):
@@ -445,6 +464,13 @@ class EntityPlatform:
 
         entity.async_write_ha_state()
 
+        if entity.should_poll:
+            entity.async_on_remove(
+                async_get_poll_scheduler(self.hass).async_add_entity(
+                    self, entity, self.scan_interval
+                )
+            )
+
     async def async_reset(self) -> None:
         """Remove all entities and reset data.
 
@@ -461,10 +487,6 @@ class EntityPlatform:
 
         await asyncio.gather(*tasks)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_destroy(self) -> None:
         """Destroy an entity platform.
 
@@ -477,13 +499,6 @@ class EntityPlatform:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if self._async_unsub_polling is not None and not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_extract_from_service(self, service_call, expand_group=True):
         """Extract all known and available entities from a service call.
 
@@ -521,35 +536,6 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
-
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
-
-        This method must be run in the event loop.
-        """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
-            )
-            return
-
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))  # type: ignore
-
-            if tasks:
-                await asyncio.gather(*tasks)
-
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
     "current_platform", default=None
@@ -0,0 +1,166 @@
+"""Poll entities of all platforms from a single scheduler."""
+import asyncio
+from datetime import datetime, timedelta
+import heapq
+from itertools import count
+from time import monotonic
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import zlib
+
+from homeassistant.const import ATTR_NOW, EVENT_TIME_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, callback
+from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.loader import bind_hass
+import homeassistant.util.dt as dt_util
+
+if TYPE_CHECKING:
+    from .entity import Entity
+    from .entity_platform import EntityPlatform
+
+DATA_POLL_SCHEDULER = "poll_scheduler"
+
+
+@callback
+@bind_hass
+def async_get_poll_scheduler(hass: HomeAssistantType) -> "PollScheduler":
+    """Return the poll scheduler, creating it if needed."""
+    scheduler = hass.data.get(DATA_POLL_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_POLL_SCHEDULER] = PollScheduler(hass)
+    return scheduler
+
+
+def poll_offset(entity_id: str, interval: timedelta) -> timedelta:
+    """Return the offset within the interval at which an entity is polled.
+
+    The offset is derived from the entity id, so it is the same on every
+    start and entities of one platform are spread evenly over the interval.
+    """
+    return interval * (zlib.crc32(entity_id.encode()) / 2 ** 32)
+
+
+class _PollJob:
+    """Polling of a single entity."""
+
+    __slots__ = ("platform", "entity", "interval", "due", "task", "removed")
+
+    def __init__(
+        self,
+        platform: "EntityPlatform",
+        entity: "Entity",
+        interval: timedelta,
+        due: datetime,
+    ) -> None:
+        """Initialize the job."""
+        self.platform = platform
+        self.entity = entity
+        self.interval = interval
+        self.due = due
+        self.task: Optional[asyncio.Task] = None
+        self.removed = False
+
+
+class PollScheduler:
+    """Poll entities from one timer at a fixed offset in their scan interval.
+
+    Entities are kept in a heap ordered by the time they are due. An entity
+    whose previous update is still running is skipped, the other entities of
+    its platform are still polled.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._queue: List[Tuple[datetime, int, _PollJob]] = []
+        self._counter = count()
+        self._jobs = 0
+        self._unsub_time: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_add_entity(
+        self, platform: "EntityPlatform", entity: "Entity", interval: timedelta
+    ) -> CALLBACK_TYPE:
+        """Poll an entity every interval, return a callback to stop."""
+        job = _PollJob(
+            platform,
+            entity,
+            interval,
+            dt_util.utcnow() + poll_offset(entity.entity_id, interval),
+        )
+        self._async_push(job)
+        self._jobs += 1
+
+        if self._unsub_time is None:
+            self._unsub_time = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+        @callback
+        def async_remove() -> None:
+            """Stop polling the entity."""
+            if job.removed:
+                return
+            job.removed = True
+            self._jobs -= 1
+
+            if not self._jobs and self._unsub_time is not None:
+                self._unsub_time()
+                self._unsub_time = None
+                self._queue = []
+
+        return async_remove
+
+    @callback
+    def _async_push(self, job: _PollJob) -> None:
+        """Queue a job for the time it is due."""
+        heapq.heappush(self._queue, (job.due, next(self._counter), job))
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Poll the entities that are due."""
+        now = event.data[ATTR_NOW]
+        queue = self._queue
+        polled = []
+
+        while queue and queue[0][0] <= now:
+            job = heapq.heappop(queue)[2]
+            if job.removed:
+                continue
+            self._async_poll(job)
+            polled.append(job)
+
+        utcnow = dt_util.utcnow()
+        for job in polled:
+            if job.due <= utcnow < job.due + job.interval:
+                # Keep the offset of the entity within the interval
+                job.due += job.interval
+            else:
+                job.due = utcnow + job.interval
+            self._async_push(job)
+
+    @callback
+    def _async_poll(self, job: _PollJob) -> None:
+        """Start the update of an entity."""
+        entity = job.entity
+
+        if not entity.should_poll:
+            return
+
+        if job.task is not None and not job.task.done():
+            job.platform.logger.warning(
+                "Updating %s took longer than the scheduled update interval %s",
+                entity.entity_id,
+                job.interval,
+            )
+            return
+
+        job.task = self.hass.async_create_task(self._async_update(job))
+
+    @staticmethod
+    async def _async_update(job: _PollJob) -> None:
+        """Update an entity and record how long it took."""
+        start = monotonic()
+        try:
+            await job.entity.async_update_ha_state(True)  # type: ignore
+        finally:
+            job.platform.poll_latency.record(monotonic() - start)
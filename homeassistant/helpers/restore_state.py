@@ -27,12 +27,24 @@ _LOGGER = logging.getLogger(__name__)
 STORAGE_KEY = "core.restore_state"
 STORAGE_VERSION = 1
 
+# States that changed since the last full write are stored in a journal
+JOURNAL_STORAGE_KEY = "core.restore_state_journal"
+JOURNAL_STORAGE_VERSION = 1
+
 # How long between periodically saving the current states to disk
 STATE_DUMP_INTERVAL = timedelta(minutes=15)
 
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How often the journal is folded into a full write of all stored states.
+# This also bounds how outdated the last_seen of an unchanged state can be.
+COMPACT_INTERVAL = timedelta(days=1)
+
+# Fold the journal earlier when it holds more entries than this fraction of
+# the fully written states
+COMPACT_RATIO = 0.5
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -68,25 +80,11 @@ class RestoreStateData:
         if task is None:
 
             async def load_instance(hass: HomeAssistant) -> "RestoreStateData":
-                """Set up the restore state helper."""
-                data = cls(hass)
-
-                try:
-                    stored_states = await data.store.async_load()
-                except HomeAssistantError as exc:
-                    _LOGGER.error("Error loading last states", exc_info=exc)
-                    stored_states = None
+                """Set up the restore state helper.
 
-                if stored_states is None:
-                    _LOGGER.debug("Not creating cache - no saved states found")
-                    data.last_states = {}
-                else:
-                    data.last_states = {
-                        item["state"]["entity_id"]: StoredState.from_dict(item)
-                        for item in stored_states
-                        if valid_entity_id(item["state"]["entity_id"])
-                    }
-                    _LOGGER.debug("Created cache with %s", list(data.last_states))
+                The stored states are only loaded once they are needed.
+                """
+                data = cls(hass)
 
                 if hass.state == CoreState.running:
                     data.async_setup_dump()
@@ -109,8 +107,82 @@ class RestoreStateData:
         self.store: Store = Store(
             hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
         )
+        self.journal_store: Store = Store(
+            hass, JOURNAL_STORAGE_VERSION, JOURNAL_STORAGE_KEY, encoder=JSONEncoder
+        )
         self.last_states: Dict[str, StoredState] = {}
         self.entity_ids: Set[str] = set()
+        self._load_task: Optional[asyncio.Future] = None
+        # The state that is persisted for each entity, to detect changes
+        self._written: Dict[str, State] = {}
+        # Changes that have been written to the journal since the last
+        # full write, with the time an entity was removed
+        self._journal_states: Dict[str, StoredState] = {}
+        self._journal_removed: Dict[str, datetime] = {}
+        self._written_in_full = 0
+        self._last_compaction: Optional[datetime] = None
+
+    async def async_load(self) -> None:
+        """Load the stored states from the previous run, once."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Load the full write and apply the journal on top of it."""
+        try:
+            stored_states = await self.store.async_load()
+            journal = await self.journal_store.async_load()
+        except HomeAssistantError as exc:
+            _LOGGER.error("Error loading last states", exc_info=exc)
+            return
+
+        if stored_states is None:
+            _LOGGER.debug("Not creating cache - no saved states found")
+            return
+
+        loaded = {
+            item["state"]["entity_id"]: StoredState.from_dict(item)
+            for item in cast(List[Dict[str, Any]], stored_states)
+            if valid_entity_id(item["state"]["entity_id"])
+        }
+        self._written_in_full = len(loaded)
+
+        if journal is not None:
+            journal = cast(Dict[str, Any], journal)
+            # A journal entry older than the full write has already been
+            # folded into it before the journal could be cleared.
+            for item in journal["states"]:
+                stored_state = StoredState.from_dict(item)
+                entity_id = stored_state.state.entity_id
+                existing = loaded.get(entity_id)
+                if valid_entity_id(entity_id) and (
+                    existing is None or stored_state.last_seen >= existing.last_seen
+                ):
+                    loaded[entity_id] = stored_state
+
+            for entity_id, removed in journal["removed"].items():
+                existing = loaded.get(entity_id)
+                removed_at = dt_util.parse_datetime(removed)
+                if removed_at is None:
+                    _LOGGER.warning(
+                        "Ignoring invalid removal of %s from the restore state journal",
+                        entity_id,
+                    )
+                    continue
+                if existing is not None and removed_at >= existing.last_seen:
+                    loaded.pop(entity_id)
+
+        self._written = {
+            entity_id: stored_state.state for entity_id, stored_state in loaded.items()
+        }
+
+        # States stored during this run are newer than the loaded ones
+        for entity_id, stored_state in loaded.items():
+            self.last_states.setdefault(entity_id, stored_state)
+
+        _LOGGER.debug("Created cache with %s", list(self.last_states))
 
     @callback
     def async_get_stored_states(self) -> List[StoredState]:
@@ -155,17 +227,81 @@ class RestoreStateData:
         return stored_states
 
     async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
-        _LOGGER.debug("Dumping states")
+        """Save the states that changed since the last dump to storage.
+
+        Changes are written to a small journal. All states are written in
+        full on the first dump of a run, once a day and when the journal has
+        grown relative to the full write.
+        """
+        await self.async_load()
+
+        now = dt_util.utcnow()
+        stored_states = self.async_get_stored_states()
+        current = {
+            stored_state.state.entity_id: stored_state for stored_state in stored_states
+        }
+        changed = [
+            stored_state
+            for entity_id, stored_state in current.items()
+            if self._written.get(entity_id) is not stored_state.state
+        ]
+        removed = [entity_id for entity_id in self._written if entity_id not in current]
+
+        journal_size = (
+            len(self._journal_states)
+            + len(self._journal_removed)
+            + len(changed)
+            + len(removed)
+        )
+        compact = (
+            self._last_compaction is None
+            or now - self._last_compaction >= COMPACT_INTERVAL
+            or journal_size > COMPACT_RATIO * self._written_in_full
+        )
+
+        if not compact and not changed and not removed:
+            _LOGGER.debug("No changed states to dump")
+            return
+
+        _LOGGER.debug(
+            "Dumping states, %s changed, %s removed", len(changed), len(removed)
+        )
+
         try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+            if compact:
+                await self.store.async_save(
+                    [stored_state.as_dict() for stored_state in stored_states]
+                )
+                self._journal_states.clear()
+                self._journal_removed.clear()
+                self._written_in_full = len(stored_states)
+                self._last_compaction = now
+            else:
+                for stored_state in changed:
+                    entity_id = stored_state.state.entity_id
+                    self._journal_states[entity_id] = stored_state
+                    self._journal_removed.pop(entity_id, None)
+
+                for entity_id in removed:
+                    self._journal_states.pop(entity_id, None)
+                    self._journal_removed[entity_id] = now
+
+            await self.journal_store.async_save(
+                {
+                    "states": [
+                        stored_state.as_dict()
+                        for stored_state in self._journal_states.values()
+                    ],
+                    "removed": self._journal_removed,
+                }
             )
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+            return
+
+        self._written = {
+            entity_id: stored_state.state for entity_id, stored_state in current.items()
+        }
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -261,6 +397,7 @@ class RestoreEntity(Entity):
             _LOGGER.warning("Cannot get last state. Entity not added to hass")
             return None
         data = await RestoreStateData.async_get_instance(self.hass)
+        await data.async_load()
         if self.entity_id not in data.last_states:
             return None
         return data.last_states[self.entity_id].state
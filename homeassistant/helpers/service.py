@@ -2,9 +2,11 @@
 import asyncio
 from functools import partial, wraps
 import logging
+from time import monotonic
 from typing import (
     TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
     Dict,
     Iterable,
@@ -41,6 +43,7 @@ from homeassistant.util.yaml.loader import JSON_TYPE
 
 if TYPE_CHECKING:
     from homeassistant.helpers.entity import Entity  # noqa
+    from homeassistant.helpers.entity_platform import EntityPlatform  # noqa
 
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -441,12 +444,16 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     if not entities:
         return
 
+    # Group the entities per platform so platforms can batch the calls and
+    # limit how many of their entities are called in parallel.
+    platform_entities: Dict[Optional["EntityPlatform"], List["Entity"]] = {}
+    for entity in entities:
+        platform_entities.setdefault(entity.platform, []).append(entity)
+
     done, pending = await asyncio.wait(
         [
-            entity.async_request_call(
-                _handle_entity_call(hass, entity, func, data, call.context)
-            )
-            for entity in entities
+            _handle_platform_call(hass, platform, batch, func, data, call.context)
+            for platform, batch in platform_entities.items()
         ]
     )
     assert not pending
@@ -462,7 +469,12 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
         # Context expires if the turn on commands took a long time.
         # Set context again so it's there when we update
         entity.async_set_context(call.context)
-        tasks.append(entity.async_update_ha_state(True))
+        tasks.append(
+            _async_limit_parallel(
+                _get_parallel_service_calls_semaphore(entity.platform),
+                entity.async_update_ha_state(True),
+            )
+        )
 
     if tasks:
         done, pending = await asyncio.wait(tasks)
@@ -471,6 +483,71 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
             future.result()  # pop exception if have
 
 
+def _get_parallel_service_calls_semaphore(
+    platform: Optional["EntityPlatform"],
+) -> Optional[asyncio.Semaphore]:
+    """Return the semaphore limiting parallel service calls of a platform."""
+    if platform is None:
+        return None
+    return platform.async_get_parallel_service_calls_semaphore()
+
+
+async def _async_limit_parallel(
+    semaphore: Optional[asyncio.Semaphore], coro: Awaitable
+) -> None:
+    """Await a coroutine while holding the semaphore, if there is one."""
+    if semaphore is None:
+        await coro
+        return
+
+    async with semaphore:
+        await coro
+
+
+async def _handle_platform_call(hass, platform, entities, func, data, context):
+    """Handle calling a service method on the entities of a single platform.
+
+    Platforms can implement async_batch_service_call to handle the call for
+    several entities with a single request. It returns the entities that still
+    have to be called one by one.
+    """
+    start = monotonic()
+
+    batch_call = None
+    if platform is not None:
+        batch_call = getattr(platform.platform, "async_batch_service_call", None)
+
+    try:
+        if batch_call is not None:
+            for entity in entities:
+                entity.async_set_context(context)
+            entities = list(await batch_call(hass, func, entities, data))
+
+        if not entities:
+            return
+
+        semaphore = _get_parallel_service_calls_semaphore(platform)
+
+        done, pending = await asyncio.wait(
+            [
+                _async_limit_parallel(
+                    semaphore,
+                    entity.async_request_call(
+                        _handle_entity_call(hass, entity, func, data, context)
+                    ),
+                )
+                for entity in entities
+            ]
+        )
+        assert not pending
+        for future in done:
+            future.result()  # pop exception if have
+
+    finally:
+        if platform is not None:
+            platform.service_call_latency.record(monotonic() - start)
+
+
 async def _handle_entity_call(hass, entity, func, data, context):
     """Handle calling service method."""
     entity.async_set_context(context)
@@ -500,6 +500,7 @@ def expand(hass: HomeAssistantType, *args: Any) -> Iterable[State]:
     """Expand out any groups into entity states."""
     search = list(args)
     found = {}
+    expanded_groups = set()
     while search:
         entity = search.pop()
         if isinstance(entity, str):
@@ -520,6 +521,10 @@ def expand(hass: HomeAssistantType, *args: Any) -> Iterable[State]:
         from homeassistant.components import group
 
         if split_entity_id(entity_id)[0] == group.DOMAIN:
+            # Guard against groups that (indirectly) contain themselves
+            if entity_id in expanded_groups:
+                continue
+            expanded_groups.add(entity_id)
             # Collect state will be called in here since it's wrapped
             group_entities = entity.attributes.get(ATTR_ENTITY_ID)
             if group_entities:
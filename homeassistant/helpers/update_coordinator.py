@@ -10,19 +10,30 @@ import aiohttp
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.util.dt import utcnow
+from homeassistant.util.latency import LatencyHistogram
 
 from .debounce import Debouncer
 
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 10
 REQUEST_REFRESH_DEFAULT_IMMEDIATE = True
 
+# Adaptive mode grows the interval by these factors after a refresh
+UNCHANGED_DATA_INTERVAL_FACTOR = 1.5
+FAILED_UPDATE_INTERVAL_FACTOR = 2
+
 
 class UpdateFailed(Exception):
     """Raised when an update has failed."""
 
 
 class DataUpdateCoordinator:
-    """Class to manage fetching data from single endpoint."""
+    """Class to manage fetching data from single endpoint.
+
+    Passing max_update_interval enables the adaptive mode. The interval then
+    grows while refreshes return unchanged data, backs off exponentially
+    while they fail and returns to update_interval when the data changes or
+    a refresh is requested.
+    """
 
     def __init__(
         self,
@@ -33,6 +44,7 @@ class DataUpdateCoordinator:
         update_interval: timedelta,
         update_method: Optional[Callable[[], Awaitable]] = None,
         request_refresh_debouncer: Optional[Debouncer] = None,
+        max_update_interval: Optional[timedelta] = None,
     ):
         """Initialize global data updater."""
         self.hass = hass
@@ -40,6 +52,9 @@ class DataUpdateCoordinator:
         self.name = name
         self.update_method = update_method
         self.update_interval = update_interval
+        self.min_update_interval = update_interval
+        self.max_update_interval = max_update_interval
+        self.refresh_latency = LatencyHistogram()
 
         self.data: Optional[Any] = None
 
@@ -115,6 +130,8 @@ class DataUpdateCoordinator:
 
         Refresh will wait a bit to see if it can batch them.
         """
+        if self.max_update_interval is not None:
+            self.update_interval = self.min_update_interval
         await self._debounced_refresh.async_call()
 
     async def _async_update_data(self) -> Optional[Any]:
@@ -130,6 +147,7 @@ class DataUpdateCoordinator:
             self._unsub_refresh = None
 
         self._debounced_refresh.async_cancel()
+        previous_data = self.data
 
         try:
             start = monotonic()
@@ -165,13 +183,29 @@ class DataUpdateCoordinator:
                 self.logger.info("Fetching %s data recovered", self.name)
 
         finally:
+            duration = monotonic() - start
+            self.refresh_latency.record(duration)
             self.logger.debug(
-                "Finished fetching %s data in %.3f seconds",
-                self.name,
-                monotonic() - start,
+                "Finished fetching %s data in %.3f seconds", self.name, duration
             )
+            if self.max_update_interval is not None:
+                self._adapt_update_interval(previous_data)
             if self._listeners:
                 self._schedule_refresh()
 
         for update_callback in self._listeners:
             update_callback()
+
+    @callback
+    def _adapt_update_interval(self, previous_data: Optional[Any]) -> None:
+        """Adapt the update interval to the result of the last refresh."""
+        assert self.max_update_interval is not None
+
+        if not self.last_update_success:
+            interval = self.update_interval * FAILED_UPDATE_INTERVAL_FACTOR
+        elif self.data == previous_data:
+            interval = self.update_interval * UNCHANGED_DATA_INTERVAL_FACTOR
+        else:
+            interval = self.min_update_interval
+
+        self.update_interval = min(interval, self.max_update_interval)
@@ -208,3 +208,142 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def mqtt_message_routing(hass):
+    """Route a million MQTT messages to 2000 discovered entities."""
+    # pylint: disable=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    from homeassistant.components import mqtt
+
+    count = 0
+    entities = 2000
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle message."""
+        nonlocal count
+        count += 1
+
+        if count == total:
+            event.set()
+
+    client = mqtt.MQTT(
+        hass,
+        broker="localhost",
+        port=1883,
+        client_id=None,
+        keepalive=60,
+        username=None,
+        password=None,
+        certificate=None,
+        client_key=None,
+        client_cert=None,
+        tls_insecure=None,
+        protocol=None,
+        will_message=None,
+        birth_message=None,
+        tls_version=None,
+    )
+
+    # Each entity subscribes to its state, availability and attributes, next
+    # to the discovery subscription and a few wildcard automations.
+    await client.async_subscribe("homeassistant/#", listener, 0)
+    await client.async_subscribe("zigbee2mqtt/+/action", listener, 0)
+    for index in range(entities):
+        for suffix in ("state", "availability", "attributes"):
+            await client.async_subscribe(
+                f"zigbee2mqtt/device_{index}/{suffix}", listener, 0
+            )
+
+    # Message mix seen from a zigbee2mqtt bridge: mostly state updates with
+    # attribute payloads, some availability, actions and discovery messages.
+    mix = (
+        ("state", b'{"state": "ON", "brightness": 254}', 6),
+        ("attributes", b'{"linkquality": 120, "battery": 97}', 2),
+        ("availability", b"online", 1),
+        ("action", b"single", 1),
+    )
+    messages = []
+    for index in range(entities):
+        for suffix, payload, repeat in mix:
+            msg = MQTTMessage(topic=f"zigbee2mqtt/device_{index}/{suffix}".encode())
+            msg.payload = payload
+            messages.extend([msg] * repeat)
+    discovery = MQTTMessage(topic=b"homeassistant/light/device_0/light/config")
+    discovery.payload = b'{"name": "device_0"}'
+    messages.append(discovery)
+
+    rounds = 10 ** 6 // len(messages) + 1
+    total = rounds * len(messages)
+
+    start = timer()
+
+    for _ in range(rounds):
+        for msg in messages:
+            # pylint: disable=protected-access
+            client._mqtt_handle_message(msg)
+
+    await event.wait()
+
+    return timer() - start
+
+
+def _statistics_samples():
+    """Return the samples of a noisy sensor."""
+    return [20 + (index * 7919 % 1000) / 100 for index in range(6000)]
+
+
+@benchmark
+async def rolling_window_statistics(hass):
+    """Update statistics over 5000 samples of a sensor a thousand times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.util.rolling import RollingWindow
+
+    samples = _statistics_samples()
+    now = dt_util.utcnow()
+    window = RollingWindow(5000)
+    for value in samples[:5000]:
+        window.append(value, now)
+
+    start = timer()
+    for value in samples[5000:]:
+        window.append(value, now)
+        (
+            window.mean,
+            window.median,
+            window.stdev,
+            window.variance,
+            window.total,
+            window.min,
+            window.max,
+        )
+    return timer() - start
+
+
+@benchmark
+async def deque_statistics(hass):
+    """Recompute statistics over a deque of 5000 samples a thousand times."""
+    # pylint: disable=import-outside-toplevel
+    from collections import deque
+    import statistics
+
+    samples = _statistics_samples()
+    states = deque(samples[:5000], maxlen=5000)
+
+    start = timer()
+    for value in samples[5000:]:
+        states.append(value)
+        (
+            statistics.mean(states),
+            statistics.median(states),
+            statistics.stdev(states),
+            statistics.variance(states),
+            sum(states),
+            min(states),
+            max(states),
+        )
+    return timer() - start
@@ -0,0 +1,86 @@
+"""Latency histogram util functions."""
+import bisect
+from typing import Any, Dict, List, Optional, Sequence
+
+# Bucket upper bounds in seconds, following the Prometheus client defaults
+# with a few extra buckets for slow cloud integrations.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class LatencyHistogram:
+    """Track the distribution of durations in fixed buckets.
+
+    Memory use is constant regardless of the number of samples, recording is
+    a bisect over the bucket bounds and percentiles are estimated from the
+    bucket counts.
+    """
+
+    __slots__ = ("buckets", "bucket_counts", "count", "total", "maximum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize the histogram."""
+        self.buckets = tuple(buckets)
+        # One extra slot for samples above the largest bucket bound
+        self.bucket_counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, duration: float) -> None:
+        """Record a duration in seconds."""
+        self.bucket_counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.maximum:
+            self.maximum = duration
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return an upper bound estimate of a percentile in seconds."""
+        if not self.count:
+            return None
+
+        threshold = self.count * percent / 100
+        cumulative = 0
+
+        for index, bucket_count in enumerate(self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= threshold and index < len(self.buckets):
+                return min(self.buckets[index], self.maximum)
+
+        return self.maximum
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a summary of the histogram."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.maximum,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+        }
+
+    def cumulative_buckets(self) -> List[Any]:
+        """Return (upper bound, cumulative count) pairs including +Inf."""
+        cumulative = 0
+        result = []
+
+        for bound, bucket_count in zip(
+            self.buckets + (float("inf"),), self.bucket_counts
+        ):
+            cumulative += bucket_count
+            result.append((bound, cumulative))
+
+        return result
@@ -2,9 +2,12 @@
 
 Can only be used by integrations that have pillow in their requirements.
 """
-from typing import Tuple
+import io
+from typing import Optional, Tuple
 
-from PIL import ImageDraw
+from PIL import Image, ImageDraw
+
+DEFAULT_JPEG_QUALITY = 75
 
 
 def draw_box(
@@ -45,3 +48,35 @@ def draw_box(
         draw.text(
             (left + line_width, abs(top - line_width - font_height)), text, fill=color
         )
+
+
+def resize_image(
+    image: bytes,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: int = DEFAULT_JPEG_QUALITY,
+) -> bytes:
+    """
+    Scale an image down to fit within a width and height.
+
+    The aspect ratio and the format of the image are kept and images are
+    never scaled up, an image that already fits is returned as is.
+
+    Raises OSError when the image can't be decoded.
+    """
+    img = Image.open(io.BytesIO(image))
+    img_width, img_height = img.size
+    width = width or img_width
+    height = height or img_height
+
+    if img_width <= width and img_height <= height:
+        return image
+
+    img_format = img.format
+    # JPEG images are decoded straight at a reduced scale
+    img.thumbnail((width, height), Image.ANTIALIAS)
+
+    options = {"quality": quality} if img_format == "JPEG" else {}
+    buf = io.BytesIO()
+    img.save(buf, img_format, optimize=True, **options)
+    return buf.getvalue()
@@ -0,0 +1,272 @@
+"""Rolling window statistics util functions."""
+from collections import Counter, deque
+from datetime import datetime, timedelta
+import heapq
+import math
+from typing import Deque, List, Optional, Tuple
+
+
+class _CompensatedSum:
+    """Running sum of floats with Neumaier compensation.
+
+    Values can be added and subtracted again without the rounding errors of
+    a plain running sum piling up.
+    """
+
+    __slots__ = ("total", "compensation")
+
+    def __init__(self) -> None:
+        """Initialize the sum."""
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value to the sum."""
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+
+    @property
+    def value(self) -> float:
+        """Return the compensated sum."""
+        return self.total + self.compensation
+
+
+class _SlidingMedian:
+    """Median of a multiset of values that supports removals.
+
+    The lower half is kept in a max heap and the upper half in a min heap.
+    Removed values are only marked and dropped once they reach the top of a
+    heap, so adding and removing a value is O(log n).
+    """
+
+    __slots__ = ("_low", "_high", "_low_size", "_high_size", "_removed")
+
+    def __init__(self) -> None:
+        """Initialize the median."""
+        self._low: List[float] = []
+        self._high: List[float] = []
+        self._low_size = 0
+        self._high_size = 0
+        self._removed: Counter = Counter()
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._balance()
+
+    def remove(self, value: float) -> None:
+        """Remove a value that was added before."""
+        self._removed[value] += 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, -1)
+        else:
+            self._high_size -= 1
+            if value == self._high[0]:
+                self._prune(self._high, 1)
+        self._balance()
+
+    @property
+    def value(self) -> Optional[float]:
+        """Return the median or None if there are no values."""
+        if not self._low_size:
+            return None
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+    def _prune(self, heap: List[float], sign: int) -> None:
+        """Drop removed values from the top of a heap."""
+        while heap:
+            value = sign * heap[0]
+            if not self._removed[value]:
+                return
+            self._removed[value] -= 1
+            if not self._removed[value]:
+                del self._removed[value]
+            heapq.heappop(heap)
+
+    def _balance(self) -> None:
+        """Keep the lower half as large as the upper half or one larger."""
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, -1)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._low_size += 1
+            self._high_size -= 1
+            self._prune(self._high, 1)
+
+
+class RollingWindow:
+    """Statistics over the most recent samples of a value.
+
+    The window holds at most max_size samples and, if max_age is set, the
+    samples of that period. Every statistic is kept up to date as samples
+    enter and leave the window instead of being computed over all samples:
+
+    - sum, mean and variance from compensated running sums of the values and
+      their squared deviations from a reference value,
+    - minimum and maximum from monotonic deques,
+    - the median from two heaps.
+
+    Adding a sample is O(log n) and reading a statistic is O(1).
+    """
+
+    def __init__(
+        self, max_size: Optional[int] = None, max_age: Optional[timedelta] = None
+    ) -> None:
+        """Initialize the window."""
+        self.max_size = max_size
+        self.max_age = max_age
+        self.values: Deque[float] = deque()
+        self.times: Deque[datetime] = deque()
+        self._sequence = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        """Reset the statistics of an empty window."""
+        self._reset_sums()
+        self._median = _SlidingMedian()
+        # Pairs of sequence number and value
+        self._minimums: Deque[Tuple[int, float]] = deque()
+        self._maximums: Deque[Tuple[int, float]] = deque()
+
+    def _reset_sums(self) -> None:
+        """Compute the running sums again from the samples in the window.
+
+        The reference value is a sample in the window, so the squared
+        deviations stay small if the values drift, like those of a meter.
+        """
+        self._shift: Optional[float] = self.values[0] if self.values else None
+        self._sum = _CompensatedSum()
+        self._shifted_sum = _CompensatedSum()
+        self._shifted_squares = _CompensatedSum()
+        self._removed = 0
+        for value in self.values:
+            self._add_to_sums(value)
+
+    def _add_to_sums(self, value: float) -> None:
+        """Add a value to the running sums."""
+        deviation = value - self._shift  # type: ignore
+        self._sum.add(value)
+        self._shifted_sum.add(deviation)
+        self._shifted_squares.add(deviation * deviation)
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self.values)
+
+    def append(self, value: float, time: datetime) -> None:
+        """Add a sample, dropping the oldest one if the window is full."""
+        if self.max_size is not None and len(self.values) >= self.max_size:
+            if not self.max_size:
+                return
+            self.popleft()
+
+        if self._shift is None:
+            self._shift = value
+
+        self.values.append(value)
+        self.times.append(time)
+        self._add_to_sums(value)
+        self._median.add(value)
+
+        sequence = self._sequence + len(self.values) - 1
+        while self._minimums and self._minimums[-1][1] >= value:
+            self._minimums.pop()
+        self._minimums.append((sequence, value))
+        while self._maximums and self._maximums[-1][1] <= value:
+            self._maximums.pop()
+        self._maximums.append((sequence, value))
+
+    def popleft(self) -> Tuple[float, datetime]:
+        """Remove and return the oldest sample."""
+        value = self.values.popleft()
+        time = self.times.popleft()
+
+        if not self.values:
+            self._sequence = 0
+            self._reset()
+            return value, time
+
+        deviation = value - self._shift  # type: ignore
+        self._sum.add(-value)
+        self._shifted_sum.add(-deviation)
+        self._shifted_squares.add(-deviation * deviation)
+        self._median.remove(value)
+
+        if self._minimums[0][0] == self._sequence:
+            self._minimums.popleft()
+        if self._maximums[0][0] == self._sequence:
+            self._maximums.popleft()
+        self._sequence += 1
+
+        # Once every sample was replaced, which keeps appending O(1) amortized
+        self._removed += 1
+        if self._removed >= len(self.values):
+            self._reset_sums()
+
+        return value, time
+
+    def purge(self, now: datetime) -> None:
+        """Remove the samples that are older than max_age."""
+        if self.max_age is None:
+            return
+        while self.times and now - self.times[0] > self.max_age:
+            self.popleft()
+
+    @property
+    def total(self) -> float:
+        """Return the sum of the samples."""
+        return self._sum.value
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean of the samples or None if there are none."""
+        if not self.values:
+            return None
+        return self._shift + self._shifted_sum.value / len(self.values)  # type: ignore
+
+    @property
+    def median(self) -> Optional[float]:
+        """Return the median of the samples or None if there are none."""
+        return self._median.value
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Return the sample variance or None if there are less than two."""
+        count = len(self.values)
+        if count < 2:
+            return None
+        shifted_sum = self._shifted_sum.value
+        squares = self._shifted_squares.value - shifted_sum * shifted_sum / count
+        return max(squares, 0.0) / (count - 1)
+
+    @property
+    def stdev(self) -> Optional[float]:
+        """Return the sample standard deviation or None if there are less than two."""
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    @property
+    def min(self) -> Optional[float]:
+        """Return the smallest sample or None if there are none."""
+        return self._minimums[0][1] if self._minimums else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """Return the largest sample or None if there are none."""
+        return self._maximums[0][1] if self._maximums else None
@@ -2,7 +2,9 @@
 import asyncio
 import base64
 import io
+import sys
 
+from PIL import Image as PILImage
 import pytest
 
 from homeassistant.components import camera
@@ -13,6 +15,7 @@ from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import ATTR_ENTITY_ID, EVENT_HOMEASSISTANT_START
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
+from homeassistant.util.pil import resize_image
 
 from tests.async_mock import PropertyMock, mock_open, patch
 from tests.components.camera import common
@@ -67,6 +70,240 @@ async def test_get_image_from_camera(hass, image_mock_url):
     assert image.content == b"Test"
 
 
+async def test_get_image_shares_fetches(hass, image_mock_url):
+    """Test concurrent and recent image requests share a single fetch."""
+    fetched = asyncio.Event()
+    calls = 0
+
+    async def mock_camera_image():
+        nonlocal calls
+        calls += 1
+        await fetched.wait()
+        return f"Image {calls}".encode()
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        side_effect=mock_camera_image,
+    ), patch(
+        "homeassistant.components.demo.camera.DemoCamera.image_cache_ttl",
+        new_callable=PropertyMock,
+        return_value=10,
+    ):
+        requests = asyncio.gather(
+            *(camera.async_get_image(hass, "camera.demo_camera") for _ in range(5))
+        )
+        await asyncio.sleep(0)
+        fetched.set()
+        images = await requests
+
+        assert calls == 1
+        assert {image.content for image in images} == {b"Image 1"}
+
+        # Served from the cache within the freshness window
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+        assert image.content == b"Image 1"
+        assert calls == 1
+
+        with patch(
+            "homeassistant.components.camera.monotonic",
+            return_value=camera.monotonic() + 10,
+        ):
+            image = await camera.async_get_image(hass, "camera.demo_camera")
+        assert image.content == b"Image 2"
+        assert calls == 2
+
+
+async def test_get_image_shared_fetch_survives_timeout(hass, image_mock_url):
+    """Test a request timing out doesn't cancel the fetch for other requests."""
+    fetched = asyncio.Event()
+
+    async def mock_camera_image():
+        await fetched.wait()
+        return b"Image"
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        side_effect=mock_camera_image,
+    ):
+        first = hass.async_create_task(
+            camera.async_get_image(hass, "camera.demo_camera", timeout=0.01)
+        )
+        second = hass.async_create_task(
+            camera.async_get_image(hass, "camera.demo_camera")
+        )
+
+        with pytest.raises(HomeAssistantError):
+            await first
+
+        fetched.set()
+        assert (await second).content == b"Image"
+
+
+async def test_get_image_from_active_stream(hass, image_mock_url):
+    """Test images are taken from the keyframes of an active stream."""
+    hass.config.components.add("stream")
+    hass.data["stream"] = {"streams": {"rtsp://camera": object()}}
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.supported_features",
+        new_callable=PropertyMock,
+        return_value=camera.SUPPORT_STREAM,
+    ), patch(
+        "homeassistant.components.demo.camera.DemoCamera.stream_source",
+        return_value="rtsp://camera",
+    ), patch(
+        "homeassistant.components.camera.async_get_keyframe_image",
+        return_value=b"Keyframe",
+    ) as mock_keyframe, patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        return_value=b"Device",
+    ) as mock_camera_image:
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+        assert image.content == b"Keyframe"
+        assert mock_keyframe.call_args[0] == (hass, "rtsp://camera")
+        assert not mock_camera_image.called
+
+        # Without a running stream worker the camera is asked
+        mock_keyframe.return_value = None
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+        assert image.content == b"Device"
+
+
+async def test_get_image_resized(hass, hass_client, image_mock_url):
+    """Test images are scaled down and renditions cached until a new frame."""
+    buf = io.BytesIO()
+    PILImage.new("RGB", (640, 480)).save(buf, "JPEG")
+    image = buf.getvalue()
+    client = await hass_client()
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        return_value=image,
+    ), patch("homeassistant.util.pil.resize_image", wraps=resize_image,) as mock_resize:
+        resp = await client.get("/api/camera_proxy/camera.demo_camera?width=320")
+        assert resp.status == 200
+        body = await resp.read()
+        assert PILImage.open(io.BytesIO(body)).size == (320, 240)
+
+        resp = await client.get("/api/camera_proxy/camera.demo_camera?width=320")
+        assert await resp.read() == body
+        assert mock_resize.call_count == 1
+
+        rendition = await camera.async_get_image(
+            hass, "camera.demo_camera", width=64, height=64
+        )
+        assert PILImage.open(io.BytesIO(rendition.content)).size == (64, 48)
+        assert mock_resize.call_count == 2
+
+        resp = await client.get("/api/camera_proxy/camera.demo_camera")
+        assert await resp.read() == image
+
+    buf = io.BytesIO()
+    PILImage.new("RGB", (640, 480), (255, 0, 0)).save(buf, "JPEG")
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        return_value=buf.getvalue(),
+    ), patch("homeassistant.util.pil.resize_image", wraps=resize_image,) as mock_resize:
+        resp = await client.get("/api/camera_proxy/camera.demo_camera?width=320")
+        assert await resp.read() != body
+        assert mock_resize.call_count == 1
+
+
+@pytest.mark.parametrize("query", ["width=0", "width=abc", "height=-1"])
+async def test_get_image_invalid_size(hass, hass_client, image_mock_url, query):
+    """Test invalid image sizes are rejected."""
+    client = await hass_client()
+
+    resp = await client.get(f"/api/camera_proxy/camera.demo_camera?{query}")
+    assert resp.status == 400
+
+
+def test_resize_image_unavailable():
+    """Test images are served unscaled when they can't be resized."""
+    with patch(
+        "homeassistant.util.pil.resize_image",
+        side_effect=PILImage.DecompressionBombError,
+    ):
+        assert camera._resize_image(b"Image", 64, 64) == b"Image"
+
+    with patch.dict(sys.modules, {"homeassistant.util.pil": None}):
+        assert camera._resize_image(b"Image", 64, 64) == b"Image"
+
+
+async def test_mjpeg_stream_shared_between_viewers(hass, hass_client, image_mock_url):
+    """Test viewers of an MJPEG stream share the image fetches."""
+    fetched = asyncio.Event()
+    calls = 0
+
+    async def mock_camera_image():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            return None
+        await fetched.wait()
+        return b"Image"
+
+    client = await hass_client()
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        side_effect=mock_camera_image,
+    ), patch(
+        "homeassistant.components.demo.camera.DemoCamera.frame_interval",
+        new_callable=PropertyMock,
+        return_value=0,
+    ):
+        first = await client.get("/api/camera_proxy_stream/camera.demo_camera")
+        second = await client.get("/api/camera_proxy_stream/camera.demo_camera")
+        fetched.set()
+
+        frame = (
+            b"--frameboundary\r\nContent-Type: image/jpeg\r\n"
+            b"Content-Length: 5\r\n\r\nImage\r\n"
+        )
+        assert await first.read() == frame * 2
+        assert await second.read() == frame * 2
+
+    assert calls == 2
+    assert hass.data[camera.DATA_STILL_STREAMS] == {}
+
+
+async def test_mjpeg_stream_drops_frames_for_slow_viewers(hass):
+    """Test a viewer that doesn't keep up only gets the latest frames."""
+    producer = camera.StillStreamProducer(
+        hass, "key", asyncio.Event().wait, "image/jpeg", 0
+    )
+    hass.data[camera.DATA_STILL_STREAMS] = {"key": producer}
+    queue = producer.async_subscribe()
+
+    for frame in (b"1", b"2", b"3"):
+        producer._async_broadcast(frame)  # pylint: disable=protected-access
+
+    assert producer.frames_dropped == 1
+    assert queue.get_nowait() == b"2"
+    assert queue.get_nowait() == b"3"
+
+    producer.async_unsubscribe(queue)
+    assert hass.data[camera.DATA_STILL_STREAMS] == {}
+
+
+async def test_websocket_image_stats(hass, hass_ws_client, mock_camera):
+    """Test the camera/image_stats websocket command."""
+    await camera.async_get_image(hass, "camera.demo_camera")
+    await camera.async_get_image(hass, "camera.demo_camera")
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "camera/image_stats"})
+    msg = await client.receive_json()
+
+    assert msg["success"]
+    stats = msg["result"]["camera.demo_camera"]
+    assert stats["requests"] == 2
+    assert stats["hit_rate"] == 0
+    assert stats["fetch_latency"]["count"] == 2
+
+
 async def test_get_stream_source_from_camera(hass, mock_camera):
     """Fetch stream source from camera entity."""
 
@@ -148,6 +385,28 @@ async def test_websocket_camera_thumbnail(hass, hass_ws_client, mock_camera):
     assert msg["result"]["content"] == base64.b64encode(b"Test").decode("utf-8")
 
 
+async def test_websocket_camera_thumbnail_undecodable(
+    hass, hass_ws_client, mock_camera
+):
+    """Test camera_thumbnail returns images it can't resize unchanged."""
+    await async_setup_component(hass, "camera", {})
+
+    client = await hass_ws_client(hass)
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "camera_thumbnail",
+            "entity_id": "camera.demo_camera",
+            "width": 320,
+        }
+    )
+
+    msg = await client.receive_json()
+
+    assert msg["success"]
+    assert msg["result"]["content"] == base64.b64encode(b"Test").decode("utf-8")
+
+
 async def test_websocket_stream_no_source(
     hass, hass_ws_client, mock_camera, mock_stream
 ):
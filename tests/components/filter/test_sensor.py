@@ -1,8 +1,11 @@
 """The test for the data filter sensor platform."""
+from copy import copy
 from datetime import timedelta
+import random
 import unittest
 
 from homeassistant.components.filter.sensor import (
+    FilterState,
     LowPassFilter,
     OutlierFilter,
     RangeFilter,
@@ -107,37 +110,31 @@ class TestFilterSensor(unittest.TestCase):
         t_3 = dt_util.utcnow() - timedelta(minutes=4)
 
         if missing:
-            fake_states = {}
+            fake_states = []
         else:
-            fake_states = {
-                "sensor.test_monitored": [
-                    ha.State("sensor.test_monitored", 18.0, last_changed=t_0),
-                    ha.State("sensor.test_monitored", "unknown", last_changed=t_1),
-                    ha.State("sensor.test_monitored", 19.0, last_changed=t_2),
-                    ha.State("sensor.test_monitored", 18.2, last_changed=t_3),
-                ]
-            }
+            fake_states = [
+                ha.State("sensor.test_monitored", 18.0, last_changed=t_0),
+                ha.State("sensor.test_monitored", "unknown", last_changed=t_1),
+                ha.State("sensor.test_monitored", 19.0, last_changed=t_2),
+                ha.State("sensor.test_monitored", 18.2, last_changed=t_3),
+            ]
 
         with patch(
-            "homeassistant.components.history.state_changes_during_period",
+            "homeassistant.components.filter.sensor.async_get_recent_states",
             return_value=fake_states,
         ):
-            with patch(
-                "homeassistant.components.history.get_last_state_changes",
-                return_value=fake_states,
-            ):
-                with assert_setup_component(1, "sensor"):
-                    assert setup_component(self.hass, "sensor", config)
-
-                for value in self.values:
-                    self.hass.states.set(config["sensor"]["entity_id"], value.state)
-                    self.hass.block_till_done()
-
-                state = self.hass.states.get("sensor.test")
-                if missing:
-                    assert "18.05" == state.state
-                else:
-                    assert "17.05" == state.state
+            with assert_setup_component(1, "sensor"):
+                assert setup_component(self.hass, "sensor", config)
+
+            for value in self.values:
+                self.hass.states.set(config["sensor"]["entity_id"], value.state)
+                self.hass.block_till_done()
+
+            state = self.hass.states.get("sensor.test")
+            if missing:
+                assert "18.05" == state.state
+            else:
+                assert "17.05" == state.state
 
     def test_chain_history_missing(self):
         """Test if filter chaining works when recorder is enabled but the source is not recorded."""
@@ -159,27 +156,21 @@ class TestFilterSensor(unittest.TestCase):
         t_1 = dt_util.utcnow() - timedelta(minutes=2)
         t_2 = dt_util.utcnow() - timedelta(minutes=3)
 
-        fake_states = {
-            "sensor.test_monitored": [
-                ha.State("sensor.test_monitored", 18.0, last_changed=t_0),
-                ha.State("sensor.test_monitored", 19.0, last_changed=t_1),
-                ha.State("sensor.test_monitored", 18.2, last_changed=t_2),
-            ]
-        }
+        fake_states = [
+            ha.State("sensor.test_monitored", 18.0, last_changed=t_0),
+            ha.State("sensor.test_monitored", 19.0, last_changed=t_1),
+            ha.State("sensor.test_monitored", 18.2, last_changed=t_2),
+        ]
         with patch(
-            "homeassistant.components.history.state_changes_during_period",
+            "homeassistant.components.filter.sensor.async_get_recent_states",
             return_value=fake_states,
         ):
-            with patch(
-                "homeassistant.components.history.get_last_state_changes",
-                return_value=fake_states,
-            ):
-                with assert_setup_component(1, "sensor"):
-                    assert setup_component(self.hass, "sensor", config)
+            with assert_setup_component(1, "sensor"):
+                assert setup_component(self.hass, "sensor", config)
 
-                self.hass.block_till_done()
-                state = self.hass.states.get("sensor.test")
-                assert "18.0" == state.state
+            self.hass.block_till_done()
+            state = self.hass.states.get("sensor.test")
+            assert "18.0" == state.state
 
     def test_outlier(self):
         """Test if outlier filter works."""
@@ -303,3 +294,69 @@ class TestFilterSensor(unittest.TestCase):
         for state in self.values:
             filtered = filt.filter_state(state)
         assert 21.5 == filtered.state
+
+    def test_batch_equivalence(self):
+        """Test filtering batches gives the same results as single states."""
+
+        def chain():
+            return [
+                RangeFilter(entity=None, precision=2, lower_bound=5, upper_bound=40),
+                OutlierFilter(window_size=4, precision=2, entity=None, radius=6.0),
+                LowPassFilter(
+                    window_size=10, precision=1, entity=None, time_constant=4
+                ),
+                TimeSMAFilter(
+                    window_size=timedelta(minutes=5),
+                    precision=2,
+                    entity=None,
+                    type="last",
+                ),
+                TimeThrottleFilter(
+                    window_size=timedelta(minutes=2), precision=None, entity=None
+                ),
+                ThrottleFilter(window_size=2, precision=0, entity=None),
+            ]
+
+        rng = random.Random(0)
+        timestamp = dt_util.utcnow()
+        states = []
+        for _ in range(300):
+            value = rng.choice([rng.uniform(0, 50), rng.randint(18, 22), "error"])
+            states.append(
+                ha.State("sensor.test_monitored", value, last_updated=timestamp)
+            )
+            timestamp += timedelta(seconds=rng.randint(1, 90))
+
+        single_filters = chain()
+        single = []
+        for state in states:
+            temp_state = state
+            try:
+                for filt in single_filters:
+                    temp_state = filt.filter_state(copy(temp_state))
+                    if filt.skip_processing:
+                        break
+                else:
+                    single.append((temp_state.last_updated, temp_state.state))
+            except ValueError:
+                pass
+
+        batch_filters = chain()
+        batch = []
+        index = 0
+        while index < len(states):
+            size = rng.randint(1, 50)
+            filtered_states = [
+                FilterState(state) for state in states[index : index + size]
+            ]
+            index += size
+            for filt in batch_filters:
+                filtered_states = filt.filter_states(filtered_states)
+            batch.extend((fstate.timestamp, fstate.state) for fstate in filtered_states)
+
+        assert len(single) > 10
+        assert batch == single
+        for single_filter, batch_filter in zip(single_filters, batch_filters):
+            assert [repr(state) for state in batch_filter.states] == [
+                repr(state) for state in single_filter.states
+            ]
@@ -485,3 +485,48 @@ async def test_service_group_set_group_remove_group(hass):
 
     group_state = hass.states.get("group.user_test_group")
     assert group_state is None
+
+
+async def test_expand_entity_ids_nested_groups(hass):
+    """Test expanding nested groups follows membership changes."""
+    hass.states.async_set("group.inner", "on", {"entity_id": ["light.a", "light.b"]})
+    hass.states.async_set(
+        "group.outer", "on", {"entity_id": ["group.inner", "light.b", "light.c"]}
+    )
+
+    assert group.expand_entity_ids(hass, ["group.outer"]) == [
+        "light.a",
+        "light.b",
+        "light.c",
+    ]
+    # Served from the membership cache
+    assert group.expand_entity_ids(hass, ["group.outer"]) == [
+        "light.a",
+        "light.b",
+        "light.c",
+    ]
+
+    hass.states.async_set("group.inner", "on", {"entity_id": ["light.d"]})
+
+    assert group.expand_entity_ids(hass, ["group.outer"]) == [
+        "light.d",
+        "light.b",
+        "light.c",
+    ]
+
+    hass.states.async_remove("group.inner")
+
+    assert group.expand_entity_ids(hass, ["group.outer"]) == ["light.b", "light.c"]
+
+
+async def test_expand_entity_ids_group_cycle(hass, caplog):
+    """Test expanding groups that contain each other."""
+    hass.states.async_set("group.one", "on", {"entity_id": ["group.two", "light.a"]})
+    hass.states.async_set("group.two", "on", {"entity_id": ["group.one", "light.b"]})
+
+    assert group.expand_entity_ids(hass, ["group.one"]) == ["light.b", "light.a"]
+    assert "group.one -> group.two -> group.one" in caplog.text
+
+    caplog.clear()
+    assert group.expand_entity_ids(hass, ["group.one"]) == ["light.b", "light.a"]
+    assert "membership cycle" not in caplog.text
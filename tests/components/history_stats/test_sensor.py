@@ -6,7 +6,10 @@ import unittest
 import pytest
 import pytz
 
-from homeassistant.components.history_stats.sensor import HistoryStatsSensor
+from homeassistant.components.history_stats.sensor import (
+    HistoryStatsSensor,
+    HistoryStatsWindow,
+)
 from homeassistant.const import STATE_UNKNOWN
 import homeassistant.core as ha
 from homeassistant.helpers.template import Template
@@ -151,6 +154,80 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_measure_incremental(self):
+        """Test the history is only loaded once and changes are applied."""
+        t0 = dt_util.utcnow() - timedelta(minutes=40)
+
+        fake_states = {
+            "binary_sensor.test_id": [
+                ha.State("binary_sensor.test_id", "on", last_changed=t0),
+            ]
+        }
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "count", "test"
+        )
+
+        with patch(
+            "homeassistant.components.history.state_changes_during_period",
+            return_value=fake_states,
+        ) as mock_changes, patch(
+            "homeassistant.components.history.get_state", return_value=None
+        ):
+            sensor.update()
+            assert sensor.state == 1
+
+            # Already loaded from the database
+            sensor._pending.append((t0.timestamp(), True))
+            t1 = t0 + timedelta(minutes=20)
+            t2 = t1 + timedelta(minutes=10)
+            sensor._pending.append((t1.timestamp(), False))
+            sensor._pending.append((t2.timestamp(), True))
+            sensor.update()
+
+        assert mock_changes.call_count == 1
+        assert sensor.state == 2
+        # On for 20 minutes until t1 and 10 minutes since t2
+        assert round(sensor.value, 2) == 0.5
+
+    def test_measure_matching_start_state(self):
+        """Test a matching state at the start counts as entered once."""
+        t0 = dt_util.utcnow() - timedelta(minutes=60)
+        t1 = t0 + timedelta(minutes=30)
+        start_state = ha.State("binary_sensor.test_id", "on", last_changed=t0)
+
+        fake_states = {
+            "binary_sensor.test_id": [
+                start_state,
+                ha.State("binary_sensor.test_id", "off", last_changed=t1),
+            ]
+        }
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor1 = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "count", "test"
+        )
+        sensor2 = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "time", "test"
+        )
+
+        with patch(
+            "homeassistant.components.history.state_changes_during_period",
+            return_value=fake_states,
+        ), patch(
+            "homeassistant.components.history.get_state", return_value=start_state
+        ):
+            sensor1.update()
+            sensor2.update()
+
+        assert sensor1.state == 1
+        assert sensor2.state == 0.5
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template("{{ now() }}", self.hass)
@@ -257,3 +334,25 @@ class TestHistoryStatsSensor(unittest.TestCase):
         """Initialize the recorder."""
         init_recorder_component(self.hass)
         self.hass.start()
+
+
+def test_window_advance():
+    """Test moving the start of the window forward."""
+    window = HistoryStatsWindow(0, False)
+    window.add(10, True)
+    window.add(20, False)
+    window.add(30, True)
+    window.add(30, False)
+
+    assert window.measure(40) == (20, 2)
+    # Changes after the end are excluded
+    assert window.measure(25) == (10, 1)
+
+    window.advance(15)
+    # Being on at the start counts once
+    assert window.measure(40) == (15, 2)
+
+    window.advance(35)
+    assert window.measure(40) == (5, 1)
+    assert window.start == 35
+    assert window.matches
@@ -1,5 +1,7 @@
 """The tests for the InfluxDB component."""
 import datetime
+import gzip
+import os
 import unittest
 from unittest import mock
 
@@ -718,13 +720,18 @@ class TestInfluxDB(unittest.TestCase):
         assert mock_client.return_value.write_points.call_count == 2
         mock_client.return_value.write_points.assert_called_with(json_data)
 
-        # Write works again
+        # Write works again, the failed write is written after it
         mock_client.return_value.write_points.side_effect = None
         with mock.patch.object(influxdb.time, "sleep") as mock_sleep:
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert not mock_sleep.called
-        assert mock_client.return_value.write_points.call_count == 3
+        assert mock_client.return_value.write_points.call_count == 4
+        mock_client.return_value.write_points.assert_called_with(
+            ["entity.id,domain=fake,entity_id=entity value=1.0 12345"], protocol="line"
+        )
+        assert self.hass.data[influxdb.DOMAIN].backlog_points == 0
+        assert self.hass.data[influxdb.DOMAIN].written == 2
 
     def test_queue_backlog_full(self, mock_client):
         """Test the event listener to drop old events."""
@@ -756,3 +763,89 @@ class TestInfluxDB(unittest.TestCase):
             assert mock_client.return_value.write_points.call_count == 0
 
         mock_client.return_value.write_points.reset_mock()
+
+    def test_spill_to_disk(self, mock_client):
+        """Test failed writes are spilled to disk once the backlog is full."""
+        self._setup(mock_client)
+        instance = self.hass.data[influxdb.DOMAIN]
+
+        state = mock.MagicMock(
+            state=1,
+            domain="fake",
+            entity_id="entity.id",
+            object_id="entity",
+            attributes={},
+        )
+        event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+        mock_client.return_value.write_points.side_effect = IOError("foo")
+
+        with mock.patch.object(influxdb, "BACKLOG_MAX_POINTS", 1):
+            self.handler_method(event)
+            instance.block_till_done()
+            self.handler_method(event)
+            instance.block_till_done()
+
+        assert instance.backlog_points == 1
+        assert instance.spilled_points == 1
+        assert os.path.exists(instance.spill_path)
+
+        mock_client.return_value.write_points.side_effect = None
+        mock_client.return_value.write_points.reset_mock()
+        self.handler_method(event)
+        instance.block_till_done()
+
+        # The new event, the backlog and the spilled event
+        assert mock_client.return_value.write_points.call_count == 3
+        assert instance.backlog_points == 0
+        assert instance.spilled_points == 0
+        assert instance.written == 3
+        assert not os.path.exists(instance.spill_path)
+
+    def test_spill_full(self, mock_client):
+        """Test events are dropped when the spill file is full."""
+        self._setup(mock_client)
+        instance = self.hass.data[influxdb.DOMAIN]
+
+        state = mock.MagicMock(
+            state=1,
+            domain="fake",
+            entity_id="entity.id",
+            object_id="entity",
+            attributes={},
+        )
+        event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+        mock_client.return_value.write_points.side_effect = IOError("foo")
+
+        with mock.patch.object(influxdb, "BACKLOG_MAX_POINTS", 0), mock.patch.object(
+            influxdb, "SPILL_MAX_BYTES", 0
+        ):
+            self.handler_method(event)
+            instance.block_till_done()
+
+        assert instance.dropped == 1
+        assert not os.path.exists(instance.spill_path)
+
+    def test_gzip(self, mock_client):
+        """Test writing gzip compressed line protocol."""
+        self._setup(mock_client, gzip=True)
+
+        state = mock.MagicMock(
+            state=1,
+            domain="fake",
+            entity_id="entity.id",
+            object_id="entity",
+            attributes={},
+        )
+        event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+        self.handler_method(event)
+        self.hass.data[influxdb.DOMAIN].block_till_done()
+
+        assert not mock_client.return_value.write_points.called
+        assert mock_client.return_value.request.call_count == 1
+        kwargs = mock_client.return_value.request.call_args[1]
+        assert kwargs["params"] == {"db": "home_assistant"}
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert (
+            gzip.decompress(kwargs["data"])
+            == b"entity.id,domain=fake,entity_id=entity value=1.0 12345\n"
+        )
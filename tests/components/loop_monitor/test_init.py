@@ -0,0 +1,68 @@
+"""Test the event loop monitor."""
+import asyncio
+import time
+
+from homeassistant.components.loop_monitor import DOMAIN, _integration_from_module
+from homeassistant.core import callback
+from homeassistant.setup import async_setup_component
+
+
+async def _wait_for_stall(hass):
+    """Wait until the monitor stored a stall."""
+    for _ in range(50):
+        if hass.data[DOMAIN].stalls:
+            return
+        await asyncio.sleep(0.01)
+
+
+async def test_stall_is_recorded(hass, hass_ws_client):
+    """Test a blocking callback is reported with the dispatched event."""
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {"threshold": 0.05, "interval": 0.01}}
+    )
+
+    @callback
+    def blocking_listener(event):
+        """Block the event loop."""
+        time.sleep(0.3)
+
+    hass.bus.async_listen("test_event", blocking_listener)
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    await _wait_for_stall(hass)
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "loop_monitor/report"})
+    msg = await client.receive_json()
+
+    assert msg["success"]
+    report = msg["result"]
+    assert report["lag"]["count"] > 0
+    assert len(report["stalls"]) == 1
+
+    stall = report["stalls"][0]
+    assert stall["callback"].endswith("blocking_listener")
+    assert stall["event_type"] == "test_event"
+    assert stall["integration"] is None
+    assert stall["duration"] >= 0.05
+    assert any("time.sleep(0.3)" in line for line in stall["stack"])
+
+
+async def test_no_stall_without_blocking(hass):
+    """Test nothing is recorded when the loop is responsive."""
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {"threshold": 0.2, "interval": 0.01}}
+    )
+
+    await asyncio.sleep(0.1)
+
+    assert hass.data[DOMAIN].lag.count > 0
+    assert not hass.data[DOMAIN].stalls
+
+
+def test_integration_from_module():
+    """Test mapping modules to integrations."""
+    assert _integration_from_module("homeassistant.components.hue.light") == "hue"
+    assert _integration_from_module("custom_components.my_lights") == "my_lights"
+    assert _integration_from_module("homeassistant.core") is None
+    assert _integration_from_module(None) is None
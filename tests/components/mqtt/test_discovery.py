@@ -11,6 +11,7 @@ from homeassistant.components.mqtt.abbreviations import (
 )
 from homeassistant.components.mqtt.discovery import ALREADY_DISCOVERED, async_start
 from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.helpers.entity_platform import EntityPlatform
 
 from tests.async_mock import AsyncMock, patch
 from tests.common import (
@@ -240,6 +241,79 @@ async def test_non_duplicate_discovery(hass, mqtt_mock, caplog):
     assert "Component has already been discovered: binary_sensor bla" in caplog.text
 
 
+async def test_unchanged_discovery_is_not_parsed(hass, mqtt_mock, caplog):
+    """Test a replayed config is skipped without parsing it."""
+    entry = MockConfigEntry(domain=mqtt.DOMAIN)
+
+    await async_start(hass, "homeassistant", {}, entry)
+
+    config = '{ "name": "Beer", "state_topic": "test-topic" }'
+    async_fire_mqtt_message(hass, "homeassistant/binary_sensor/bla/config", config)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.beer") is not None
+
+    with patch(
+        "homeassistant.components.mqtt.discovery.json.loads"
+    ) as mock_loads, patch(
+        "homeassistant.components.mqtt.discovery.async_dispatcher_send"
+    ) as mock_dispatcher_send:
+        async_fire_mqtt_message(hass, "homeassistant/binary_sensor/bla/config", config)
+        await hass.async_block_till_done()
+
+    assert not mock_loads.called
+    assert not mock_dispatcher_send.called
+    assert (
+        "Component has already been discovered: binary_sensor bla, config unchanged"
+        in caplog.text
+    )
+
+    # A changed config is still sent as update
+    async_fire_mqtt_message(
+        hass,
+        "homeassistant/binary_sensor/bla/config",
+        '{ "name": "Milk", "state_topic": "test-topic" }',
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.beer").name == "Milk"
+
+
+async def test_discovery_batch(hass, mqtt_mock):
+    """Test components discovered together are added in one batch."""
+    entry = MockConfigEntry(domain=mqtt.DOMAIN)
+
+    await async_start(hass, "homeassistant", {}, entry)
+
+    with patch.object(
+        EntityPlatform,
+        "_async_schedule_add_entities",
+        autospec=True,
+        side_effect=EntityPlatform._async_schedule_add_entities,
+    ) as mock_add_entities:
+        for name in ("beer", "milk", "wine"):
+            async_fire_mqtt_message(
+                hass,
+                f"homeassistant/binary_sensor/{name}/config",
+                f'{{ "name": "{name}", "state_topic": "test-topic" }}',
+            )
+        # Removed again before being set up
+        async_fire_mqtt_message(hass, "homeassistant/binary_sensor/wine/config", "")
+        # Invalid config doesn't prevent the others from being added
+        async_fire_mqtt_message(
+            hass, "homeassistant/binary_sensor/water/config", '{ "name": "water" }'
+        )
+        await hass.async_block_till_done()
+
+    assert mock_add_entities.call_count == 1
+    assert hass.states.get("binary_sensor.beer") is not None
+    assert hass.states.get("binary_sensor.milk") is not None
+    assert hass.states.get("binary_sensor.wine") is None
+    assert hass.states.get("binary_sensor.water") is None
+    assert set(hass.data[ALREADY_DISCOVERED]) == {
+        ("binary_sensor", "beer"),
+        ("binary_sensor", "milk"),
+    }
+
+
 async def test_removal(hass, mqtt_mock, caplog):
     """Test removal of component through empty discovery message."""
     entry = MockConfigEntry(domain=mqtt.DOMAIN)
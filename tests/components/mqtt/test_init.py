@@ -1,9 +1,11 @@
 """The tests for the MQTT component."""
+import asyncio
 from datetime import datetime, timedelta
 import json
 import ssl
 import unittest
 
+from paho.mqtt.client import MQTTMessage
 import pytest
 import voluptuous as vol
 
@@ -344,6 +346,20 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.block_till_done()
         assert len(self.calls) == 1
 
+    def test_subscriptions_get_payload_in_their_encoding(self):
+        """Test subscriptions sharing a topic get the payload they asked for."""
+        mqtt.subscribe(self.hass, "test-topic/+", self.record_calls)
+        mqtt.subscribe(self.hass, "test-topic/#", self.record_calls)
+        mqtt.subscribe(self.hass, "test-topic/bier", self.record_calls, encoding=None)
+
+        fire_mqtt_message(self.hass, "test-topic/bier", b"test-payload")
+
+        self.hass.block_till_done()
+        payloads = [call[0].payload for call in self.calls]
+        assert len(payloads) == 3
+        assert payloads.count("test-payload") == 2
+        assert payloads.count(b"test-payload") == 1
+
     def test_subscribe_topic(self):
         """Test the subscription of a topic."""
         unsub = mqtt.subscribe(self.hass, "test-topic", self.record_calls)
@@ -649,7 +665,7 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.data["mqtt"]._mqtt_on_connect(None, None, None, 0)
         self.hass.block_till_done()
 
-        expected.append(call("test/state", 1))
+        expected.append(call([("test/state", 1)]))
         assert self.hass.data["mqtt"]._mqttc.subscribe.mock_calls == expected
 
 
@@ -812,8 +828,122 @@ async def test_mqtt_subscribes_topics_on_connect(hass):
     assert mqtt_client.disconnect.call_count == 0
 
     expected = {"topic/test": 0, "home/sensor": 2, "still/pending": 1}
-    calls = {call[1][1]: call[1][2] for call in hass.add_job.mock_calls}
-    assert calls == expected
+    assert len(hass.add_job.mock_calls) == 1
+    assert dict(hass.add_job.mock_calls[0][1][1]) == expected
+
+
+async def test_resubscribe_in_chunks(hass):
+    """Test topics are resubscribed with multi-topic packets of bounded size."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    mqtt_client.subscribe.reset_mock()
+    topic_count = 500
+
+    for index in range(topic_count):
+        await mqtt.async_subscribe(hass, f"home/sensor_{index:03}/state", None)
+
+    hass.data["mqtt"]._mqtt_on_connect(None, None, 0, 0)
+    await hass.async_block_till_done()
+
+    chunks = [call[1][0] for call in mqtt_client.subscribe.mock_calls]
+    assert len(chunks) > 1
+    assert sum(len(chunk) for chunk in chunks) == topic_count
+    for chunk in chunks:
+        assert (
+            sum(len(topic) + 3 for topic, _ in chunk) <= mqtt.MAX_SUBSCRIBE_PAYLOAD_SIZE
+        )
+
+
+async def test_subscribe_round_trip_time(hass):
+    """Test the subscribe round-trip time is measured."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    mqtt_data = hass.data["mqtt"]
+    mqtt_data.connected = True
+
+    mqtt_client.subscribe.return_value = (0, 1)
+    await mqtt.async_subscribe(hass, "test-topic", None)
+    await hass.async_block_till_done()
+    assert mqtt_data.subscribe_rtt.count == 0
+    mqtt_data._mqtt_on_subscribe(None, None, 1, (0,))
+    assert mqtt_data.subscribe_rtt.count == 1
+
+    # SUBACK handled by the paho thread before subscribe returned
+    def subscribe_acked_early(*args):
+        mqtt_data._mqtt_on_subscribe(None, None, 2, (0,))
+        return (0, 2)
+
+    mqtt_client.subscribe.side_effect = subscribe_acked_early
+    await mqtt.async_subscribe(hass, "other-topic", None)
+    await hass.async_block_till_done()
+    assert mqtt_data.subscribe_rtt.count == 2
+
+    info = await mqtt.system_health_info(hass)
+    assert info["connected"]
+    assert info["pending_publishes"] == 0
+    assert info["subscribe_rtt_p99"] is not None
+
+
+async def test_publish_batches(hass):
+    """Test publishes are handed to paho in batches by a single task."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    mqtt_data = hass.data["mqtt"]
+    mqtt_client.publish.reset_mock()
+    mqtt_client.publish.side_effect = [None, ValueError("bad payload"), None]
+
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_executor_job:
+        results = asyncio.gather(
+            mqtt_data.async_publish("test/1", "payload", 0, False),
+            mqtt_data.async_publish("test/2", "payload", 1, False),
+            mqtt_data.async_publish("test/3", "payload", 2, True),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(0)
+        assert mqtt_data.pending_publishes == 3
+        results = await results
+
+    assert mock_executor_job.call_count == 1
+    assert isinstance(results[1], ValueError)
+    assert results[0] is None and results[2] is None
+    assert mqtt_client.publish.mock_calls == [
+        call("test/1", "payload", 0, False),
+        call("test/2", "payload", 1, False),
+        call("test/3", "payload", 2, True),
+    ]
+    assert mqtt_data.pending_publishes == 0
+
+
+async def test_publish_task_failure(hass):
+    """Test publishers are not left waiting when the publish task fails."""
+    await async_mock_mqtt_client(hass)
+    mqtt_data = hass.data["mqtt"]
+
+    with patch.object(
+        hass, "async_add_executor_job", side_effect=RuntimeError("shut down")
+    ):
+        results = await asyncio.gather(
+            mqtt_data.async_publish("test/1", "payload", 0, False),
+            mqtt_data.async_publish("test/2", "payload", 0, False),
+            return_exceptions=True,
+        )
+
+    assert [str(result) for result in results] == ["shut down", "shut down"]
+    assert mqtt_data.pending_publishes == 0
+    print("PART1 OK", flush=True)
+    return
+
+    # Cancelled while waiting for the paho lock
+    async with mqtt_data._paho_lock:
+        publish = asyncio.gather(
+            mqtt_data.async_publish("test/1", "payload", 0, False),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(0)
+        mqtt_data._publish_task.cancel()
+        results = await publish
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert mqtt_data.pending_publishes == 0
 
 
 async def test_setup_fails_without_config(hass):
@@ -841,6 +971,50 @@ async def test_message_callback_exception_gets_logged(hass, caplog):
     )
 
 
+async def test_received_messages_are_handled_in_batches(hass):
+    """Test a burst of messages wakes up the loop once and is handled in batches."""
+    await async_mock_mqtt_client(hass)
+    calls = []
+
+    @callback
+    def record_calls(msg):
+        """Record calls."""
+        calls.append(msg)
+
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+
+    with patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as mock_call_soon_threadsafe:
+        for index in range(mqtt.MAX_MESSAGES_PER_ITERATION * 2 + 1):
+            msg = MQTTMessage(topic=b"test-topic")
+            msg.payload = str(index).encode()
+            hass.data["mqtt"]._mqtt_on_message(None, None, msg)
+
+    assert mock_call_soon_threadsafe.call_count == 1
+    assert len(calls) == 0
+
+    await asyncio.sleep(0)
+    assert len(calls) == mqtt.MAX_MESSAGES_PER_ITERATION
+
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(calls) == mqtt.MAX_MESSAGES_PER_ITERATION * 2 + 1
+    assert [msg.payload for msg in calls[:3]] == ["0", "1", "2"]
+
+    # The buffer was drained, the next message wakes up the loop again
+    with patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as mock_call_soon_threadsafe:
+        msg = MQTTMessage(topic=b"test-topic")
+        msg.payload = b"last"
+        hass.data["mqtt"]._mqtt_on_message(None, None, msg)
+
+    assert mock_call_soon_threadsafe.call_count == 1
+    await asyncio.sleep(0)
+    assert calls[-1].payload == "last"
+
+
 async def test_mqtt_ws_subscription(hass, hass_ws_client):
     """Test MQTT websocket subscription."""
     await async_mock_mqtt_component(hass)
@@ -0,0 +1,69 @@
+"""The tests for the MQTT topic trie."""
+import pytest
+
+from homeassistant.components.mqtt.topic_trie import TopicTrie
+
+
+@pytest.mark.parametrize(
+    "topic_filter, topic, matches",
+    [
+        ("test/topic", "test/topic", True),
+        ("test/topic", "test/other", False),
+        ("test/topic", "test/topic/sub", False),
+        ("test/+/state", "test/kitchen/state", True),
+        ("test/+/state", "test//state", True),
+        ("test/+/state", "test/kitchen/attributes", False),
+        ("test/+", "test", False),
+        ("test/#", "test", True),
+        ("test/#", "test/kitchen/state", True),
+        ("test/#", "other/kitchen", False),
+        ("#", "test/kitchen", True),
+        ("+/+", "test/kitchen", True),
+        ("#", "$SYS/broker", False),
+        ("+/broker", "$SYS/broker", False),
+        ("$SYS/#", "$SYS/broker/uptime", True),
+        ("$SYS/+/uptime", "$SYS/broker/uptime", True),
+    ],
+)
+def test_match(topic_filter, topic, matches):
+    """Test topic filters are matched like the broker does."""
+    trie = TopicTrie()
+    trie.add(topic_filter, "value")
+    assert trie.match(topic) == (["value"] if matches else [])
+
+
+def test_match_multiple_filters():
+    """Test all filters matching a topic are returned."""
+    trie = TopicTrie()
+    trie.add("home/kitchen/state", 1)
+    trie.add("home/kitchen/state", 2)
+    trie.add("home/+/state", 3)
+    trie.add("home/#", 4)
+    trie.add("home/living_room/state", 5)
+
+    assert sorted(trie.match("home/kitchen/state")) == [1, 2, 3, 4]
+    assert sorted(trie.match("home/living_room/state")) == [3, 4, 5]
+    assert trie.match("home") == [4]
+
+
+def test_remove():
+    """Test removing values and pruning empty levels."""
+    trie = TopicTrie()
+    trie.add("home/kitchen/state", 1)
+    trie.add("home/kitchen/state", 2)
+    trie.add("home/#", 3)
+
+    trie.remove("home/kitchen/state", 1)
+    assert sorted(trie.match("home/kitchen/state")) == [2, 3]
+
+    trie.remove("home/kitchen/state", 2)
+    assert trie.match("home/kitchen/state") == [3]
+    # pylint: disable=protected-access
+    assert list(trie._root.children["home"].children) == ["#"]
+
+    trie.remove("home/#", 3)
+    assert trie.match("home/kitchen/state") == []
+    assert trie._root.children == {}
+
+    with pytest.raises(KeyError):
+        trie.remove("home/#", 3)
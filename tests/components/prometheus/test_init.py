@@ -65,6 +65,9 @@ async def prometheus_client(loop, hass, hass_client):
     sensor5.entity_id = "sensor.sps30_pm_1um_weight_concentration"
     await sensor5.async_update_ha_state()
 
+    hass.services.async_register("test_domain", "test_service", lambda call: None)
+    await hass.services.async_call("test_domain", "test_service", blocking=True)
+
     return await hass_client()
 
 
@@ -138,3 +141,74 @@ async def test_view(prometheus_client):  # pylint: disable=redefined-outer-name
         'entity="sensor.sps30_pm_1um_weight_concentration",'
         'friendly_name="SPS30 PM <1µm Weight concentration"} 3.7069' in body
     )
+
+    assert (
+        'service_call_duration_seconds_count{domain="test_domain",'
+        'service="test_service"} 1.0' in body
+    )
+
+    assert (
+        'service_call_errors_total{domain="test_domain",'
+        'service="test_service"} 0.0' in body
+    )
+
+
+async def test_view_filter_names(
+    hass, prometheus_client
+):  # pylint: disable=redefined-outer-name
+    """Test the view only returns the metrics requested with name[]."""
+    resp = await prometheus_client.get(
+        f"{prometheus.API_ENDPOINT}?name[]=power_kwh&name[]=python_info"
+    )
+
+    assert resp.status == 200
+    body = await resp.text()
+
+    assert "# HELP python_info Python platform information" in body
+    assert (
+        'power_kwh{domain="sensor",'
+        'entity="sensor.radio_energy",'
+        'friendly_name="Radio Energy"} 14.0' in body
+    )
+    assert "sensor_unit_kwh" not in body
+    assert "service_call_duration_seconds" not in body
+    assert "python_gc" not in body
+
+
+async def test_view_renders_changed_metrics(
+    hass, prometheus_client
+):  # pylint: disable=redefined-outer-name
+    """Test metrics are rendered again after a state change."""
+    resp = await prometheus_client.get(prometheus.API_ENDPOINT)
+    body = await resp.text()
+    assert (
+        'sensor_unit_kwh{domain="sensor",'
+        'entity="sensor.television_energy",'
+        'friendly_name="Television Energy"} 74.0' in body
+    )
+
+    hass.states.async_set(
+        "sensor.television_energy",
+        75,
+        {"friendly_name": "Television Energy", "unit_of_measurement": "kWh"},
+    )
+    await hass.async_block_till_done()
+
+    resp = await prometheus_client.get(prometheus.API_ENDPOINT)
+    body = await resp.text()
+    assert (
+        'sensor_unit_kwh{domain="sensor",'
+        'entity="sensor.television_energy",'
+        'friendly_name="Television Energy"} 75.0' in body
+    )
+
+
+async def test_view_gzip(prometheus_client):  # pylint: disable=redefined-outer-name
+    """Test the response is compressed if the scraper accepts it."""
+    resp = await prometheus_client.get(
+        prometheus.API_ENDPOINT, headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert resp.status == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "# HELP python_info Python platform information" in await resp.text()
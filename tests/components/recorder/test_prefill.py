@@ -0,0 +1,156 @@
+"""Test loading recent states of many entities together."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.components.recorder import prefill
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.prefill import async_get_recent_states
+from homeassistant.util import dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.async_mock import patch
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def _record_states(hass, entity_ids, values):
+    """Record the values as states of the entities, one value per second."""
+    now = dt_util.utcnow()
+    for index, value in enumerate(values):
+        for entity_id in entity_ids:
+            with patch(
+                "homeassistant.core.dt_util.utcnow",
+                return_value=now + timedelta(seconds=index),
+            ):
+                hass.states.set(entity_id, value)
+            # Only an attribute changes
+            with patch(
+                "homeassistant.core.dt_util.utcnow",
+                return_value=now + timedelta(seconds=index, milliseconds=500),
+            ):
+                hass.states.set(entity_id, value, {"index": index})
+    wait_recording_done(hass)
+    return now
+
+
+def _get_recent_states(hass, requests):
+    """Run requests concurrently and return their states."""
+
+    async def gather():
+        return await asyncio.gather(
+            *(async_get_recent_states(hass, **request) for request in requests)
+        )
+
+    return asyncio.run_coroutine_threadsafe(gather(), hass.loop).result()
+
+
+def test_batched_requests(hass_recorder):
+    """Test concurrent requests are loaded together."""
+    hass = hass_recorder()
+    entity_ids = [f"sensor.test_{index}" for index in range(3)]
+    start = _record_states(hass, entity_ids, ["1", "2", "3", "4"])
+
+    with patch.object(
+        prefill, "_load_requests", wraps=prefill._load_requests
+    ) as load_requests:
+        results = _get_recent_states(
+            hass,
+            [
+                {"entity_id": "sensor.test_0", "number_of_states": 3},
+                {
+                    "entity_id": "sensor.test_1",
+                    "number_of_states": 2,
+                    "state_changes_only": True,
+                },
+                {
+                    "entity_id": "sensor.test_2",
+                    "start_time": start + timedelta(seconds=2),
+                    "state_changes_only": True,
+                },
+                {
+                    "entity_id": "sensor.test_2",
+                    "start_time": start + timedelta(seconds=1),
+                    "number_of_states": 3,
+                },
+                {"entity_id": "sensor.unknown", "number_of_states": 3},
+            ],
+        )
+
+    assert load_requests.call_count == 1
+    assert [[state.state for state in states] for states in results] == [
+        ["3", "4", "4"],
+        ["3", "4"],
+        ["3", "4"],
+        ["3", "4", "4"],
+        [],
+    ]
+    assert results[0][-1].attributes == {"index": 3}
+    assert results[1][-1].attributes == {}
+
+
+def test_include_start_state(hass_recorder):
+    """Test the state at the start time is returned first."""
+    hass = hass_recorder()
+    start = _record_states(hass, ["sensor.test"], ["1", "2", "3"])
+    start_time = start + timedelta(seconds=1, milliseconds=750)
+
+    states = _get_recent_states(
+        hass,
+        [
+            {
+                "entity_id": "sensor.test",
+                "start_time": start_time,
+                "state_changes_only": True,
+                "include_start_state": True,
+            }
+        ],
+    )[0]
+
+    assert [state.state for state in states] == ["2", "3"]
+    assert [state.attributes for state in states] == [{"index": 1}, {}]
+    assert states[0].last_updated == start_time
+
+
+def test_limit_applied_by_database(hass_recorder):
+    """Test windows since a start time are limited in the query."""
+    hass = hass_recorder()
+    start = _record_states(hass, ["sensor.test"], [str(value) for value in range(10)])
+
+    with patch.object(
+        States, "to_native", autospec=True, side_effect=States.to_native
+    ) as to_native:
+        states = _get_recent_states(
+            hass,
+            [
+                {
+                    "entity_id": "sensor.test",
+                    "start_time": start + timedelta(seconds=2),
+                    "number_of_states": 2,
+                    "state_changes_only": True,
+                }
+            ],
+        )[0]
+
+    assert [state.state for state in states] == ["8", "9"]
+    # Only the rows in the window are converted
+    assert to_native.call_count == 2
@@ -0,0 +1,100 @@
+"""The tests for low-latency hls streams."""
+import asyncio
+
+from homeassistant.components.stream import Stream
+from homeassistant.components.stream.core import Part, Segment, find_mp4_box
+from homeassistant.components.stream.ll_hls import LlHlsStreamOutput, LlM3U8Renderer
+
+
+def _box(box_type, payload=b""):
+    """Return an MP4 box."""
+    return (8 + len(payload)).to_bytes(4, "big") + box_type + payload
+
+
+def test_find_mp4_box():
+    """Test finding top level MP4 boxes."""
+    data = _box(b"ftyp", b"isom") + _box(b"moov", _box(b"trak")) + _box(b"moof")
+
+    assert find_mp4_box(data, b"ftyp") == 0
+    assert find_mp4_box(data, b"moof") == 28
+    assert find_mp4_box(data, b"trak") is None
+    assert find_mp4_box(data[:20], b"moof") is None
+
+
+async def test_render_playlist(hass):
+    """Test the playlist lists segments, parts and the next part."""
+    track = LlHlsStreamOutput(Stream(hass, "rtsp://my.video"))
+    parts = [Part(1.0, True, b"1"), Part(0.5, False, b"2")]
+    track.put(Segment(1, b"12", 1.5, parts))
+    track.put_part(2, Part(1.0, True, b"3"))
+
+    assert LlM3U8Renderer.render(track) == "\n".join(
+        [
+            "#EXTM3U",
+            "#EXT-X-VERSION:6",
+            "#EXT-X-TARGETDURATION:2",
+            "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,PART-HOLD-BACK=3.000",
+            "#EXT-X-PART-INF:PART-TARGET=1.000",
+            '#EXT-X-MAP:URI="./init.mp4"',
+            "#EXT-X-MEDIA-SEQUENCE:1",
+            '#EXT-X-PART:DURATION=1.000,URI="./segment/1.0.m4s",INDEPENDENT=YES',
+            '#EXT-X-PART:DURATION=0.500,URI="./segment/1.1.m4s"',
+            "#EXTINF:1.5000,",
+            "./segment/1.m4s",
+            '#EXT-X-PART:DURATION=1.000,URI="./segment/2.0.m4s",INDEPENDENT=YES',
+            '#EXT-X-PRELOAD-HINT:TYPE=PART,URI="./segment/2.1.m4s"',
+            "",
+        ]
+    )
+
+    assert track.get_part(1, 1).data == b"2"
+    assert track.get_part(2, 0).data == b"3"
+    assert track.get_part(2, 1) is None
+
+    track.cleanup()
+
+
+async def test_parts_are_bounded(hass):
+    """Test only parts of the segments in the playlist are kept."""
+    track = LlHlsStreamOutput(Stream(hass, "rtsp://my.video"))
+
+    for sequence in range(1, 6):
+        track.put_part(sequence, Part(1.0, True, b"1"))
+        track.put(Segment(sequence, b"1", 1.0, [Part(1.0, True, b"1")]))
+
+    assert track.parts == []
+    assert track.segments == [3, 4, 5]
+    assert track.get_part(1, 0) is None
+    assert track.sequence == 6
+
+    track.cleanup()
+
+
+async def test_blocking_reload(hass):
+    """Test waiting for a part that is not available yet."""
+    track = LlHlsStreamOutput(Stream(hass, "rtsp://my.video"))
+    track.put_part(1, Part(1.0, True, b"1"))
+
+    assert track.has_media()
+    assert track.has_media(1, 0)
+
+    waiter = hass.async_create_task(track.async_wait_for(1, 1))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    track.put_part(1, Part(1.0, False, b"2"))
+    assert await waiter
+
+    # Waiting for a complete segment
+    waiter = hass.async_create_task(track.async_wait_for(1))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    track.put(Segment(1, b"12", 2.0, track.parts))
+    assert await waiter
+
+    # Waiters are released when the stream ends
+    waiter = hass.async_create_task(track.async_wait_for(2, 0))
+    await asyncio.sleep(0)
+    track.put(None)
+    assert not await waiter
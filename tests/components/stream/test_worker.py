@@ -0,0 +1,117 @@
+"""The tests for the stream worker."""
+import io
+import threading
+
+import av
+
+from homeassistant.components.stream import Stream
+from homeassistant.components.stream.core import find_mp4_box
+from homeassistant.components.stream.worker import stream_worker
+
+from tests.components.stream.common import generate_h264_video
+
+
+def _count_keyframes(source):
+    """Return the number of keyframes in a video."""
+    container = av.open(source)
+    keyframes = sum(
+        packet.is_keyframe
+        for packet in container.demux(container.streams.video[0])
+        if packet.dts is not None
+    )
+    container.close()
+    source.seek(0)
+    return keyframes
+
+
+async def test_stream_worker_segments(hass):
+    """Test the worker muxes a segment between every two keyframes."""
+    source = generate_h264_video()
+    keyframes = _count_keyframes(source)
+    assert keyframes > 1
+
+    stream = Stream(hass, source)
+    track = stream.add_provider("hls")
+    segments = []
+    track.put = segments.append
+
+    await hass.async_add_executor_job(stream_worker, hass, stream, threading.Event())
+    await hass.async_block_till_done()
+
+    # The end of the stream is signaled after the segments
+    assert segments[-1] is None
+    segments = segments[:-1]
+
+    # The packets after the last keyframe are not a complete segment
+    assert [segment.sequence for segment in segments] == list(range(1, keyframes))
+    for segment in segments:
+        assert isinstance(segment.segment, bytes)
+        assert segment.duration > 0
+        assert segment.parts == []
+
+        container = av.open(io.BytesIO(segment.segment))
+        assert container.format.name == "mpegts"
+        assert any(
+            packet.is_keyframe
+            for packet in container.demux(container.streams.video[0])
+            if packet.dts is not None
+        )
+        container.close()
+
+    # Every frame of the video is demuxed once
+    assert stream.metrics.packets == 120
+    assert stream.metrics.segments == len(segments)
+    assert stream.metrics.segment_build_time.count == len(segments)
+    assert stream.metrics.started is not None
+
+
+async def test_stream_worker_parts(hass):
+    """Test the worker splits fragmented MP4 segments into parts."""
+    source = generate_h264_video()
+    keyframes = _count_keyframes(source)
+
+    stream = Stream(hass, source)
+    track = stream.add_provider("ll_hls")
+    inits = []
+    parts = []
+    segments = []
+    track.set_init = inits.append
+    track.put_part = lambda sequence, part: parts.append((sequence, part))
+    track.put = segments.append
+
+    await hass.async_add_executor_job(stream_worker, hass, stream, threading.Event())
+    await hass.async_block_till_done()
+
+    assert segments[-1] is None
+    segments = segments[:-1]
+    assert [segment.sequence for segment in segments] == list(range(1, keyframes))
+
+    # Every output container writes its initialization section first
+    assert len(inits) == keyframes
+    for init in inits:
+        assert find_mp4_box(init, b"ftyp") == 0
+        assert find_mp4_box(init, b"moov") is not None
+        assert find_mp4_box(init, b"moof") is None
+
+    for segment in segments:
+        # The initialization section is stripped from the segment
+        assert find_mp4_box(segment.segment, b"moof") == 0
+        assert segment.parts
+        assert segment.parts[0].independent
+        assert not any(part.independent for part in segment.parts[1:])
+        assert b"".join(part.data for part in segment.parts) == segment.segment
+        assert [part for sequence, part in parts if sequence == segment.sequence] == (
+            segment.parts
+        )
+
+        # Each part is a whole fragment
+        for part in segment.parts:
+            assert find_mp4_box(part.data, b"moof") == 0
+            assert part.duration > 0
+
+        container = av.open(io.BytesIO(inits[0] + segment.segment))
+        assert sum(
+            packet.dts is not None
+            for packet in container.demux(container.streams.video[0])
+        )
+        container.close()
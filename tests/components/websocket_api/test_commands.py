@@ -219,6 +219,43 @@ async def test_get_services(hass, websocket_client):
     assert msg["result"] == hass.services.async_services()
 
 
+async def test_get_service_stats(hass, websocket_client):
+    """Test get_service_stats command."""
+    hass.services.async_register("domain_test", "test_service", lambda call: None)
+    await hass.services.async_call("domain_test", "test_service", blocking=True)
+
+    await websocket_client.send_json({"id": 5, "type": "get_service_stats"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    stats = [
+        item
+        for item in msg["result"]
+        if (item["domain"], item["service"]) == ("domain_test", "test_service")
+    ]
+    assert len(stats) == 1
+    assert stats[0]["calls"] == 1
+    assert stats[0]["errors"] == 0
+    assert stats[0]["duration"]["count"] == 1
+
+
+async def test_get_service_stats_requires_admin(
+    hass, websocket_client, hass_admin_user
+):
+    """Test get_service_stats command requires an admin."""
+    hass_admin_user.groups = []
+
+    await websocket_client.send_json({"id": 5, "type": "get_service_stats"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
 async def test_get_config(hass, websocket_client):
     """Test get_config command."""
     await websocket_client.send_json({"id": 5, "type": "get_config"})
@@ -7,6 +7,11 @@ import zigpy.config
 import zigpy.group
 import zigpy.types
 
+from homeassistant.components.zha.core.channels.general import LevelControlChannel
+from homeassistant.components.zha.core.channels.homeautomation import (
+    ElectricalMeasurementChannel,
+)
+from homeassistant.components.zha.core.channels.smartenergy import Metering
 import homeassistant.components.zha.core.const as zha_const
 import homeassistant.components.zha.core.device as zha_core_device
 from homeassistant.setup import async_setup_component
@@ -20,6 +25,19 @@ FIXTURE_GRP_ID = 0x1001
 FIXTURE_GRP_NAME = "fixture group"
 
 
+@pytest.fixture(autouse=True)
+def disable_report_coalescing():
+    """Write the state on every report, tests check each reported value."""
+    with patch.object(
+        LevelControlChannel, "REPORT_COALESCE_WINDOW", None
+    ), patch.object(
+        ElectricalMeasurementChannel, "REPORT_COALESCE_WINDOW", None
+    ), patch.object(
+        Metering, "REPORT_COALESCE_WINDOW", None
+    ):
+        yield
+
+
 @pytest.fixture
 def zigpy_app_controller():
     """Zigpy ApplicationController fixture."""
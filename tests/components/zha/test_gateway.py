@@ -10,13 +10,23 @@ import zigpy.zcl.clusters.general as general
 import zigpy.zcl.clusters.lighting as lighting
 
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.components.zha.core.const import (
+    ATTR_PROGRESS,
+    ATTR_TYPE,
+    ZHA_GW_MSG,
+    ZHA_GW_MSG_DEVICE_REFRESH_PROGRESS,
+)
 from homeassistant.components.zha.core.group import GroupMember
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from .common import async_enable_traffic, async_find_group_entity_id, get_zha_gateway
 
+from tests.async_mock import AsyncMock
+
 IEEE_GROUPABLE_DEVICE = "01:2d:6f:00:0a:90:69:e8"
 IEEE_GROUPABLE_DEVICE2 = "02:2d:6f:00:0a:90:69:e8"
 _LOGGER = logging.getLogger(__name__)
+ROUTER_NODE_DESCRIPTOR = b"\x01@\x8e\x02\x10RR\x00\x00\x00R\x00\x00"
 
 
 @pytest.fixture
@@ -214,3 +224,62 @@ async def test_updating_device_store(hass, zigpy_dev_basic, zha_dev_basic):
     await hass.async_block_till_done()
     entry = zha_gateway.zha_storage.async_get_or_create_device(zha_dev_basic)
     assert entry.last_seen == last_seen
+
+
+async def test_initialize_devices_cache_first(
+    hass, zigpy_device_mock, zha_device_joined, coordinator
+):
+    """Test devices load from cache and mains powered devices refresh after."""
+    await zha_device_joined(
+        zigpy_device_mock(
+            {1: {"in_clusters": [general.Basic.cluster_id], "device_type": 0}}
+        )
+    )
+    routers = []
+    for index, last_seen in enumerate((100, 300)):
+        zigpy_device = zigpy_device_mock(
+            {1: {"in_clusters": [general.OnOff.cluster_id], "device_type": 0}},
+            ieee=f"03:2d:6f:00:0a:90:69:e{index}",
+            node_descriptor=ROUTER_NODE_DESCRIPTOR,
+        )
+        zigpy_device.last_seen = last_seen
+        routers.append(await zha_device_joined(zigpy_device))
+
+    zha_gateway = get_zha_gateway(hass)
+    calls = []
+    for zha_device in zha_gateway.devices.values():
+        zha_device.async_initialize = AsyncMock(
+            side_effect=lambda from_cache, dev=zha_device: calls.append(
+                (dev, from_cache)
+            )
+        )
+
+    progress = []
+    async_dispatcher_connect(
+        hass,
+        ZHA_GW_MSG,
+        lambda msg: progress.append(msg[ATTR_PROGRESS])
+        if msg[ATTR_TYPE] == ZHA_GW_MSG_DEVICE_REFRESH_PROGRESS
+        else None,
+    )
+
+    with patch.object(zha_gateway, "async_refresh_devices", AsyncMock()) as refresh:
+        await zha_gateway.async_initialize_devices_and_entities()
+        await hass.async_block_till_done()
+
+    assert refresh.call_count == 1
+    assert all(from_cache for _, from_cache in calls)
+    assert len(calls) == 4
+
+    calls.clear()
+    await zha_gateway.async_refresh_devices()
+
+    # The battery powered device stays cached, the most recently seen router
+    # is refreshed before the other one
+    assert calls == [
+        (coordinator, False),
+        (routers[1], False),
+        (routers[0], False),
+    ]
+    assert progress[-1] == {"refreshed": 3, "total": 3}
+    assert zha_gateway.device_refresh_concurrency == 4
@@ -1,4 +1,5 @@
 """Test zha sensor."""
+import asyncio
 from unittest import mock
 
 import pytest
@@ -14,6 +15,7 @@ from homeassistant.const import (
     CONF_UNIT_SYSTEM,
     CONF_UNIT_SYSTEM_IMPERIAL,
     CONF_UNIT_SYSTEM_METRIC,
+    EVENT_STATE_CHANGED,
     POWER_WATT,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
@@ -144,6 +146,40 @@ async def test_sensor(
     await async_test_rejoin(hass, zigpy_device, [cluster], (report_count,))
 
 
+async def test_sensor_report_coalescing(hass, zigpy_device_mock, zha_device_joined):
+    """Test reports in quick succession are coalesced into one state write."""
+    cluster_id = smartenergy.Metering.cluster_id
+    zigpy_device = zigpy_device_mock(
+        {1: {"in_clusters": [cluster_id], "out_cluster": [], "device_type": 0x0000}}
+    )
+    cluster = zigpy_device.endpoints[1].in_clusters[cluster_id]
+    zha_device = await zha_device_joined(zigpy_device)
+    entity_id = await find_entity_id(DOMAIN, zha_device, hass)
+    await async_enable_traffic(hass, [zha_device])
+
+    channel = zha_device.channels.pools[0].all_channels[f"1:0x{cluster_id:04x}"]
+    channel.coalesce_window = 0.05
+    writes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, writes.append)
+
+    # The first report is written right away
+    await send_attributes_report(hass, cluster, {1024: 1})
+    assert_state(hass, entity_id, "1.0", "unknown")
+
+    # Reports within the window are written once at its end
+    await send_attributes_report(hass, cluster, {1024: 2})
+    await send_attributes_report(hass, cluster, {1024: 3})
+    assert_state(hass, entity_id, "1.0", "unknown")
+
+    await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+    assert_state(hass, entity_id, "3.0", "unknown")
+
+    assert len(writes) == 2
+    assert channel.reports_received == 3
+    assert channel.state_writes == 2
+
+
 def assert_state(hass, entity_id, state, unit_of_measurement):
     """Check that the state is what is expected.
 
@@ -0,0 +1,111 @@
+"""Tests for the poll scheduler helper."""
+import asyncio
+from datetime import timedelta
+import logging
+
+from homeassistant.const import EVENT_TIME_CHANGED
+from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.polling import DATA_POLL_SCHEDULER, poll_offset
+import homeassistant.util.dt as dt_util
+
+from tests.async_mock import Mock
+from tests.common import MockEntity, async_fire_time_changed
+
+_LOGGER = logging.getLogger(__name__)
+DOMAIN = "test_domain"
+INTERVAL = timedelta(seconds=20)
+
+
+def test_poll_offset():
+    """Test entities are polled at deterministic offsets within the interval."""
+    offsets = {poll_offset(f"sensor.test_{index}", INTERVAL) for index in range(100)}
+
+    assert len(offsets) == 100
+    assert all(timedelta(0) <= offset < INTERVAL for offset in offsets)
+    assert poll_offset("sensor.test_1", INTERVAL) == poll_offset(
+        "sensor.test_1", INTERVAL
+    )
+    # Spread over the whole interval
+    assert min(offsets) < INTERVAL / 10
+    assert max(offsets) > INTERVAL * 9 / 10
+
+
+async def test_entities_polled_at_their_offset(hass):
+    """Test entities are only polled once their offset has passed."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, INTERVAL)
+    entities = [MockEntity(should_poll=True, name=f"test {i}") for i in range(10)]
+    for entity in entities:
+        entity.async_update = Mock()
+
+    start = dt_util.utcnow()
+    await component.async_add_entities(entities)
+
+    halfway = start + INTERVAL / 2
+    async_fire_time_changed(hass, halfway)
+    await hass.async_block_till_done()
+
+    for entity in entities:
+        assert entity.async_update.called == (
+            poll_offset(entity.entity_id, INTERVAL) <= INTERVAL / 2
+        )
+
+    async_fire_time_changed(hass, start + INTERVAL)
+    await hass.async_block_till_done()
+
+    assert all(entity.async_update.call_count == 1 for entity in entities)
+
+    platform = component._platforms[DOMAIN]  # pylint: disable=protected-access
+    assert platform.poll_latency.count == 10
+
+
+async def test_slow_entity_is_skipped(hass, caplog):
+    """Test an entity still updating is skipped without holding up others."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, INTERVAL)
+    release = asyncio.Event()
+
+    slow = MockEntity(should_poll=True, name="slow")
+    slow_updates = []
+
+    async def slow_update():
+        slow_updates.append(None)
+        await release.wait()
+
+    slow.async_update = slow_update
+    fast = MockEntity(should_poll=True, name="fast")
+    fast.async_update = Mock()
+
+    await component.async_add_entities([slow, fast])
+
+    async_fire_time_changed(hass, dt_util.utcnow() + INTERVAL)
+    await asyncio.sleep(0)
+    async_fire_time_changed(hass, dt_util.utcnow() + INTERVAL * 2)
+    await asyncio.sleep(0)
+
+    release.set()
+    await hass.async_block_till_done()
+
+    assert len(slow_updates) == 1
+    assert fast.async_update.call_count == 2
+    assert (
+        "Updating test_domain.slow took longer than the scheduled update interval"
+        in caplog.text
+    )
+
+
+async def test_removed_entity_is_not_polled(hass):
+    """Test polling stops when the entity is removed."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, INTERVAL)
+    entity = MockEntity(should_poll=True)
+    entity.async_update = Mock()
+
+    await component.async_add_entities([entity])
+    assert hass.bus.async_listeners()[EVENT_TIME_CHANGED] == 1
+
+    await entity.async_remove()
+    assert EVENT_TIME_CHANGED not in hass.bus.async_listeners()
+    assert hass.data[DATA_POLL_SCHEDULER]._queue == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + INTERVAL)
+    await hass.async_block_till_done()
+
+    assert not entity.async_update.called
@@ -6,7 +6,7 @@ from homeassistant.core import CoreState, State
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import (
-    DATA_RESTORE_STATE_TASK,
+    JOURNAL_STORAGE_KEY,
     STORAGE_KEY,
     RestoreEntity,
     RestoreStateData,
@@ -17,7 +17,7 @@ from homeassistant.util import dt as dt_util
 from tests.async_mock import patch
 
 
-async def test_caching_data(hass):
+async def test_caching_data(hass, hass_storage):
     """Test that we cache data."""
     now = dt_util.utcnow()
     stored_states = [
@@ -26,11 +26,11 @@ async def test_caching_data(hass):
         StoredState(State("input_boolean.b2", "on"), now),
     ]
 
-    data = await RestoreStateData.async_get_instance(hass)
-    await data.store.async_save([state.as_dict() for state in stored_states])
-
-    # Emulate a fresh load
-    hass.data[DATA_RESTORE_STATE_TASK] = None
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [state.as_dict() for state in stored_states],
+    }
 
     entity = RestoreEntity()
     entity.hass = hass
@@ -41,6 +41,7 @@ async def test_caching_data(hass):
         "homeassistant.helpers.restore_state.Store.async_save"
     ) as mock_write_data:
         state = await entity.async_get_last_state()
+        await hass.async_block_till_done()
 
     assert state is not None
     assert state.entity_id == "input_boolean.b1"
@@ -49,7 +50,7 @@ async def test_caching_data(hass):
     assert mock_write_data.called
 
 
-async def test_hass_starting(hass):
+async def test_hass_starting(hass, hass_storage):
     """Test that we cache data."""
     hass.state = CoreState.starting
 
@@ -60,11 +61,11 @@ async def test_hass_starting(hass):
         StoredState(State("input_boolean.b2", "on"), now),
     ]
 
-    data = await RestoreStateData.async_get_instance(hass)
-    await data.store.async_save([state.as_dict() for state in stored_states])
-
-    # Emulate a fresh load
-    hass.data[DATA_RESTORE_STATE_TASK] = None
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [state.as_dict() for state in stored_states],
+    }
 
     entity = RestoreEntity()
     entity.hass = hass
@@ -97,6 +98,8 @@ async def test_hass_starting(hass):
 
 async def test_dump_data(hass):
     """Test that we cache data."""
+    hass.state = CoreState.starting
+
     states = [
         State("input_boolean.b0", "on"),
         State("input_boolean.b1", "on"),
@@ -159,14 +162,20 @@ async def test_dump_data(hass):
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         await data.async_dump_states()
 
-    assert mock_write_data.called
+    # Only the removal of b1 is written, to the journal
+    assert mock_write_data.call_count == 1
     args = mock_write_data.mock_calls[0][1]
-    written_states = args[0]
-    assert len(written_states) == 2
-    assert written_states[0]["state"]["entity_id"] == "input_boolean.b3"
-    assert written_states[0]["state"]["state"] == "off"
-    assert written_states[1]["state"]["entity_id"] == "input_boolean.b5"
-    assert written_states[1]["state"]["state"] == "off"
+    journal = args[0]
+    assert journal["states"] == []
+    assert list(journal["removed"]) == ["input_boolean.b1"]
+
+    # Nothing is written when nothing changed
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save"
+    ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
+        await data.async_dump_states()
+
+    assert not mock_write_data.called
 
 
 async def test_dump_error(hass):
@@ -268,3 +277,100 @@ async def test_restoring_invalid_entity_id(hass, hass_storage):
 
     state = await entity.async_get_last_state()
     assert state is None
+
+
+async def test_journal_applied_on_load(hass, hass_storage):
+    """Test changes since the last full write are loaded from the journal."""
+    hass.state = CoreState.starting
+    now = dt_util.utcnow()
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await entity.async_internal_added_to_hass()
+
+    data = await RestoreStateData.async_get_instance(hass)
+    data.last_states = {
+        "input_boolean.b1": StoredState(State("input_boolean.b1", "off"), now),
+        "input_boolean.b2": StoredState(State("input_boolean.b2", "off"), now),
+        "input_boolean.b3": StoredState(State("input_boolean.b3", "off"), now),
+    }
+
+    hass.states.async_set("input_boolean.b0", "on")
+    await data.async_dump_states()
+    assert len(hass_storage[STORAGE_KEY]["data"]) == 4
+
+    hass.states.async_set("input_boolean.b0", "off")
+    await data.async_dump_states()
+
+    # The change went to the journal, the full write is untouched
+    assert len(hass_storage[STORAGE_KEY]["data"]) == 4
+    assert hass_storage[STORAGE_KEY]["data"][0]["state"]["state"] == "on"
+    journal = hass_storage[JOURNAL_STORAGE_KEY]["data"]
+    assert [item["state"]["state"] for item in journal["states"]] == ["off"]
+
+    # Emulate a fresh load
+    new_data = RestoreStateData(hass)
+    await new_data.async_load()
+
+    assert new_data.last_states["input_boolean.b0"].state.state == "off"
+    assert new_data.last_states["input_boolean.b3"].state.state == "off"
+
+
+async def test_stale_journal_ignored_on_load(hass, hass_storage):
+    """Test journal entries older than the full write are ignored."""
+    now = dt_util.utcnow()
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [
+            StoredState(State("input_boolean.b0", "on"), now).as_dict(),
+            StoredState(State("input_boolean.b1", "on"), now).as_dict(),
+            StoredState(State("input_boolean.b2", "on"), now).as_dict(),
+        ],
+    }
+    hass_storage[JOURNAL_STORAGE_KEY] = {
+        "version": 1,
+        "key": JOURNAL_STORAGE_KEY,
+        "data": {
+            "states": [
+                StoredState(
+                    State("input_boolean.b0", "off"),
+                    datetime(2020, 1, 1, tzinfo=dt_util.UTC),
+                ).as_dict()
+            ],
+            "removed": {
+                "input_boolean.b1": "2020-01-01T00:00:00+00:00",
+                "input_boolean.b2": "invalid",
+            },
+        },
+    }
+
+    data = RestoreStateData(hass)
+    await data.async_load()
+
+    assert data.last_states["input_boolean.b0"].state.state == "on"
+    assert data.last_states["input_boolean.b1"].state.state == "on"
+    # Invalid journal entries are skipped
+    assert data.last_states["input_boolean.b2"].state.state == "on"
+
+
+async def test_states_loaded_lazily(hass):
+    """Test stored states are only loaded when first requested."""
+    hass.state = CoreState.starting
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_load", return_value=None
+    ) as mock_load:
+        await entity.async_internal_added_to_hass()
+        assert not mock_load.called
+
+        await entity.async_get_last_state()
+        await entity.async_get_last_state()
+
+    # The full write and the journal are loaded once
+    assert mock_load.call_count == 2
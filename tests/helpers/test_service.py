@@ -1,4 +1,5 @@
 """Test service helpers."""
+import asyncio
 from collections import OrderedDict
 from copy import deepcopy
 import unittest
@@ -29,6 +30,8 @@ from homeassistant.setup import async_setup_component
 from tests.async_mock import AsyncMock, Mock, patch
 from tests.common import (
     MockEntity,
+    MockEntityPlatform,
+    MockPlatform,
     get_test_home_assistant,
     mock_device_registry,
     mock_registry,
@@ -412,6 +415,77 @@ async def test_call_with_sync_attr(hass, mock_entities):
     assert mock_method.mock_calls[0][2] == {}
 
 
+async def test_call_with_platform_batch(hass):
+    """Test platforms can handle a service call for many entities at once."""
+    batches = []
+
+    async def async_batch_service_call(hass, func, entities, data):
+        """Handle the call for the kitchen only."""
+        batches.append((func, [entity.entity_id for entity in entities]))
+        return [entity for entity in entities if entity.entity_id != "light.kitchen"]
+
+    platform_module = MockPlatform()
+    platform_module.async_batch_service_call = async_batch_service_call
+    platform = MockEntityPlatform(hass, platform=platform_module)
+
+    entities = [
+        MockEntity(entity_id="light.kitchen", available=True, should_poll=False),
+        MockEntity(entity_id="light.bedroom", available=True, should_poll=False),
+    ]
+    for entity in entities:
+        entity.sync_method = Mock(return_value=None)
+    await platform.async_add_entities(entities)
+
+    await service.entity_service_call(
+        hass,
+        [platform],
+        "sync_method",
+        ha.ServiceCall("test_domain", "test_service", {"entity_id": "all"}),
+    )
+
+    assert batches == [("sync_method", ["light.kitchen", "light.bedroom"])]
+    assert entities[0].sync_method.call_count == 0
+    assert entities[1].sync_method.call_count == 1
+    assert platform.service_call_latency.count == 1
+
+
+async def test_call_with_parallel_service_calls_limit(hass):
+    """Test platforms can limit how many entities are called in parallel."""
+    running = 0
+    max_running = 0
+
+    async def async_service(entity, call):
+        """Track the number of concurrent calls."""
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+    platform_module = MockPlatform()
+    platform_module.PARALLEL_UPDATES = 0
+    platform_module.PARALLEL_SERVICE_CALLS = 2
+    platform = MockEntityPlatform(hass, platform=platform_module)
+    await platform.async_add_entities(
+        [
+            MockEntity(
+                entity_id=f"light.light_{idx}", available=True, should_poll=False
+            )
+            for idx in range(5)
+        ]
+    )
+
+    await service.entity_service_call(
+        hass,
+        [platform],
+        async_service,
+        ha.ServiceCall("test_domain", "test_service", {"entity_id": "all"}),
+    )
+
+    assert max_running == 2
+    assert platform.service_call_latency.count == 1
+
+
 async def test_call_context_user_not_exist(hass):
     """Check we don't allow deleted users to do things."""
     with pytest.raises(exceptions.UnknownUser) as err:
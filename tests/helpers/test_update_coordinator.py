@@ -159,3 +159,90 @@ async def test_refresh_recover(crd, caplog):
 
     assert crd.last_update_success is True
     assert "Fetching test data recovered" in caplog.text
+
+
+async def test_adaptive_update_interval(hass):
+    """Test the interval adapts to unchanged data and failures."""
+    data = 1
+
+    async def refresh():
+        if data is None:
+            raise update_coordinator.UpdateFailed("Unavailable")
+        return data
+
+    crd = update_coordinator.DataUpdateCoordinator(
+        hass,
+        LOGGER,
+        name="test",
+        update_method=refresh,
+        update_interval=timedelta(seconds=10),
+        max_update_interval=timedelta(seconds=60),
+    )
+
+    await crd.async_refresh()
+    assert crd.update_interval == timedelta(seconds=10)
+
+    # Unchanged data grows the interval up to the maximum
+    await crd.async_refresh()
+    assert crd.update_interval == timedelta(seconds=15)
+    for _ in range(5):
+        await crd.async_refresh()
+    assert crd.update_interval == timedelta(seconds=60)
+
+    # Changed data returns to the minimum
+    data = 2
+    await crd.async_refresh()
+    assert crd.update_interval == timedelta(seconds=10)
+
+    # Failures back off exponentially
+    data = None
+    await crd.async_refresh()
+    assert crd.update_interval == timedelta(seconds=20)
+    await crd.async_refresh()
+    assert crd.update_interval == timedelta(seconds=40)
+    await crd.async_refresh()
+    assert crd.update_interval == timedelta(seconds=60)
+
+    # Requesting a refresh returns to the minimum
+    data = 2
+    await crd.async_request_refresh()
+    assert crd.update_interval == timedelta(seconds=15)
+
+    assert crd.refresh_latency.count == 12
+
+
+async def test_adaptive_update_interval_schedule(hass):
+    """Test the next refresh is scheduled with the adapted interval."""
+    crd = update_coordinator.DataUpdateCoordinator(
+        hass,
+        LOGGER,
+        name="test",
+        update_method=AsyncMock(return_value=1),
+        update_interval=timedelta(seconds=10),
+        max_update_interval=timedelta(seconds=60),
+    )
+    crd.async_add_listener(Mock())
+
+    await crd.async_refresh()
+    await crd.async_refresh()
+    assert crd.update_interval == timedelta(seconds=15)
+    assert crd.update_method.call_count == 2
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert crd.update_method.call_count == 2
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=16))
+    await hass.async_block_till_done()
+    assert crd.update_method.call_count == 3
+
+
+async def test_update_interval_not_adaptive(crd):
+    """Test the interval is fixed without a maximum interval."""
+    crd.update_method = AsyncMock(return_value=1)
+
+    await crd.async_refresh()
+    await crd.async_refresh()
+
+    assert crd.update_interval == timedelta(seconds=10)
+    assert crd.refresh_latency.count == 2
@@ -1255,6 +1255,34 @@ async def test_cancel_service_task(hass, cancel_call):
     assert service_cancelled
 
 
+async def test_service_call_stats(hass):
+    """Test service calls are counted and timed."""
+
+    async def service_handler(call):
+        if call.data.get("fail"):
+            raise ValueError("Failed")
+        hass.services.async_record_parallel_wait(0.2)
+
+    hass.services.async_register("test_domain", "test_service", service_handler)
+
+    await hass.services.async_call("test_domain", "test_service", blocking=True)
+    with pytest.raises(ValueError):
+        await hass.services.async_call(
+            "test_domain", "test_service", {"fail": True}, blocking=True
+        )
+
+    stats = hass.services.async_call_stats()[("test_domain", "test_service")]
+    assert stats.calls == 2
+    assert stats.errors == 1
+    assert stats.duration.count == 2
+    assert stats.parallel_wait.count == 1
+    assert stats.as_dict()["parallel_wait"]["max"] == 0.2
+
+    # Waits outside of a service call are not attributed to any service
+    hass.services.async_record_parallel_wait(0.5)
+    assert stats.parallel_wait.count == 1
+
+
 def test_valid_entity_id():
     """Test valid entity ID."""
     for invalid in [
@@ -0,0 +1,46 @@
+"""Test Home Assistant latency histogram utility functions."""
+from homeassistant.util.latency import LatencyHistogram
+
+
+def test_empty_histogram():
+    """Test an empty histogram."""
+    histogram = LatencyHistogram()
+
+    assert histogram.percentile(50) is None
+    assert histogram.as_dict() == {
+        "count": 0,
+        "sum": 0.0,
+        "max": 0.0,
+        "p50": None,
+        "p99": None,
+    }
+
+
+def test_record_and_percentiles():
+    """Test recording durations and estimating percentiles."""
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+
+    for _ in range(98):
+        histogram.record(0.05)
+    histogram.record(0.5)
+    histogram.record(3.0)
+
+    assert histogram.count == 100
+    assert histogram.maximum == 3.0
+    assert round(histogram.total, 6) == round(98 * 0.05 + 3.5, 6)
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(99) == 1.0
+    assert histogram.percentile(100) == 3.0
+    assert histogram.cumulative_buckets() == [
+        (0.1, 98),
+        (1.0, 99),
+        (float("inf"), 100),
+    ]
+
+
+def test_percentile_capped_by_maximum():
+    """Test percentile estimates never exceed the largest sample."""
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    histogram.record(0.02)
+
+    assert histogram.percentile(50) == 0.02
@@ -0,0 +1,46 @@
+"""Test PIL utility functions."""
+import io
+
+from PIL import Image
+import pytest
+
+from homeassistant.util import pil as pil_util
+
+
+def _image(width, height, img_format="JPEG"):
+    """Return an encoded image of a size."""
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), (255, 0, 0)).save(buf, img_format)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("img_format", ["JPEG", "PNG"])
+def test_resize_image(img_format):
+    """Test images are scaled down keeping the aspect ratio and format."""
+    resized = Image.open(
+        io.BytesIO(pil_util.resize_image(_image(640, 480, img_format), width=320))
+    )
+
+    assert resized.size == (320, 240)
+    assert resized.format == img_format
+
+
+def test_resize_image_fits_box():
+    """Test images are scaled to fit both dimensions."""
+    resized = pil_util.resize_image(_image(640, 480), width=320, height=120)
+
+    assert Image.open(io.BytesIO(resized)).size == (160, 120)
+
+
+def test_resize_image_never_scales_up():
+    """Test images smaller than the requested size are returned as is."""
+    image = _image(100, 50)
+
+    assert pil_util.resize_image(image, width=320, height=240) is image
+    assert pil_util.resize_image(image) is image
+
+
+def test_resize_invalid_image():
+    """Test invalid images raise OSError."""
+    with pytest.raises(OSError):
+        pil_util.resize_image(b"not an image", width=10)
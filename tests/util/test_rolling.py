@@ -0,0 +1,83 @@
+"""Test Home Assistant rolling window utility functions."""
+from datetime import timedelta
+import random
+import statistics
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.rolling import RollingWindow
+
+
+def test_empty_window():
+    """Test the statistics of an empty window."""
+    window = RollingWindow(5)
+
+    assert len(window) == 0
+    assert window.total == 0
+    assert window.mean is None
+    assert window.median is None
+    assert window.variance is None
+    assert window.stdev is None
+    assert window.min is None
+    assert window.max is None
+
+
+def test_count_bounded_window():
+    """Test the statistics match a recomputation over the window."""
+    rng = random.Random(42)
+    now = dt_util.utcnow()
+    window = RollingWindow(20)
+    values = []
+
+    for index in range(500):
+        # Repeated values and a drifting level like a meter
+        value = float(rng.choice([rng.randint(0, 3), rng.uniform(-5, 5)]) + index)
+        window.append(value, now)
+        values = (values + [value])[-20:]
+
+        assert len(window) == len(values)
+        assert window.total == pytest.approx(sum(values))
+        assert window.mean == pytest.approx(statistics.mean(values))
+        assert window.median == statistics.median(values)
+        assert window.min == min(values)
+        assert window.max == max(values)
+        if len(values) > 1:
+            assert window.variance == pytest.approx(statistics.variance(values))
+            assert window.stdev == pytest.approx(statistics.stdev(values))
+
+
+def test_age_bounded_window():
+    """Test samples older than max_age are purged."""
+    now = dt_util.utcnow()
+    window = RollingWindow(max_age=timedelta(minutes=2))
+
+    for minutes, value in enumerate((5.0, 1.0, 3.0, 2.0)):
+        window.append(value, now + timedelta(minutes=minutes))
+
+    window.purge(now + timedelta(minutes=3, seconds=30))
+    assert list(window.values) == [3.0, 2.0]
+    assert window.min == 2.0
+    assert window.max == 3.0
+    assert window.median == 2.5
+
+    window.purge(now + timedelta(minutes=10))
+    assert len(window) == 0
+    assert window.mean is None
+
+    window.append(7.0, now + timedelta(minutes=10))
+    assert window.mean == 7.0
+    assert window.min == window.max == 7.0
+
+
+def test_popleft():
+    """Test removing the oldest sample."""
+    now = dt_util.utcnow()
+    window = RollingWindow()
+    window.append(1.0, now)
+    window.append(4.0, now + timedelta(seconds=1))
+
+    assert window.popleft() == (1.0, now)
+    assert window.total == 4.0
+    assert window.min == 4.0
+    assert window.variance is None